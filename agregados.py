@@ -0,0 +1,123 @@
+"""Cubo de agregados por (GERENCIA, ÁREA, CUADRANTE).
+
+Se construye una sola vez en la carga. Los selectores del sidebar, sus
+contadores, el Resumen Estadístico y el comparativo entre áreas leen del cubo
+sin recorrer la tabla de empleados en cada rerun.
+"""
+import numpy as np
+import pandas as pd
+
+# Cuadrante usado en el cubo para quienes no tienen evaluación 9-Box
+SIN_EVALUACION = 0
+
+_RESUMEN_VACIO = {
+    'total': 0,
+    'evaluados': 0,
+    'sin_evaluacion': 0,
+    'promedio_potencial': None,
+    'promedio_desempeño': None,
+    'distribucion': pd.Series(dtype='int64'),
+}
+
+
+class CuboAgregados:
+    """Conteos, sumas y tallies de evaluados por gerencia, área y cuadrante.
+
+    Como en el dashboard, dentro de cada (gerencia, área) se cuenta a cada
+    NOMBRE una sola vez (la primera fila en que aparece).
+    """
+
+    def __init__(self, df_all):
+        self.gerencias = sorted(df_all['GERENCIA'].dropna().unique())
+
+        posiciones = np.arange(len(df_all))
+        con_ubicacion = df_all['GERENCIA'].notna().to_numpy() & df_all['ÁREA'].notna().to_numpy()
+        base = df_all.loc[con_ubicacion, ['GERENCIA', 'ÁREA', 'NOMBRE']].copy()
+        base['_posicion'] = posiciones[con_ubicacion]
+        base['CUADRANTE'] = df_all.loc[con_ubicacion, 'CUADRANTE'].fillna(SIN_EVALUACION).astype('int8')
+        base['Potencial'] = df_all.loc[con_ubicacion, 'Potencial']
+        base['Desempeño'] = df_all.loc[con_ubicacion, 'Desempeño']
+        base = base.drop_duplicates(subset=['GERENCIA', 'ÁREA', 'NOMBRE'])
+        evaluado = base['CUADRANTE'] != SIN_EVALUACION
+        base['Potencial'] = base['Potencial'].where(evaluado, 0.0)
+        base['Desempeño'] = base['Desempeño'].where(evaluado, 0.0)
+
+        self.cubo = base.groupby(['GERENCIA', 'ÁREA', 'CUADRANTE'], sort=True, observed=True).agg(
+            personas=('_posicion', 'size'),
+            suma_potencial=('Potencial', 'sum'),
+            suma_desempeño=('Desempeño', 'sum'),
+            primera_posicion=('_posicion', 'min'),
+        )
+
+        self._areas = {}
+        for gerencia, area in base[['GERENCIA', 'ÁREA']].drop_duplicates().itertuples(index=False):
+            self._areas.setdefault(gerencia, []).append(area)
+        for gerencia in self._areas:
+            self._areas[gerencia].sort()
+
+        # Posiciones (en df_all) de las filas de cada área, ya sin duplicados
+        self._posiciones = {
+            clave: np.sort(grupo.to_numpy())
+            for clave, grupo in base.groupby(['GERENCIA', 'ÁREA'], observed=True)['_posicion']
+        }
+
+        self._resumenes = {
+            clave: self._resumir(grupo.droplevel([0, 1]))
+            for clave, grupo in self.cubo.groupby(level=[0, 1], observed=True)
+        }
+        self._comparativo = self._tabular()
+
+    def _tabular(self):
+        """Todas las áreas en una tabla: una fila por (gerencia, área) a partir del cubo."""
+        personas = self.cubo['personas'].unstack('CUADRANTE', fill_value=0)
+        personas = personas.reindex(columns=range(SIN_EVALUACION, 10), fill_value=0).rename_axis(columns=None)
+        sumas = self.cubo[['suma_potencial', 'suma_desempeño']].groupby(level=[0, 1], observed=True).sum().astype(float)
+        evaluados = personas.drop(columns=SIN_EVALUACION).sum(axis=1)
+        con_evaluados = evaluados.where(evaluados > 0)
+        tabla = pd.DataFrame({
+            'total': personas.sum(axis=1),
+            'evaluados': evaluados,
+            'promedio_potencial': sumas['suma_potencial'] / con_evaluados,
+            'promedio_desempeño': sumas['suma_desempeño'] / con_evaluados,
+        })
+        # Columnas 1..9: personas evaluadas en cada cuadrante
+        return pd.concat([tabla, personas.drop(columns=SIN_EVALUACION)], axis=1)
+
+    @staticmethod
+    def _resumir(celdas):
+        evaluadas = celdas[celdas.index != SIN_EVALUACION]
+        evaluados = int(evaluadas['personas'].sum())
+        total = int(celdas['personas'].sum())
+        # Orden de primera aparición, como la distribución calculada sobre las filas
+        distribucion = evaluadas.sort_values('primera_posicion')['personas']
+        return {
+            'total': total,
+            'evaluados': evaluados,
+            'sin_evaluacion': total - evaluados,
+            'promedio_potencial': float(evaluadas['suma_potencial'].sum() / evaluados) if evaluados else None,
+            'promedio_desempeño': float(evaluadas['suma_desempeño'].sum() / evaluados) if evaluados else None,
+            'distribucion': distribucion.rename_axis(None).rename(None).astype('int64'),
+        }
+
+    def areas(self, gerencia):
+        """Áreas (ordenadas) de una gerencia."""
+        return self._areas.get(gerencia, [])
+
+    def resumen(self, gerencia, area):
+        """Totales, promedios y distribución por cuadrante de un área."""
+        return self._resumenes.get((gerencia, area), _RESUMEN_VACIO)
+
+    def comparativo(self, gerencia=None):
+        """Una fila por (gerencia, área): total, evaluados, promedios y personas por cuadrante (1..9)."""
+        if gerencia is None:
+            return self._comparativo
+        if gerencia not in self._areas:
+            return self._comparativo.iloc[0:0]
+        return self._comparativo.xs(gerencia, level=0, drop_level=False)
+
+    def filtrar(self, df_all, gerencia, area):
+        """Filas de df_all en (gerencia, área), sin NOMBRE duplicados."""
+        posiciones = self._posiciones.get((gerencia, area))
+        if posiciones is None:
+            return df_all.iloc[0:0]
+        return df_all.iloc[posiciones]
@@ -0,0 +1,96 @@
+"""Almacén compacto de las tablas de empleados.
+
+Las dos hojas de empleados se guardan en una sola tabla (``df_all``) con tipos
+compactos: NOMBRE y JEFE DIRECTO como categorías que comparten un único
+diccionario de nombres, GERENCIA/ÁREA/CARGO como categorías y puntajes y
+cuadrante en Int8. ``df_niveles_medios`` y ``df_jefes`` son slices por filas
+de esa tabla (vistas, sin copiar datos), así que cada worker guarda los datos
+una sola vez en lugar de dos.
+
+Como comparten columnas, cada vista trae también las columnas de la otra hoja
+vacías (p. ej. PROMEDIO EQUIPO en niveles medios), igual que ``df_all``.
+"""
+import pandas as pd
+
+# Columnas con nombres de persona: comparten un mismo diccionario
+COLUMNAS_NOMBRE = ('NOMBRE', 'JEFE DIRECTO')
+COLUMNAS_CATEGORICAS = ('GERENCIA', 'ÁREA', 'CARGO')
+# Si un valor no cabe en el tipo (p. ej. un puntaje con decimales) la columna
+# conserva su tipo original. RESULTADO INDIVIDUAL y PROMEDIO EQUIPO siguen en
+# float64: son promedios que caen justo en x.xxx5 y en float32 cambiaría el
+# redondeo a 3 decimales que muestra el dashboard.
+TIPOS_COMPACTOS = {
+    'Potencial': 'Int8',
+    'Desempeño': 'Int8',
+    'CUADRANTE': 'Int8',
+}
+
+
+def alinear_categorias(*dfs):
+    """Devuelve ``dfs`` con las mismas categorías en las columnas categóricas comunes.
+
+    Con categorías iguales, concatenar filas de ambas hojas conserva el tipo
+    categórico y no recodifica; con categorías distintas pandas cae a object.
+    Los DataFrames recibidos no se modifican: en una recarga pueden ser las
+    vistas de la versión que las sesiones siguen mostrando.
+    """
+    alineados = list(dfs)
+    comunes = set.intersection(*(set(df.columns) for df in dfs))
+    for columna in comunes:
+        if not all(isinstance(df[columna].dtype, pd.CategoricalDtype) for df in dfs):
+            continue
+        categorias = pd.api.types.union_categoricals(
+            [df[columna].array for df in dfs], sort_categories=True
+        ).categories
+        for i, df in enumerate(alineados):
+            if not df[columna].cat.categories.equals(categorias):
+                if df is dfs[i]:
+                    # Copia superficial: solo se reemplaza la columna recodificada
+                    df = alineados[i] = df.copy(deep=False)
+                df[columna] = df[columna].cat.set_categories(categorias)
+    return alineados
+
+
+def _diccionario_nombres(df):
+    valores = [df[columna].dropna().unique() for columna in COLUMNAS_NOMBRE if columna in df.columns]
+    if not valores:
+        return pd.Index([], dtype=object)
+    return pd.Index(pd.unique(pd.concat([pd.Series(v, dtype=object) for v in valores]))).sort_values()
+
+
+def compactar(df):
+    """Convierte en el lugar las columnas de ``df`` a sus tipos compactos."""
+    nombres = _diccionario_nombres(df)
+    for columna in COLUMNAS_NOMBRE:
+        if columna in df.columns:
+            df[columna] = pd.Categorical(df[columna].astype(object), categories=nombres)
+    for columna in COLUMNAS_CATEGORICAS:
+        if columna in df.columns and not isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype('category')
+    for columna, tipo in TIPOS_COMPACTOS.items():
+        if columna in df.columns and df[columna].dtype != tipo:
+            try:
+                df[columna] = df[columna].astype(tipo)
+            except (TypeError, ValueError):
+                pass
+    return df
+
+
+def construir_almacen(df_niveles_medios, df_jefes):
+    """Une ambas hojas en una tabla compacta.
+
+    Devuelve (df_all, df_niveles_medios, df_jefes); las dos últimas son
+    vistas de ``df_all`` con índice 0..n-1, como las hojas originales.
+    """
+    df_niveles_medios, df_jefes = alinear_categorias(df_niveles_medios, df_jefes)
+    df_all = compactar(pd.concat([df_niveles_medios, df_jefes], ignore_index=True, sort=False))
+    return (df_all, *vistas_hojas(df_all, len(df_niveles_medios)))
+
+
+def vistas_hojas(df_all, n_niveles_medios):
+    """(df_niveles_medios, df_jefes) como vistas de ``df_all`` sin copiar datos."""
+    vista_niveles_medios = df_all.iloc[:n_niveles_medios]
+    vista_niveles_medios.index = pd.RangeIndex(n_niveles_medios)
+    vista_jefes = df_all.iloc[n_niveles_medios:]
+    vista_jefes.index = pd.RangeIndex(len(df_all) - n_niveles_medios)
+    return vista_niveles_medios, vista_jefes
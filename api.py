@@ -0,0 +1,408 @@
+"""API HTTP (ASGI) de solo lectura con las consultas del tablero 9-Box.
+
+Expone sobre las mismas tablas cargadas que el dashboard (ver recarga.py y
+memoria_compartida.py) lo que hoy solo se ve en Streamlit, usando las
+consultas de servicio.py. No depende de ningún framework: ``AplicacionAPI``
+es un callable ASGI que se sirve con cualquier servidor, por ejemplo::
+
+    uvicorn api:crear_app --factory --port 8000
+    python api.py [--host 127.0.0.1] [--puerto 8000]   # requiere uvicorn
+
+Rutas (GET o HEAD)::
+
+    /v1/version
+    /v1/gerencias                                  gerencias con sus áreas
+    /v1/gerencias/{gerencia}/areas/{area}          resumen y distribución 9-Box
+    /v1/gerencias/{gerencia}/areas/{area}/empleados
+    /v1/gerencias/{gerencia}/areas/{area}/jefes
+    /v1/empleados/{nombre}                         perfil, competencias y equipo
+    /v1/jefes/{nombre}/equipo?pagina=1&por_pagina=25&alcance=directos|estructura
+                              &cuadrante=1,5&cargo=...&orden=Nombre&descendente=1
+    /v1/buscar?q=texto&limite=8
+    /v1/mesa                                       Mesa Gerencial y su consolidado
+    /v1/comparativo?gerencia=...                   todas las áreas lado a lado
+    /v1/calidad                                    incidencias de la validación del libro
+
+Las tablas viajan por columnas (``{"columna": [valores]}``); con
+``?formato=arrow`` o ``Accept: application/vnd.apache.arrow.stream`` las de
+empleados y equipo se envían como un stream Arrow IPC. Los nombres se
+resuelven a su grafía canónica (ver nombres.py) solo por igualdad exacta o
+normalizada; si no, la respuesta es 404 con el nombre más parecido en
+``sugerencia``.
+
+Cada respuesta lleva un ETag derivado de la ruta, los parámetros y el token
+de versión del recurso (``version_area`` / ``version_empleado``): un cliente que repite la consulta
+con ``If-None-Match`` recibe 304 sin que se calcule nada, y una recarga del
+libro solo invalida las áreas y empleados que cambió. Los cuerpos ya
+serializados (y comprimidos con gzip, si el cliente lo acepta) quedan en una
+caché LRU, así las consultas repetidas cuestan una búsqueda en un diccionario.
+"""
+import argparse
+import dataclasses
+import gzip
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import servicio
+from buscador import RESULTADOS_POR_DEFECTO
+from ingesta import EXCEL_FILE
+from memoria_compartida import DIRECTORIO_COMPARTIDO, LectorCompartido
+from recarga import RecargadorLibro
+from validacion import resumen_calidad
+
+PREFIJO = 'v1'
+# Respuestas serializadas que se conservan (desalojo LRU)
+MAX_RESPUESTAS_CACHE = 2048
+# Por debajo de este tamaño comprimir no compensa
+MINIMO_GZIP = 1024
+MAXIMO_RESULTADOS_BUSQUEDA = 50
+MAXIMO_POR_PAGINA = 500
+
+TIPO_JSON = 'application/json; charset=utf-8'
+TIPO_ARROW = 'application/vnd.apache.arrow.stream'
+
+
+class ErrorAPI(Exception):
+    """Error con código HTTP que se devuelve como ``{"error": mensaje, **detalle}``."""
+
+    def __init__(self, estado, mensaje, **detalle):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+        self.detalle = detalle
+
+
+def _columnas(df):
+    """DataFrame -> {columna: [valores]} con None en lugar de NaN/NA."""
+    return df.astype(object).where(df.notna(), None).to_dict('list')
+
+
+def _serializable(valor):
+    """Convierte resultados de servicio.py a tipos que acepta ``json``."""
+    if dataclasses.is_dataclass(valor):
+        return {campo.name: _serializable(getattr(valor, campo.name)) for campo in dataclasses.fields(valor)}
+    if isinstance(valor, pd.DataFrame):
+        return _columnas(valor)
+    if isinstance(valor, pd.Series):
+        # Distribuciones: cuadrante -> personas
+        return {str(clave): _serializable(v) for clave, v in valor.items()}
+    if isinstance(valor, dict):
+        return {str(clave): _serializable(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_serializable(v) for v in valor]
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and math.isnan(valor):
+        return None
+    if valor is pd.NA or valor is pd.NaT:
+        return None
+    return valor
+
+
+def _json(contenido):
+    return json.dumps(_serializable(contenido), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _arrow(df):
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    sumidero = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sumidero, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sumidero.getvalue().to_pybytes()
+
+
+def _competencias(competencias):
+    """``servicio.CompetenciasJefe`` con el detalle por columnas, o None."""
+    if competencias is None:
+        return None
+    filas = competencias.competencias
+    return {
+        'promedio': competencias.promedio,
+        'ponderado': competencias.ponderado,
+        'detalle': {
+            'competencia': [c for c, _, _, _ in filas],
+            'porcentaje': [p for _, p, _, _ in filas],
+            'impacto': [i for _, _, i, _ in filas],
+            'percentil': [q for _, _, _, q in filas],
+        },
+    }
+
+
+class Consulta:
+    """Una ruta ya interpretada: token de versión y cómo calcular la respuesta.
+
+    ``token`` identifica la versión de los datos de los que depende la
+    respuesta; ``tabla`` (opcional) devuelve el DataFrame que se envía en
+    formato Arrow.
+    """
+
+    def __init__(self, token, calcular, tabla=None):
+        self.token = token
+        self.calcular = calcular
+        self.tabla = tabla
+
+
+def _nombre_canonico(datos, nombre):
+    # Sin trigramas: un nombre parcial o mal escrito no responde por otra persona
+    canonico = datos.nombres.canonico(nombre, aproximado=False)
+    if canonico is None:
+        raise ErrorAPI(404, f"No se encontró a '{nombre}'", sugerencia=datos.nombres.sugerencia(nombre))
+    return canonico
+
+
+def _area(datos, gerencia, area):
+    if area not in datos.cubo.areas(gerencia):
+        raise ErrorAPI(404, f"No existe el área '{area}' en '{gerencia}'")
+    return gerencia, area
+
+
+def _perfil(datos, nombre):
+    perfil = servicio.obtener_perfil_empleado(datos, nombre)
+    if perfil is None:
+        raise ErrorAPI(404, f"No se encontraron datos de '{nombre}'")
+    return {
+        **_serializable(perfil),
+        'competencias': _competencias(servicio.obtener_competencias(datos, nombre) if perfil.es_jefe else None),
+        'equipo': servicio.obtener_equipo(datos, nombre) if perfil.es_jefe else None,
+    }
+
+
+def _equipo(datos, nombre):
+    equipo = servicio.obtener_equipo(datos, nombre)
+    if equipo is None:
+        raise ErrorAPI(404, f"'{nombre}' no tiene equipo directo")
+    return equipo
+
+
+def _pagina_equipo(datos, nombre, parametros):
+    """Página de la tabla del equipo según los parámetros de la consulta."""
+    alcance = parametros.get('alcance', ['directos'])[0]
+    if alcance not in ('directos', 'estructura'):
+        raise ErrorAPI(400, "alcance debe ser 'directos' o 'estructura'")
+    orden = parametros.get('orden', [None])[0]
+    if orden is not None and orden not in servicio.ORDEN_EQUIPO:
+        raise ErrorAPI(400, f"orden debe ser uno de: {', '.join(servicio.ORDEN_EQUIPO)}")
+    try:
+        cuadrantes = tuple(int(c) for valor in parametros.get('cuadrante', []) for c in valor.split(','))
+    except ValueError:
+        raise ErrorAPI(400, "cuadrante debe ser una lista de enteros (0 = sin evaluación)")
+    pagina = servicio.obtener_pagina_equipo(
+        datos, nombre, alcance, cuadrantes,
+        cargo=parametros.get('cargo', [None])[0],
+        orden=orden,
+        descendente=parametros.get('descendente', ['0'])[0].lower() in ('1', 'true', 'si', 'sí'),
+        pagina=_entero(parametros, 'pagina', 1, 1 << 31),
+        por_pagina=_entero(parametros, 'por_pagina', servicio.POR_PAGINA_EQUIPO, MAXIMO_POR_PAGINA),
+    )
+    if pagina is None:
+        raise ErrorAPI(404, f"'{nombre}' no tiene personas a cargo")
+    return pagina
+
+
+def _comparativo(datos, parametros):
+    """Tabla del comparativo entre áreas con gerencia y área como columnas."""
+    gerencia = parametros.get('gerencia', [None])[0]
+    if gerencia is not None and gerencia not in datos.cubo.gerencias:
+        raise ErrorAPI(404, f"No existe la gerencia '{gerencia}'")
+    tabla = servicio.obtener_comparativo_areas(datos, gerencia).tabla
+    return tabla.reset_index().astype({'GERENCIA': object, 'ÁREA': object}).rename(columns=str)
+
+
+def _entero(parametros, clave, por_defecto, maximo):
+    try:
+        valor = int(parametros.get(clave, [por_defecto])[0])
+    except ValueError:
+        raise ErrorAPI(400, f"'{clave}' debe ser un entero")
+    return max(1, min(valor, maximo))
+
+
+def interpretar(datos, segmentos, parametros):
+    """``Consulta`` para los segmentos de la ruta (sin el prefijo de versión)."""
+    match segmentos:
+        case ['version']:
+            return Consulta(datos.version, lambda: {'version': datos.version})
+        case ['gerencias']:
+            return Consulta(datos.version, lambda: {g: list(datos.cubo.areas(g)) for g in datos.cubo.gerencias})
+        case ['gerencias', gerencia, 'areas', area]:
+            _area(datos, gerencia, area)
+            return Consulta(datos.version_area(gerencia, area),
+                            lambda: servicio.obtener_resumen_area(datos, gerencia, area))
+        case ['gerencias', gerencia, 'areas', area, 'empleados']:
+            _area(datos, gerencia, area)
+            empleados = lambda: servicio.obtener_empleados_area(datos, gerencia, area).empleados
+            return Consulta(datos.version_area(gerencia, area), empleados, tabla=empleados)
+        case ['gerencias', gerencia, 'areas', area, 'jefes']:
+            _area(datos, gerencia, area)
+            return Consulta(datos.version_area(gerencia, area),
+                            lambda: servicio.obtener_jefes_area(datos, gerencia, area))
+        case ['empleados', nombre]:
+            nombre = _nombre_canonico(datos, nombre)
+            return Consulta(datos.version_empleado(nombre), lambda: _perfil(datos, nombre))
+        case ['jefes', nombre, 'equipo']:
+            nombre = _nombre_canonico(datos, nombre)
+            equipo = lambda: {**_serializable(_equipo(datos, nombre)),
+                              'pagina': _serializable(_pagina_equipo(datos, nombre, parametros))}
+            return Consulta(datos.version_empleado(nombre), equipo,
+                            tabla=lambda: _pagina_equipo(datos, nombre, parametros).tabla)
+        case ['mesa']:
+            # Precalculada con los datos (ver mesa.py); abarca toda la organización
+            return Consulta(datos.version, lambda: [
+                {**_serializable(integrante), **_serializable(datos.mesa.consolidado(integrante.nombre))}
+                for integrante in datos.mesa.integrantes
+            ])
+        case ['comparativo']:
+            # Una sola tabla del cubo; depende de todas las áreas
+            return Consulta(datos.version, lambda: _comparativo(datos, parametros),
+                            tabla=lambda: _comparativo(datos, parametros))
+        case ['calidad']:
+            # Reporte calculado en la ingesta (ver validacion.py)
+            return Consulta(datos.version,
+                            lambda: {'resumen': resumen_calidad(datos.calidad), 'incidencias': datos.calidad},
+                            tabla=lambda: datos.calidad)
+        case ['buscar']:
+            texto = parametros.get('q', [''])[0]
+            limite = _entero(parametros, 'limite', RESULTADOS_POR_DEFECTO, MAXIMO_RESULTADOS_BUSQUEDA)
+            return Consulta(datos.version, lambda: datos.buscador.buscar(texto, limite))
+    raise ErrorAPI(404, "Ruta no encontrada")
+
+
+class CacheRespuestas:
+    """Cuerpos serializados por (ruta, parámetros, formato, token), con desalojo LRU."""
+
+    def __init__(self, maximo=MAX_RESPUESTAS_CACHE):
+        self.maximo = maximo
+        self._entradas = OrderedDict()
+
+    def obtener(self, clave):
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+        return entrada
+
+    def guardar(self, clave, entrada):
+        self._entradas[clave] = entrada
+        if len(self._entradas) > self.maximo:
+            self._entradas.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+def _etag(segmentos, parametros, token, formato):
+    """ETag débil del recurso: ruta y parámetros normalizados más su token de versión."""
+    recurso = json.dumps([segmentos, sorted((k, v) for k, v in parametros.items() if k != 'formato'), token],
+                         ensure_ascii=False)
+    return f'W/"{hashlib.sha1(recurso.encode("utf-8")).hexdigest()[:16]}-{formato}"'.encode('ascii')
+
+
+class AplicacionAPI:
+    """Aplicación ASGI sobre una fuente de datos con ``actual`` (recargador o lector)."""
+
+    def __init__(self, fuente, maximo_cache=MAX_RESPUESTAS_CACHE):
+        self.fuente = fuente
+        self.cache = CacheRespuestas(maximo_cache)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                mensaje = await receive()
+                if mensaje['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif mensaje['type'] == 'lifespan.shutdown':
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        estado, encabezados, cuerpo = self.responder(
+            scope['method'], scope.get('raw_path') or scope['path'].encode('utf-8'),
+            scope.get('query_string', b''), dict(scope.get('headers', ())),
+        )
+        await send({'type': 'http.response.start', 'status': estado, 'headers': encabezados})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else cuerpo})
+
+    def responder(self, metodo, ruta, query, encabezados):
+        """(estado, encabezados, cuerpo) de una petición; ``encabezados`` en bytes y minúsculas."""
+        if metodo not in ('GET', 'HEAD'):
+            return self._error(405, "Solo se admiten GET y HEAD", [(b'allow', b'GET, HEAD')])
+        # Cada segmento se decodifica por separado: un nombre puede llevar '/'
+        segmentos = [unquote(s) for s in ruta.decode('latin-1').strip('/').split('/')]
+        if not segmentos or segmentos[0] != PREFIJO:
+            return self._error(404, "Ruta no encontrada")
+        parametros = parse_qs(query.decode('latin-1'))
+        aceptado = encabezados.get(b'accept', b'').decode('latin-1')
+        formato = parametros.get('formato', ['arrow' if TIPO_ARROW in aceptado else 'json'])[0]
+        if formato not in ('json', 'arrow'):
+            return self._error(400, "formato debe ser 'json' o 'arrow'")
+
+        # Una sola versión por petición aunque se publique otra a mitad de camino
+        datos = self.fuente.actual
+        try:
+            consulta = interpretar(datos, segmentos[1:], parametros)
+            if formato == 'arrow' and consulta.tabla is None:
+                raise ErrorAPI(406, "Esta ruta no tiene una tabla para enviar en formato Arrow")
+        except ErrorAPI as error:
+            return self._error(error.estado, error.mensaje, detalle=error.detalle)
+
+        etag = _etag(segmentos, parametros, consulta.token, formato)
+        comunes = [(b'etag', etag), (b'cache-control', b'no-cache'), (b'vary', b'accept, accept-encoding')]
+        if etag in (e.strip() for e in encabezados.get(b'if-none-match', b'').split(b',')):
+            return 304, comunes, b''
+
+        clave = (ruta, query, formato, consulta.token)
+        entrada = self.cache.obtener(clave)
+        if entrada is None:
+            try:
+                cuerpo = _arrow(consulta.tabla()) if formato == 'arrow' else _json(consulta.calcular())
+            except ErrorAPI as error:
+                return self._error(error.estado, error.mensaje, detalle=error.detalle)
+            entrada = {'cuerpo': cuerpo, 'gzip': None}
+            self.cache.guardar(clave, entrada)
+
+        cuerpo = entrada['cuerpo']
+        tipo = TIPO_ARROW if formato == 'arrow' else TIPO_JSON
+        encabezados_respuesta = [(b'content-type', tipo.encode('ascii')), *comunes]
+        if len(cuerpo) >= MINIMO_GZIP and b'gzip' in encabezados.get(b'accept-encoding', b''):
+            if entrada['gzip'] is None:
+                # mtime=0: el mismo contenido comprime siempre a los mismos bytes
+                entrada['gzip'] = gzip.compress(cuerpo, compresslevel=6, mtime=0)
+            cuerpo = entrada['gzip']
+            encabezados_respuesta.append((b'content-encoding', b'gzip'))
+        encabezados_respuesta.append((b'content-length', str(len(cuerpo)).encode('ascii')))
+        return 200, encabezados_respuesta, cuerpo
+
+    @staticmethod
+    def _error(estado, mensaje, extra=(), detalle=None):
+        cuerpo = _json({'error': mensaje, **(detalle or {})})
+        return estado, [(b'content-type', TIPO_JSON.encode('ascii')),
+                        (b'content-length', str(len(cuerpo)).encode('ascii')), *extra], cuerpo
+
+
+def crear_app(excel_file=EXCEL_FILE):
+    """Aplicación con la misma fuente de datos que el dashboard."""
+    # Con TABLERO_9BOX_MEMORIA_COMPARTIDA se mapean las tablas del publicador
+    if DIRECTORIO_COMPARTIDO:
+        try:
+            return AplicacionAPI(LectorCompartido(DIRECTORIO_COMPARTIDO))
+        except FileNotFoundError:
+            pass
+    return AplicacionAPI(RecargadorLibro(excel_file))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('excel', nargs='?', default=EXCEL_FILE)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        parser.exit(1, "Se necesita un servidor ASGI: pip install uvicorn\n")
+    uvicorn.run(crear_app(args.excel), host=args.host, port=args.puerto, log_level='info')
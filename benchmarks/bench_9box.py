@@ -0,0 +1,215 @@
+"""Benchmark sin navegador de las rutas de datos del dashboard 9-Box.
+
+Genera libros sintéticos (ver org_sintetica.py), mide cada ruta de datos con
+los mismos módulos que usa el dashboard y escribe un reporte JSON. Con
+``--comparar`` se contrasta contra un reporte previo y el proceso termina con
+código 1 si alguna ruta empeoró más allá del umbral.
+
+Uso::
+
+    python benchmarks/bench_9box.py --tamaños 1000 10000 --salida reporte.json
+    python benchmarks/bench_9box.py --comparar reporte_base.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from agregados import CuboAgregados  # noqa: E402
+from almacen import construir_almacen  # noqa: E402
+from buscador import BuscadorEmpleados  # noqa: E402
+from cuadrantes import agregar_cuadrante, distribucion_cuadrantes  # noqa: E402
+from directorio import DirectorioEmpleados  # noqa: E402
+from graficos import figura_matriz_9box  # noqa: E402
+from ingesta import cargar_libro, construir_snapshot  # noqa: E402
+from nombres import ResolutorNombres, nombres_canonicos  # noqa: E402
+from org_sintetica import escribir_libro  # noqa: E402
+from organigrama import ArbolOrganizacional  # noqa: E402
+from validacion import normalizar_hoja  # noqa: E402
+
+TAMAÑOS = [1_000, 10_000, 100_000]
+DIRECTORIO_LIBROS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.libros')
+# Una ruta se considera regresión si su mediana empeora más de este factor
+UMBRAL_REGRESION = 1.25
+
+
+def medir(funcion, repeticiones):
+    """Ejecuta ``funcion`` varias veces; devuelve (tiempos en s, último resultado)."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, resultado
+
+
+def _resumen_tiempos(tiempos, **extra):
+    return {
+        'mediana_s': statistics.median(tiempos),
+        'min_s': min(tiempos),
+        'max_s': max(tiempos),
+        'repeticiones': len(tiempos),
+        **extra,
+    }
+
+
+def libro_sintetico(n_empleados, semilla):
+    """Ruta del libro sintético, generándolo solo la primera vez."""
+    os.makedirs(DIRECTORIO_LIBROS, exist_ok=True)
+    ruta = os.path.join(DIRECTORIO_LIBROS, f'org_{n_empleados}_{semilla}.xlsx')
+    if not os.path.exists(ruta):
+        escribir_libro(ruta, n_empleados, semilla)
+    return ruta
+
+
+def medir_tamaño(n_empleados, repeticiones, semilla=0):
+    """Mide todas las rutas de datos para un libro de ``n_empleados``."""
+    ruta = libro_sintetico(n_empleados, semilla)
+    resultados = {}
+    # El parseo del xlsx es la ruta más lenta: se limita a pocas repeticiones
+    repeticiones_xlsx = max(1, min(repeticiones, 3 if n_empleados <= 10_000 else 1))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        tiempos, _ = medir(lambda: construir_snapshot(ruta, directorio), repeticiones_xlsx)
+        resultados['ingesta.parseo_xlsx'] = _resumen_tiempos(tiempos, bytes_xlsx=os.path.getsize(ruta))
+
+        tiempos, hojas = medir(lambda: cargar_libro(ruta, directorio), repeticiones)
+        resultados['ingesta.carga_snapshot'] = _resumen_tiempos(tiempos)
+    df_niveles_medios, df_jefes, _, _ = hojas
+
+    # Como en recarga.construir_datos: esquema y tipos antes de los índices
+    tiempos, _ = medir(lambda: (normalizar_hoja('niveles_medios', df_niveles_medios),
+                                normalizar_hoja('jefes', df_jefes)), repeticiones)
+    resultados['ingesta.validacion'] = _resumen_tiempos(tiempos, filas=len(df_niveles_medios) + len(df_jefes))
+
+    tiempos, _ = medir(lambda: (agregar_cuadrante(df_niveles_medios), agregar_cuadrante(df_jefes)), repeticiones)
+    resultados['cuadrantes.columna'] = _resumen_tiempos(tiempos, filas=len(df_niveles_medios) + len(df_jefes))
+
+    tiempos, nombres = medir(lambda: ResolutorNombres(nombres_canonicos(df_niveles_medios, df_jefes)), repeticiones)
+    resultados['indices.nombres'] = _resumen_tiempos(tiempos, nombres=len(nombres.nombres))
+
+    tiempos, almacen = medir(lambda: construir_almacen(df_niveles_medios, df_jefes), repeticiones)
+    df_all, df_niveles_medios, df_jefes = almacen
+    resultados['indices.almacen'] = _resumen_tiempos(
+        tiempos, bytes_memoria=int(df_all.memory_usage(deep=True).sum())
+    )
+
+    tiempos, directorio = medir(lambda: DirectorioEmpleados(df_niveles_medios, df_jefes), repeticiones)
+    resultados['indices.directorio'] = _resumen_tiempos(tiempos)
+
+    tiempos, organigrama = medir(lambda: ArbolOrganizacional(df_all), repeticiones)
+    resultados['indices.organigrama'] = _resumen_tiempos(tiempos, profundidad_max=int(organigrama.profundidad.max()))
+
+    tiempos, cubo = medir(lambda: CuboAgregados(df_all), repeticiones)
+    resultados['indices.cubo'] = _resumen_tiempos(tiempos)
+
+    tiempos, buscador = medir(lambda: BuscadorEmpleados(df_all), repeticiones)
+    resultados['indices.buscador'] = _resumen_tiempos(tiempos, palabras=len(buscador.vocabulario))
+
+    tiempos, _ = medir(lambda: directorio.mascara_jefes(df_all['NOMBRE']), repeticiones)
+    resultados['consulta.es_jefe_todos'] = _resumen_tiempos(tiempos, filas=len(df_all))
+
+    jefes = df_jefes['NOMBRE'].tolist()
+    tiempos, _ = medir(lambda: [directorio.equipo_directo(jefe) for jefe in jefes], repeticiones)
+    resultados['consulta.equipo_directo_todos_los_jefes'] = _resumen_tiempos(tiempos, jefes=len(jefes))
+
+    tiempos, _ = medir(lambda: [organigrama.resumen_subarbol(jefe) for jefe in jefes], repeticiones)
+    resultados['consulta.resumen_subarbol_todos_los_jefes'] = _resumen_tiempos(tiempos, jefes=len(jefes))
+
+    # Prefijo de una letra: el peor caso del buscador (coincide con casi todos)
+    tiempos, _ = medir(lambda: [buscador.buscar(c) for c in 'aeiou'], repeticiones)
+    resultados['consulta.busqueda_prefijo_corto'] = _resumen_tiempos(tiempos, consultas=5)
+
+    # El área más grande es el peor caso para la matriz y la distribución
+    gerencia, area = df_all.groupby(['GERENCIA', 'ÁREA'], observed=True).size().idxmax()
+    empleados_area = cubo.filtrar(df_all, gerencia, area)
+    con_evaluacion = empleados_area[empleados_area['CUADRANTE'].notna()]
+
+    tiempos, _ = medir(lambda: distribucion_cuadrantes(con_evaluacion), repeticiones)
+    resultados['consulta.distribucion_area'] = _resumen_tiempos(tiempos, filas=len(con_evaluacion))
+
+    tiempos, figura_json = medir(lambda: figura_matriz_9box(con_evaluacion).to_json(), repeticiones)
+    resultados['figuras.matriz_9box'] = _resumen_tiempos(
+        tiempos, puntos=len(con_evaluacion), bytes_json=len(figura_json.encode('utf-8'))
+    )
+    return resultados
+
+
+def _commit_actual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(reporte, base, umbral=UMBRAL_REGRESION):
+    """Imprime la comparación ruta por ruta; devuelve la lista de regresiones."""
+    regresiones = []
+    for tamaño, rutas in reporte['resultados'].items():
+        for ruta, medicion in rutas.items():
+            previa = base.get('resultados', {}).get(tamaño, {}).get(ruta)
+            if previa is None:
+                continue
+            factor = medicion['mediana_s'] / previa['mediana_s'] if previa['mediana_s'] else float('inf')
+            marca = ' <-- REGRESIÓN' if factor > umbral else ''
+            print(f"{tamaño:>7} {ruta:<45} {previa['mediana_s']:10.4f}s -> {medicion['mediana_s']:10.4f}s  x{factor:5.2f}{marca}")
+            if factor > umbral:
+                regresiones.append((tamaño, ruta, factor))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tamaños', type=int, nargs='+', default=TAMAÑOS)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', help="Archivo JSON del reporte (por defecto, stdout)")
+    parser.add_argument('--comparar', help="Reporte JSON previo contra el cual comparar")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args()
+
+    reporte = {
+        'metadatos': {
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _commit_actual(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'semilla': args.semilla,
+        },
+        'resultados': {},
+    }
+    for n_empleados in args.tamaños:
+        print(f"Midiendo {n_empleados} empleados...", file=sys.stderr)
+        reporte['resultados'][str(n_empleados)] = medir_tamaño(n_empleados, args.repeticiones, args.semilla)
+
+    texto = json.dumps(reporte, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        if comparar(reporte, base, args.umbral):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
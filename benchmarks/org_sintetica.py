@@ -0,0 +1,157 @@
+"""Generador de libros sintéticos con el mismo esquema que 'Tactico_9box (1).xlsx'.
+
+Crea una jerarquía con gerente general, mesa gerencial, gerencias, áreas y
+varios niveles de jefaturas (profundidad realista de 5 a 7 niveles). Los que
+tienen equipo van a la hoja 'Jefes' con competencias; el resto a 'Niveles
+medios' con su evaluación 9-Box.
+
+Uso::
+
+    python benchmarks/org_sintetica.py 10000 salida.xlsx [--semilla 0]
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cuadrantes import TABLA_CUADRANTES  # noqa: E402
+
+APELLIDOS = [
+    'GARCIA', 'LOPEZ', 'MARTINEZ', 'RODRIGUEZ', 'GOMEZ', 'GIRALDO', 'OSPINA', 'CASTAÑO',
+    'ARANGO', 'BOTERO', 'DUQUE', 'MOLINA', 'VARGAS', 'RAMIREZ', 'HENAO', 'ZULUAGA',
+]
+NOMBRES = [
+    'ANDRES', 'CAROLINA', 'JUAN', 'MARIA', 'LUIS', 'ANA', 'CARLOS', 'PAULA',
+    'JORGE', 'LAURA', 'DAVID', 'SARA', 'FELIPE', 'NATALIA', 'SANTIAGO', 'CAMILA',
+]
+SEDES = ['TESORITO', 'MANIZALES', 'BOGOTA', 'MEDELLIN']
+COMPETENCIAS = [
+    ('Pensamiento estratégico', 0.75), ('Liderazgo transformacional', 0.75),
+    ('Gestión de crisis y adaptabilidad', 0.80), ('Orientación a resultados', 0.85),
+    ('Desarrollo de personas', 0.70),
+]
+
+COLUMNAS_NIVELES_MEDIOS = [
+    'Cédula', 'NOMBRE', 'SEDE', 'GERENCIA', 'ÁREA', 'JEFE DIRECTO', 'CARGO', 'NIVEL',
+    'Potencial', 'Desempeño', '9BOX ', 2025, 2024, 'RESULTADO INDIVIDUAL',
+]
+COLUMNAS_JEFES = [
+    'Cédula', 'NOMBRE', 'GERENCIA', 'ÁREA', 'JEFE DIRECTO', 'CARGO', 'NIVEL',
+    'PROMEDIO EQUIPO', 'RESULTADO INDIVIDUAL',
+]
+COLUMNAS_COMPETENCIAS = ['Nombre del participante', 'Competencia', '%', 'IMPACTO ESPERADO ']
+
+# Cargo y nivel por profundidad en la jerarquía
+_CARGOS = [
+    ('GERENTE GENERAL', 'GERENTE'), ('GERENTE', 'GERENTE'), ('DIRECTOR', 'DIRECTOR'),
+    ('JEFE', 'JEFE'), ('COORDINADOR', 'COORDINADOR'), ('LIDER', 'LIDER'),
+]
+
+
+def _nombre(i):
+    return (f"{APELLIDOS[i % 16]} {APELLIDOS[(i // 16) % 16]} "
+            f"{NOMBRES[(i // 256) % 16]} {i:06d}")
+
+
+def generar_org(n_empleados, semilla=0):
+    """Genera las filas de las tres hojas para ``n_empleados`` personas.
+
+    Devuelve (filas_niveles_medios, filas_jefes, filas_competencias), cada una
+    como lista de tuplas en el orden de columnas del libro real.
+    """
+    rng = np.random.default_rng(semilla)
+    n_gerencias = max(3, min(12, n_empleados // 500 + 3))
+
+    # Nivel 0: gerente general; nivel 1: mesa gerencial (un gerente por gerencia)
+    padre = [-1] + [0] * n_gerencias
+    profundidad = [0] + [1] * n_gerencias
+    gerencia = [0] + list(range(n_gerencias))
+    area = [-1] + [-1] * n_gerencias
+
+    # Niveles inferiores: cada persona cuelga de un jefe del nivel anterior,
+    # con un abanico que crece al bajar (pocos directores, muchos analistas)
+    abanicos = [n_gerencias, 4, 5, 6, 8, 10]
+    nivel_actual = list(range(1, n_gerencias + 1))
+    nivel = 1
+    while len(padre) < n_empleados:
+        nivel += 1
+        abanico = abanicos[min(nivel, len(abanicos) - 1)]
+        siguiente = []
+        for jefe in nivel_actual:
+            for _ in range(int(rng.integers(max(1, abanico - 2), abanico + 3))):
+                if len(padre) >= n_empleados:
+                    break
+                i = len(padre)
+                padre.append(jefe)
+                profundidad.append(nivel)
+                gerencia.append(gerencia[jefe])
+                # El área se fija en el nivel 2 y se hereda hacia abajo
+                area.append(i if nivel == 2 else area[jefe])
+                siguiente.append(i)
+        nivel_actual = siguiente or nivel_actual
+
+    n = len(padre)
+    tiene_equipo = np.zeros(n, dtype=bool)
+    tiene_equipo[[p for p in padre if p >= 0]] = True
+
+    nombres = [_nombre(i) for i in range(n)]
+    nombres_gerencia = [f"GERENCIA {g + 1:02d}" for g in range(n_gerencias)]
+    potencial = rng.choice([1, 2, 3], size=n, p=[0.2, 0.55, 0.25])
+    desempeño = rng.choice([1, 2, 3], size=n, p=[0.15, 0.55, 0.30])
+    resultado = np.round(rng.uniform(0.6, 1.0, size=n), 4)
+
+    filas_nm, filas_j, filas_comp = [], [], []
+    for i in range(n):
+        cargo, nivel_cargo = _CARGOS[min(profundidad[i], len(_CARGOS) - 1)]
+        if profundidad[i] >= len(_CARGOS) - 1 and not tiene_equipo[i]:
+            cargo, nivel_cargo = ('ANALISTA', 'AUXILIAR') if i % 3 else ('AUXILIAR', 'AUXILIAR')
+        nombre_area = 'MESA GERENCIAL' if profundidad[i] <= 1 else f"AREA {area[i]:06d}"
+        jefe = nombres[padre[i]] if padre[i] >= 0 else None
+        cedula = 10_000_000 + i
+
+        if tiene_equipo[i]:
+            filas_j.append((
+                cedula, nombres[i], nombres_gerencia[gerencia[i]], nombre_area, jefe,
+                cargo, nivel_cargo, float(np.round(rng.uniform(0.6, 1.0), 6)), float(resultado[i]),
+            ))
+            for competencia, impacto in COMPETENCIAS:
+                filas_comp.append((nombres[i], competencia, float(np.round(rng.uniform(0.4, 1.0), 6)), impacto))
+        else:
+            p, d = int(potencial[i]), int(desempeño[i])
+            filas_nm.append((
+                cedula, nombres[i], SEDES[i % len(SEDES)], nombres_gerencia[gerencia[i]], nombre_area,
+                jefe, cargo, nivel_cargo, p, d, int(TABLA_CUADRANTES[p - 1, d - 1]),
+                float(resultado[i]), float(np.round(rng.uniform(0.6, 1.0), 4)), float(resultado[i]),
+            ))
+    return filas_nm, filas_j, filas_comp
+
+
+def escribir_libro(ruta, n_empleados, semilla=0):
+    """Escribe un libro sintético en ``ruta`` (modo write-only de openpyxl)."""
+    filas_nm, filas_j, filas_comp = generar_org(n_empleados, semilla)
+    libro = Workbook(write_only=True)
+    for titulo, columnas, filas in (
+        ('Niveles medios', COLUMNAS_NIVELES_MEDIOS, filas_nm),
+        ('Jefes', COLUMNAS_JEFES, filas_j),
+        ('Competencias Jefes 2025', COLUMNAS_COMPETENCIAS, filas_comp),
+    ):
+        hoja = libro.create_sheet(titulo)
+        hoja.append(columnas)
+        for fila in filas:
+            hoja.append(fila)
+    libro.save(ruta)
+    return ruta
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('empleados', type=int)
+    parser.add_argument('salida')
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+    escribir_libro(args.salida, args.empleados, args.semilla)
+    print(f"Libro sintético con {args.empleados} empleados escrito en {args.salida}")
@@ -0,0 +1,156 @@
+"""Buscador de empleados por NOMBRE y CARGO en toda la organización.
+
+Se construye una vez por versión de los datos. Cada palabra normalizada (ver
+nombres.py) de NOMBRE y CARGO entra a un vocabulario ordenado con la lista de
+empleados que la contienen, así una consulta resuelve cada palabra como un
+rango de prefijos con ``bisect`` y solo se envían al navegador los primeros
+resultados, no el directorio completo. Una palabra que no es prefijo de
+ninguna se compara por trigramas con el vocabulario para tolerar errores de
+tipeo ("bastidaz" encuentra "BASTIDAS").
+"""
+import bisect
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from nombres import normalizar_nombre, trigramas
+
+RESULTADOS_POR_DEFECTO = 8
+# Similitud de Jaccard mínima entre trigramas para aceptar una palabra parecida
+UMBRAL_APROXIMADO = 0.45
+# Puntaje por palabra de la consulta según dónde coincide
+_PUNTAJE_NOMBRE_EXACTO = 4
+_PUNTAJE_NOMBRE_PREFIJO = 3
+_PUNTAJE_CARGO_EXACTO = 2
+_PUNTAJE_CARGO_PREFIJO = 1
+
+
+def _postings(pares_palabra, pares_empleado, n_palabras):
+    """Listas de empleados por palabra en formato CSR: (ids ordenados, desplazamientos).
+
+    Con el vocabulario ordenado, las palabras con un mismo prefijo son un
+    rango contiguo y sus empleados un único slice de ``ids``.
+    """
+    orden = np.lexsort((pares_empleado, pares_palabra))
+    desplazamientos = np.zeros(n_palabras + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pares_palabra, minlength=n_palabras), out=desplazamientos[1:])
+    return pares_empleado[orden].astype(np.int32), desplazamientos
+
+
+class BuscadorEmpleados:
+    """Índice de prefijos por palabra sobre NOMBRE y CARGO (una entrada por nombre)."""
+
+    def __init__(self, df_all):
+        # Primera fila de cada nombre, igual que el directorio
+        unicos = df_all[df_all['NOMBRE'].notna() & ~df_all['NOMBRE'].duplicated()]
+        self.nombres = unicos['NOMBRE'].astype(object).to_numpy()
+        self._columnas = {
+            clave: (unicos[columna].astype(object).to_numpy() if columna in unicos.columns
+                    else np.full(len(unicos), None, dtype=object))
+            for clave, columna in (('cargo', 'CARGO'), ('gerencia', 'GERENCIA'), ('area', 'ÁREA'))
+        }
+        self.ids = {nombre: i for i, nombre in enumerate(self.nombres)}
+        # Posición alfabética de cada nombre: desempata resultados con igual puntaje
+        self._orden = np.argsort(np.argsort(self.nombres, kind='stable'), kind='stable')
+
+        palabras_nombre = [set(normalizar_nombre(nombre).split()) for nombre in self.nombres]
+        # El cargo se normaliza una vez por valor distinto
+        cargos = pd.Categorical(self._columnas['cargo'])
+        palabras_cargo = [set(normalizar_nombre(cargo).split()) for cargo in cargos.categories]
+
+        self.vocabulario = sorted(set().union(*palabras_nombre, *palabras_cargo))
+        indice = {palabra: i for i, palabra in enumerate(self.vocabulario)}
+
+        pares = [(indice[palabra], i) for i, palabras in enumerate(palabras_nombre) for palabra in palabras]
+        pares_nombre = np.array(pares, dtype=np.int64).reshape(-1, 2)
+        self._por_nombre = _postings(pares_nombre[:, 0], pares_nombre[:, 1], len(self.vocabulario))
+
+        codigos = cargos.codes
+        orden = np.argsort(codigos, kind='stable')
+        limites = np.searchsorted(codigos[orden], np.arange(len(cargos.categories) + 1))
+        bloques_palabra, bloques_empleado = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for codigo, palabras in enumerate(palabras_cargo):
+            empleados = orden[limites[codigo]:limites[codigo + 1]]
+            for palabra in palabras:
+                bloques_palabra.append(np.full(len(empleados), indice[palabra], dtype=np.int64))
+                bloques_empleado.append(empleados)
+        self._por_cargo = _postings(np.concatenate(bloques_palabra), np.concatenate(bloques_empleado),
+                                    len(self.vocabulario))
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def entrada(self, id_empleado):
+        """Resultado mostrable: nombre, cargo, gerencia y área del empleado."""
+        return {
+            'nombre': self.nombres[id_empleado],
+            **{clave: (valores[id_empleado] if pd.notna(valores[id_empleado]) else None)
+               for clave, valores in self._columnas.items()},
+        }
+
+    @cached_property
+    def _trigramas_vocabulario(self):
+        """trigrama -> posiciones en el vocabulario; se construye con el primer error de tipeo."""
+        indice = {}
+        for posicion, palabra in enumerate(self.vocabulario):
+            for trigrama in trigramas(palabra):
+                indice.setdefault(trigrama, []).append(posicion)
+        return indice
+
+    def _palabras_parecidas(self, palabra):
+        """Posiciones del vocabulario con similitud de trigramas >= UMBRAL_APROXIMADO."""
+        buscados = trigramas(palabra)
+        comunes = {}
+        for trigrama in buscados:
+            for posicion in self._trigramas_vocabulario.get(trigrama, ()):
+                comunes[posicion] = comunes.get(posicion, 0) + 1
+        return [posicion for posicion, n in comunes.items()
+                if n / (len(buscados) + len(trigramas(self.vocabulario[posicion])) - n) >= UMBRAL_APROXIMADO]
+
+    def _puntajes_palabra(self, palabra):
+        """Puntaje por empleado para una palabra de la consulta (0 si no coincide)."""
+        puntajes = np.zeros(len(self), dtype=np.int8)
+        inicio = bisect.bisect_left(self.vocabulario, palabra)
+        fin = bisect.bisect_left(self.vocabulario, palabra + '\uffff', lo=inicio)
+        if inicio == fin:
+            # Sin prefijos: palabras parecidas, con puntaje de prefijo
+            parecidas = self._palabras_parecidas(palabra)
+            for (ids, desplazamientos), valor in ((self._por_cargo, _PUNTAJE_CARGO_PREFIJO),
+                                                  (self._por_nombre, _PUNTAJE_NOMBRE_PREFIJO)):
+                for posicion in parecidas:
+                    puntajes[ids[desplazamientos[posicion]:desplazamientos[posicion + 1]]] = valor
+            return puntajes
+        exacta = self.vocabulario[inicio] == palabra
+        # De menor a mayor puntaje: cada asignación pisa a las anteriores
+        for (ids, desplazamientos), valor_prefijo, valor_exacto in (
+                (self._por_cargo, _PUNTAJE_CARGO_PREFIJO, _PUNTAJE_CARGO_EXACTO),
+                (self._por_nombre, _PUNTAJE_NOMBRE_PREFIJO, _PUNTAJE_NOMBRE_EXACTO)):
+            puntajes[ids[desplazamientos[inicio]:desplazamientos[fin]]] = valor_prefijo
+            if exacta:
+                puntajes[ids[desplazamientos[inicio]:desplazamientos[inicio + 1]]] = valor_exacto
+        return puntajes
+
+    def buscar(self, texto, limite=RESULTADOS_POR_DEFECTO):
+        """Hasta ``limite`` entradas que contienen todas las palabras de ``texto``.
+
+        Cada palabra puede ser prefijo de una palabra del nombre o del cargo, o
+        parecerse a una; las coincidencias en el nombre y las palabras
+        completas pesan más.
+        """
+        palabras = normalizar_nombre(texto).split() if texto else []
+        if not palabras or not len(self):
+            return []
+        total = np.zeros(len(self), dtype=np.int16)
+        coinciden = np.ones(len(self), dtype=bool)
+        for palabra in palabras:
+            puntajes = self._puntajes_palabra(palabra)
+            coinciden &= puntajes > 0
+            total += puntajes
+        ids = np.flatnonzero(coinciden)
+        clave = -total[ids].astype(np.int64) * len(self) + self._orden[ids]
+        if len(ids) > limite:
+            # Los ``limite`` mejores sin ordenar todo el conjunto
+            seleccion = np.argpartition(clave, limite - 1)[:limite]
+            ids, clave = ids[seleccion], clave[seleccion]
+        return [self.entrada(i) for i in ids[np.argsort(clave)]]
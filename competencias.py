@@ -0,0 +1,71 @@
+"""Índice de competencias de jefes precalculado en la carga.
+
+La hoja 'Competencias Jefes 2025' se normaliza una sola vez: el % queda en
+escala 0-100, se calcula el puntaje ponderado por IMPACTO ESPERADO de cada
+participante y el percentil de cada resultado frente a toda la organización
+en esa competencia. El panel de detalle y los bloques de jefes solo consultan
+diccionarios.
+"""
+import numpy as np
+import pandas as pd
+
+COLUMNA_PARTICIPANTE = 'Nombre del participante'
+COLUMNA_IMPACTO = 'IMPACTO ESPERADO '
+
+
+class IndiceCompetencias:
+    """Perfil de competencias por participante.
+
+    ``perfiles[nombre]`` trae, en el orden de la hoja, las tuplas
+    (competencia, porcentaje 0-100, impacto esperado), los percentiles
+    organizacionales de cada una y los puntajes agregados.
+    """
+
+    def __init__(self, df_competencias_jefes):
+        df = df_competencias_jefes
+        self.perfiles = {}
+        if len(df) == 0:
+            self.participantes = frozenset()
+            return
+
+        # % e impacto ya numéricos (ver validacion.py)
+        porcentaje = df['%'].to_numpy(dtype=float)
+        # Algunos resultados vienen como fracción (0.85) y otros ya en % (85)
+        porcentaje = np.where(porcentaje <= 1, porcentaje * 100, porcentaje)
+        impacto = df[COLUMNA_IMPACTO].to_numpy()
+        impacto_num = impacto.astype(float)
+        percentil = (
+            pd.Series(porcentaje, index=df.index)
+            .groupby(df['Competencia'].to_numpy(), sort=False)
+            .rank(pct=True)
+            .mul(100)
+            .to_numpy()
+        )
+
+        participantes = df[COLUMNA_PARTICIPANTE].to_numpy(dtype=object)
+        competencias = df['Competencia'].to_numpy(dtype=object)
+        filas = {}
+        for posicion, nombre in enumerate(participantes):
+            if pd.notna(nombre):
+                filas.setdefault(nombre, []).append(posicion)
+
+        for nombre, posiciones in filas.items():
+            p = porcentaje[posiciones]
+            w = impacto_num[posiciones]
+            con_peso = ~np.isnan(p) & ~np.isnan(w)
+            self.perfiles[nombre] = {
+                'competencias': [(competencias[i], float(porcentaje[i]), impacto[i]) for i in posiciones],
+                'percentiles': [None if np.isnan(percentil[i]) else float(percentil[i]) for i in posiciones],
+                'promedio': float(np.nanmean(p)) if (~np.isnan(p)).any() else None,
+                'ponderado': float((p[con_peso] * w[con_peso]).sum() / w[con_peso].sum())
+                if con_peso.any() and w[con_peso].sum() else None,
+            }
+        self.participantes = frozenset(self.perfiles)
+
+    def perfil(self, nombre):
+        """Perfil completo del participante o None."""
+        return self.perfiles.get(nombre)
+
+    def contar_participantes(self, nombres):
+        """Cuántos de ``nombres`` (distintos) tienen competencias registradas."""
+        return len(self.participantes.intersection(nombres))
@@ -0,0 +1,82 @@
+"""Definición de la matriz 9-Box y cálculo vectorizado de cuadrantes."""
+import numpy as np
+import pandas as pd
+
+# --- Diccionario 9Box ---
+box_descriptions = {
+    "1": {"titulo": "Cuadrante 1 – TALENTO TOP", "descripcion": "Líder que tiene un desempeño extraordinario y alto potencial. Demuestra constantemente cualidades para desempeñar un rol de mayor responsabilidad dentro de INDUMA. Contagia a los demás, genera pasión y es ejemplo de cultura INDUMA."},
+    "2": {"titulo": "Cuadrante 2 – TALENTO EMERGENTE", "descripcion": "Muestra todas las cualidades para ser un líder dentro de INDUMA, es ejemplo de la cultura. Su desempeño es satisfactorio pero no es extraordinario."},
+    "3": {"titulo": "Cuadrante 3 – DESEMPEÑO ALTO IMPACTO", "descripcion": "Entrega constantemente resultados de manera extraordinaria. Cuenta con las habilidades para desarrollarse en un rol de mayor liderazgo en INDUMA, pero aún tiene algunas oportunidades que debe desarrollar para poder hacerlo."},
+    "4": {"titulo": "Cuadrante 4 – DESEMPEÑO EXTRAORDINARIO", "descripcion": "Entrega resultados extraordinarios, excede las expectativas. Es parte clave en asegurar los objetivos dentro de su área. No muestra cualidades para ocupar una posición de mayor liderazgo en INDUMA."},
+    "5": {"titulo": "Cuadrante 5 – TALENTO FUNDAMENTAL", "descripcion": "Entrega resultados satisfactoriamente, muestra potencial para asumir un rol de mayor liderazgo dentro de INDUMA pero aún tiene algunas oportunidades que debe desarrollar para poder hacerlo."},
+    "6": {"titulo": "Cuadrante 6 – TALENTO MAL ENFOCADO", "descripcion": "Tiene potencial pero presenta debilidades en su desempeño. Puede que no haya tenido el tiempo suficiente para demostrar lo que puede hacer."},
+    "7": {"titulo": "Cuadrante 7 – DESEMPEÑO SATISFACTORIO", "descripcion": "Entrega resultados satisfactoriamente pero no excede la expectativa. No muestra cualidades para ocupar una posición de mayor liderazgo en INDUMA."},
+    "8": {"titulo": "Cuadrante 8 – INCONSISTENTE", "descripcion": "Muestra algo de potencial para desarrollarse dentro de INDUMA, pero su desempeño es bajo, no está entregando resultados conforme a las expectativas."},
+    "9": {"titulo": "Cuadrante 9 – DESEMPEÑO BAJO", "descripcion": "No entrega resultados conforme a la expectativa y no se adapta a la cultura de INDUMA."}
+}
+
+# Mapeo de colores
+color_map = {
+    1: '#28a745', 2: '#28a745', 3: '#28a745',  # Verde
+    4: '#ffc107', 7: '#ffc107',  # Amarillo
+    5: '#fd7e14', 6: '#fd7e14',  # Naranja
+    8: '#dc3545', 9: '#dc3545'   # Rojo
+}
+
+# Talento top: los cuadrantes verdes (alto potencial con desempeño alto, o al revés)
+CUADRANTES_TALENTO_TOP = (1, 2, 3)
+
+# Tabla 3x3 indexada por [potencial - 1, desempeño - 1]
+TABLA_CUADRANTES = np.array([
+    [9, 7, 4],  # Potencial 1
+    [8, 5, 3],  # Potencial 2
+    [6, 2, 1],  # Potencial 3
+], dtype=np.int8)
+
+
+def calcular_cuadrantes(potencial, desempeño):
+    """Calcula el cuadrante 9-Box para arrays de potencial y desempeño.
+
+    Devuelve un array Int8 con <NA> donde falta alguno de los dos valores.
+    Como en la versión escalar, cualquier combinación fuera de 1..3 cae en 9.
+    """
+    pot = pd.to_numeric(pd.Series(potencial), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    des = pd.to_numeric(pd.Series(desempeño), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    evaluado = ~(np.isnan(pot) | np.isnan(des))
+
+    fila = np.where(evaluado, pot, 0).astype(np.int64) - 1
+    columna = np.where(evaluado, des, 0).astype(np.int64) - 1
+    # Solo enteros exactos 1..3 usan la tabla (2.5 no se trunca a 2)
+    en_rango = ((fila >= 0) & (fila < 3) & (columna >= 0) & (columna < 3)
+                & (pot == fila + 1) & (des == columna + 1))
+
+    cuadrantes = np.full(len(pot), 9, dtype=np.int8)
+    cuadrantes[en_rango] = TABLA_CUADRANTES[fila[en_rango], columna[en_rango]]
+    return pd.arrays.IntegerArray(cuadrantes, ~evaluado)
+
+
+def calcular_cuadrante(potencial, desempeño):
+    """Calcula el cuadrante 9-Box basado en potencial y desempeño"""
+    return int(calcular_cuadrantes([potencial], [desempeño])[0])
+
+
+def agregar_cuadrante(df):
+    """Agrega la columna CUADRANTE (Int8, <NA> sin evaluación) a df (hoja ya validada)."""
+    df['CUADRANTE'] = calcular_cuadrantes(df['Potencial'], df['Desempeño'])
+    return df
+
+
+def distribucion_cuadrantes(df):
+    """Conteo por cuadrante de los evaluados, en orden de primera aparición."""
+    return df['CUADRANTE'].dropna().astype(int).value_counts(sort=False)
+
+
+def tabla_equipo(equipo):
+    """Tabla del equipo de un jefe tal como se muestra (cuadrante y resultado como texto)."""
+    cuadrante_texto = ("Cuadrante " + equipo['CUADRANTE'].astype('string')).fillna("Sin evaluación")
+    return pd.DataFrame({
+        "Nombre": equipo['NOMBRE'],
+        "Cargo": equipo['CARGO'],
+        "Evaluación 9-Box": cuadrante_texto.astype(object),
+        "Resultado Individual": equipo['RESULTADO INDIVIDUAL'].map(lambda r: f"{r:.3f}" if pd.notna(r) else "N/A")
+    })
@@ -1,282 +1,359 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
-import plotly.graph_objects as go
 import plotly.express as px
+import os
+
+from cuadrantes import box_descriptions, color_map
+from exportacion import exportar_a_archivo
+from graficos import figura_comparativo_areas, figura_distribucion_cuadrantes, figura_matriz_9box
+from historial import DIRECTORIO_HISTORIAL, HistorialEvaluaciones, huella_historial
+from ingesta import EXCEL_FILE
+from memoria_compartida import DIRECTORIO_COMPARTIDO, LectorCompartido
+from nombres import sin_resolver
+from perfilado import PerfiladorSecciones, perfilado_solicitado
+from precarga import CacheDetalle, Precargador
+from recarga import RecargadorLibro
+from validacion import resumen_calidad
+import servicio
 
-# --- Utilidad para máscaras alineadas ---
-def _has_col_notna(df: pd.DataFrame, col: str) -> pd.Series:
-    """Devuelve una Serie booleana alineada al índice de df.
-    True si la columna existe y el valor no es NA; False si no existe.
-    """
-    if col in df.columns:
-        return df[col].notna()
-    return pd.Series(False, index=df.index, dtype=bool)
-
+st.set_page_config(page_title="Dashboard de Talento 9-Box", layout="wide")
 
+# Tiempos por sección, solo con ?perfil=1 o TABLERO_9BOX_PERFIL=1 (ver perfilado.py)
+perfil = PerfiladorSecciones(perfilado_solicitado())
 
-st.set_page_config(page_title="Dashboard de Talento 9-Box", layout="wide")
+# Máximo de entradas por función cacheada (desalojo LRU): mantiene la memoria
+# acotada sin importar cuántas sesiones/áreas/empleados se consulten
+MAX_ENTRADAS_CACHE = 256
 
 # --- Cargar y preprocesar datos ---
-@st.cache_data
-def load_data():
+# cache_resource: un solo recargador por proceso compartido por todas las sesiones.
+# Vigila el xlsx y publica una nueva versión cuando cambia (ver recarga.py).
+@st.cache_resource
+def obtener_recargador():
+    # Con TABLERO_9BOX_MEMORIA_COMPARTIDA, un proceso publicador ya cargó las
+    # tablas y este worker solo las mapea (ver memoria_compartida.py)
+    if DIRECTORIO_COMPARTIDO:
+        try:
+            return LectorCompartido(DIRECTORIO_COMPARTIDO)
+        except FileNotFoundError:
+            pass
     # CORRECCIÓN: La ruta del archivo Excel debe ser relativa al script en el entorno de despliegue
-    excel_file = 'Tactico_9box (1).xlsx'
-    df_niveles_medios = pd.read_excel(excel_file, sheet_name='Niveles medios')
-    df_jefes = pd.read_excel(excel_file, sheet_name='Jefes')
-    df_competencias_jefes = pd.read_excel(excel_file, sheet_name='Competencias Jefes 2025')
-    
-    # Combinar ambos dataframes para tener todos los empleados
-    df_all = pd.concat([df_niveles_medios, df_jefes], ignore_index=True, sort=False)
-    
-    return df_niveles_medios, df_jefes, df_competencias_jefes, df_all
-
-df_niveles_medios, df_jefes, df_competencias_jefes, df_all = load_data()
-
-# --- Diccionario 9Box ---
-box_descriptions = {
-    "1": {"titulo": "Cuadrante 1 – TALENTO TOP", "descripcion": "Líder que tiene un desempeño extraordinario y alto potencial. Demuestra constantemente cualidades para desempeñar un rol de mayor responsabilidad dentro de INDUMA. Contagia a los demás, genera pasión y es ejemplo de cultura INDUMA."},
-    "2": {"titulo": "Cuadrante 2 – TALENTO EMERGENTE", "descripcion": "Muestra todas las cualidades para ser un líder dentro de INDUMA, es ejemplo de la cultura. Su desempeño es satisfactorio pero no es extraordinario."},
-    "3": {"titulo": "Cuadrante 3 – DESEMPEÑO ALTO IMPACTO", "descripcion": "Entrega constantemente resultados de manera extraordinaria. Cuenta con las habilidades para desarrollarse en un rol de mayor liderazgo en INDUMA, pero aún tiene algunas oportunidades que debe desarrollar para poder hacerlo."},
-    "4": {"titulo": "Cuadrante 4 – DESEMPEÑO EXTRAORDINARIO", "descripcion": "Entrega resultados extraordinarios, excede las expectativas. Es parte clave en asegurar los objetivos dentro de su área. No muestra cualidades para ocupar una posición de mayor liderazgo en INDUMA."},
-    "5": {"titulo": "Cuadrante 5 – TALENTO FUNDAMENTAL", "descripcion": "Entrega resultados satisfactoriamente, muestra potencial para asumir un rol de mayor liderazgo dentro de INDUMA pero aún tiene algunas oportunidades que debe desarrollar para poder hacerlo."},
-    "6": {"titulo": "Cuadrante 6 – TALENTO MAL ENFOCADO", "descripcion": "Tiene potencial pero presenta debilidades en su desempeño. Puede que no haya tenido el tiempo suficiente para demostrar lo que puede hacer."},
-    "7": {"titulo": "Cuadrante 7 – DESEMPEÑO SATISFACTORIO", "descripcion": "Entrega resultados satisfactoriamente pero no excede la expectativa. No muestra cualidades para ocupar una posición de mayor liderazgo en INDUMA."},
-    "8": {"titulo": "Cuadrante 8 – INCONSISTENTE", "descripcion": "Muestra algo de potencial para desarrollarse dentro de INDUMA, pero su desempeño es bajo, no está entregando resultados conforme a las expectativas."},
-    "9": {"titulo": "Cuadrante 9 – DESEMPEÑO BAJO", "descripcion": "No entrega resultados conforme a la expectativa y no se adapta a la cultura de INDUMA."}
-}
-
-# Mapeo de colores
-color_map = {
-    1: '#28a745', 2: '#28a745', 3: '#28a745',  # Verde
-    4: '#ffc107', 7: '#ffc107',  # Amarillo
-    5: '#fd7e14', 6: '#fd7e14',  # Naranja
-    8: '#dc3545', 9: '#dc3545'   # Rojo
-}
-
-def calcular_cuadrante(potencial, desempeño):
-    """Calcula el cuadrante 9-Box basado en potencial y desempeño"""
-    if potencial == 3 and desempeño == 3:
-        return 1
-    elif potencial == 3 and desempeño == 2:
-        return 2
-    elif potencial == 3 and desempeño == 1:
-        return 6
-    elif potencial == 2 and desempeño == 3:
-        return 3
-    elif potencial == 2 and desempeño == 2:
-        return 5
-    elif potencial == 2 and desempeño == 1:
-        return 8
-    elif potencial == 1 and desempeño == 3:
-        return 4
-    elif potencial == 1 and desempeño == 2:
-        return 7
-    else:  # potencial == 1 and desempeño == 1
-        return 9
-
-def obtener_equipo_jefe(nombre_jefe):
-    """Obtiene el equipo a cargo de un jefe específico - VERSIÓN CORREGIDA"""
-    # CORRECCIÓN: Buscar en AMBAS hojas de manera completa
-    
-    # 1. Buscar equipo directo en niveles medios
-    equipo_directo_nm = df_niveles_medios[df_niveles_medios['JEFE DIRECTO'] == nombre_jefe]
-    
-    # 2. Buscar equipo directo en jefes
-    equipo_directo_j = df_jefes[df_jefes['JEFE DIRECTO'] == nombre_jefe]
-    
-    # 3. Combinar ambos equipos directos
-    equipos_directos = []
-    
-    if len(equipo_directo_nm) > 0:
-        equipos_directos.append(equipo_directo_nm)
-    
-    if len(equipo_directo_j) > 0:
-        equipos_directos.append(equipo_directo_j)
-    
-    # 4. Si hay equipos directos, combinarlos
-    if equipos_directos:
-        equipo_completo = pd.concat(equipos_directos, ignore_index=True, sort=False)
-        return equipo_completo
-    
-    # 5. Si no hay equipo directo, retornar DataFrame vacío
-    return pd.DataFrame()
+    # El xlsx se convierte una sola vez a un snapshot columnar (ver ingesta.py);
+    # solo se vuelve a parsear cuando cambia su contenido.
+    return RecargadorLibro(EXCEL_FILE)
 
-def es_jefe(nombre_empleado):
-    """Verifica si un empleado es jefe basado en múltiples criterios"""
-    # Criterio 1: Está en la hoja de Jefes
-    en_hoja_jefes = nombre_empleado in df_jefes['NOMBRE'].values
-    
-    # Criterio 2: Tiene PROMEDIO EQUIPO en cualquiera de las hojas
-    tiene_promedio_equipo = False
-    
-    # Buscar en niveles medios
-    empleado_nm = df_niveles_medios[df_niveles_medios['NOMBRE'] == nombre_empleado]
-    if not empleado_nm.empty and pd.notna(empleado_nm.iloc[0].get('PROMEDIO EQUIPO')):
-        tiene_promedio_equipo = True
-    
-    # Buscar en jefes
-    empleado_j = df_jefes[df_jefes['NOMBRE'] == nombre_empleado]
-    if not empleado_j.empty and pd.notna(empleado_j.iloc[0].get('PROMEDIO EQUIPO')):
-        tiene_promedio_equipo = True
-    
-    # Criterio 3: Aparece como JEFE DIRECTO de alguien
-    es_jefe_directo = (nombre_empleado in df_niveles_medios['JEFE DIRECTO'].values) or (nombre_empleado in df_jefes['JEFE DIRECTO'].values)
-    
-    return en_hoja_jefes or tiene_promedio_equipo or es_jefe_directo
+def load_data():
+    # Una sola lectura de la versión vigente por rerun: si se publica una versión
+    # nueva a mitad de la ejecución, esta sesión la usará en el siguiente rerun
+    return obtener_recargador().actual
+
+with perfil.seccion("carga") as seccion:
+    datos = load_data()
+    seccion.registrar(filas=len(datos.df_all))
+df_all, organigrama, cubo = datos.df_all, datos.organigrama, datos.cubo
+
+# Periodos anteriores registrados con historial.py; la huella (mtime del
+# manifiesto) cambia al registrar uno nuevo y eso crea otra instancia
+@st.cache_resource(max_entries=2)
+def obtener_historial(huella):
+    return HistorialEvaluaciones(DIRECTORIO_HISTORIAL)
+
+huella = huella_historial(DIRECTORIO_HISTORIAL)
+historial = obtener_historial(huella) if huella is not None else None
+
+# --- Consultas cacheadas por (versión, gerencia, área, empleado) ---
+# Los cálculos viven en servicio.py; aquí solo se cachean. Los clics en botones
+# y en la matriz provocan un rerun completo; con estas funciones solo se
+# recalcula lo que cambió de selección. La versión es el token del área o del
+# empleado (datos.version_area / datos.version_empleado), que solo cambia
+# cuando una recarga del libro los afecta.
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def datos_area(version, gerencia, area):
+    """Empleados del área (con y sin evaluación) y la lista para el selector."""
+    return servicio.obtener_empleados_area(datos, gerencia, area)
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_matriz_area(version, gerencia, area):
+    """Matriz 9-Box del área, o None si nadie tiene evaluación."""
+    empleados_con_evaluacion = datos_area(version, gerencia, area).con_evaluacion
+    if len(empleados_con_evaluacion) == 0:
+        return None
+    return figura_matriz_9box(empleados_con_evaluacion)
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_distribucion_area(version, gerencia, area):
+    """Gráfico de barras por cuadrante del área, leído del cubo."""
+    return figura_distribucion_cuadrantes(servicio.obtener_distribucion(datos, gerencia, area))
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def figura_comparativo(version, gerencia):
+    """Mapa de calor de todas las áreas (o las de ``gerencia``), leído del cubo."""
+    return figura_comparativo_areas(servicio.obtener_comparativo_areas(datos, gerencia))
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def resumen_calidad_version(version):
+    """Incidencias de la validación de la ingesta por hoja y problema."""
+    return resumen_calidad(datos.calidad)
+
+@st.cache_data(max_entries=MAX_ENTRADAS_CACHE)
+def datos_jefes_area(version, gerencia, area):
+    """Lista y estadísticas de los jefes sin evaluación del área."""
+    return servicio.obtener_jefes_area(datos, gerencia, area)
+
+# --- Panel de detalle ---
+# Caché por proceso compartida con un hilo que precalienta a los empleados del
+# área seleccionada (ver precarga.py); la Mesa Gerencial ya viene resuelta con
+# los datos (ver mesa.py). Cada sección del panel se consulta por separado y
+# solo cuando está abierta.
+@st.cache_resource
+def obtener_precargador():
+    return Precargador(CacheDetalle())
+
+precargador = obtener_precargador()
+
+def datos_empleado(nombre):
+    """Encabezado del panel de detalle de un empleado, o None si no existe."""
+    return precargador.cache.obtener(datos, "perfil", nombre)
+
+def datos_competencias(nombre):
+    """Competencias 2025 del jefe."""
+    return precargador.cache.obtener(datos, "competencias", nombre)
+
+def datos_equipo(nombre):
+    """Estadísticas del equipo del jefe, o None si no tiene equipo directo."""
+    return precargador.cache.obtener(datos, "equipo", nombre)
+
+def filtros_equipo(nombre_jefe, alcance):
+    """Cargos y cuadrantes presentes en el equipo (opciones de los filtros)."""
+    return precargador.cache.obtener(datos, "filtros_equipo", nombre_jefe, alcance)
+
+def pagina_equipo(nombre_jefe, *filtro):
+    """Una página de la tabla del equipo: solo esas filas viajan al navegador."""
+    return precargador.cache.obtener(datos, "pagina_equipo", nombre_jefe, *filtro)
+
+def fijar_detalle(nombre):
+    """Mantiene el panel de detalle en ``nombre`` mientras se usa la tabla de su equipo.
+
+    Los botones de Mesa Gerencial y de búsqueda solo valen por un rerun; sin
+    esto, cambiar de página devolvería el panel al empleado del selector.
+    """
+    st.session_state["detalle_fijado"] = nombre
+
+def soltar_detalle():
+    st.session_state.pop("detalle_fijado", None)
+
+def mostrar_tabla_equipo(nombre_jefe, equipo):
+    """Tabla del equipo; si no cabe en una página se filtra, ordena y pagina en el servidor."""
+    estructura = equipo.estructura
+    if max(equipo.total, estructura.total if estructura is not None else 0) <= servicio.POR_PAGINA_EQUIPO:
+        st.dataframe(pagina_equipo(nombre_jefe).tabla, use_container_width=True, hide_index=True)
+        return
+
+    alcance = "directos"
+    if estructura is not None:
+        etiquetas_alcance = {
+            "directos": f"Equipo directo ({equipo.total})",
+            "estructura": f"Estructura completa ({estructura.total})",
+        }
+        alcance = st.radio("Mostrar", list(etiquetas_alcance), format_func=etiquetas_alcance.get,
+                           horizontal=True, key=f"equipo_alcance_{nombre_jefe}",
+                           on_change=fijar_detalle, args=(nombre_jefe,))
+    filtros = filtros_equipo(nombre_jefe, alcance)
+    cuadrantes = st.multiselect(
+        "Evaluación 9-Box", filtros.cuadrantes, key=f"equipo_cuadrantes_{nombre_jefe}_{alcance}",
+        format_func=lambda c: "Sin evaluación" if c == 0 else f"Cuadrante {c}",
+        on_change=fijar_detalle, args=(nombre_jefe,),
+    )
+    cargo = st.selectbox("Cargo", [None] + filtros.cargos, key=f"equipo_cargo_{nombre_jefe}_{alcance}",
+                         format_func=lambda c: "Todos" if c is None else c,
+                         on_change=fijar_detalle, args=(nombre_jefe,))
+    col_or1, col_or2 = st.columns([3, 2])
+    with col_or1:
+        orden = st.selectbox("Ordenar por", [None, *servicio.ORDEN_EQUIPO], key=f"equipo_orden_{nombre_jefe}",
+                             format_func=lambda o: "Orden del equipo" if o is None else o,
+                             on_change=fijar_detalle, args=(nombre_jefe,))
+    with col_or2:
+        descendente = st.checkbox("Descendente", key=f"equipo_descendente_{nombre_jefe}",
+                                  on_change=fijar_detalle, args=(nombre_jefe,))
+
+    # La página vuelve a 1 cuando cambia el filtro o el orden (otra clave)
+    filtro = (alcance, tuple(cuadrantes), cargo, orden, descendente)
+    clave_pagina = f"equipo_pagina_{nombre_jefe}_{filtro}"
+    pagina = pagina_equipo(nombre_jefe, *filtro, st.session_state.get(clave_pagina, 1))
+    if pagina.total == 0:
+        st.info("Ningún miembro del equipo coincide con el filtro.")
+        return
+    st.dataframe(pagina.tabla, use_container_width=True, hide_index=True)
+    col_pag1, col_pag2 = st.columns([1, 2])
+    with col_pag1:
+        st.number_input("Página", min_value=1, max_value=pagina.paginas, step=1, key=clave_pagina,
+                        on_change=fijar_detalle, args=(nombre_jefe,))
+    with col_pag2:
+        st.caption(f"Mostrando {pagina.desde}–{pagina.desde + len(pagina.tabla) - 1} de {pagina.total} "
+                   f"(página {pagina.pagina} de {pagina.paginas})")
+
+def abrir_seccion(etiqueta, clave, nombre):
+    """Interruptor de una sección del panel; lo de adentro solo se calcula si está abierta."""
+    return st.toggle(etiqueta, key=clave, on_change=fijar_detalle, args=(nombre,))
 
 def mostrar_informacion_empleado(empleado_seleccionado):
-    """Función para mostrar la información detallada de un empleado"""
+    """Función para mostrar la información detallada de un empleado (devuelve el detalle mostrado)"""
     if empleado_seleccionado and empleado_seleccionado != "Seleccione un empleado...":
-        # Buscar datos del empleado seleccionado en ambas hojas
-        empleado_data_nm = df_niveles_medios[df_niveles_medios['NOMBRE'] == empleado_seleccionado]
-        empleado_data_j = df_jefes[df_jefes['NOMBRE'] == empleado_seleccionado]
-        
-        # Usar el registro que tenga más información
-        if not empleado_data_nm.empty:
-            empleado = empleado_data_nm.iloc[0]
-            fuente_datos = "niveles_medios"
-        elif not empleado_data_j.empty:
-            empleado = empleado_data_j.iloc[0]
-            fuente_datos = "jefes"
-        else:
+        detalle = datos_empleado(empleado_seleccionado)
+        if detalle is None:
             st.error("No se encontraron datos para este empleado.")
             return
         
         # Información básica
-        st.markdown(f"**👤 Nombre:** {empleado['NOMBRE']}")
-        st.markdown(f"**💼 Cargo:** {empleado['CARGO']}")
-        if pd.notna(empleado.get('JEFE DIRECTO')):
-            st.markdown(f"**👨‍💼 Jefe Directo:** {empleado['JEFE DIRECTO']}")
-        
-        if pd.notna(empleado.get('RESULTADO INDIVIDUAL')):
-            st.markdown(f"**📊 Resultado Individual:** {empleado['RESULTADO INDIVIDUAL']:.3f}")
+        st.markdown(f"**👤 Nombre:** {detalle.nombre}")
+        st.markdown(f"**💼 Cargo:** {detalle.cargo}")
+        if detalle.jefe_directo is not None:
+            st.markdown(f"**👨‍💼 Jefe Directo:** {detalle.jefe_directo}")
         
-        # Verificar si es un jefe usando la función mejorada
-        es_jefe_empleado = es_jefe(empleado_seleccionado)
+        if detalle.resultado_individual is not None:
+            st.markdown(f"**📊 Resultado Individual:** {detalle.resultado_individual:.3f}")
         
-        if es_jefe_empleado:
+        if detalle.es_jefe:
             st.markdown("---")
             st.markdown("**👑 INFORMACIÓN DE JEFE**")
             
-            # Buscar promedio de equipo en ambas hojas
-            promedio_equipo = None
-            if pd.notna(empleado.get('PROMEDIO EQUIPO')):
-                promedio_equipo = empleado['PROMEDIO EQUIPO']
-            else:
-                # Buscar en la otra hoja
-                if fuente_datos == "niveles_medios":
-                    empleado_otra_hoja = df_jefes[df_jefes['NOMBRE'] == empleado_seleccionado]
-                else:
-                    empleado_otra_hoja = df_niveles_medios[df_niveles_medios['NOMBRE'] == empleado_seleccionado]
-                
-                if not empleado_otra_hoja.empty and pd.notna(empleado_otra_hoja.iloc[0].get('PROMEDIO EQUIPO')):
-                    promedio_equipo = empleado_otra_hoja.iloc[0]['PROMEDIO EQUIPO']
-            
-            if promedio_equipo is not None:
-                st.markdown(f"**👥 Promedio Equipo:** {promedio_equipo:.3f}")
+            if detalle.promedio_equipo is not None:
+                st.markdown(f"**👥 Promedio Equipo:** {detalle.promedio_equipo:.3f}")
             
             # Mostrar competencias
-            competencias = df_competencias_jefes[
-                df_competencias_jefes['Nombre del participante'] == empleado_seleccionado
-            ]
-            
-            if not competencias.empty:
-                st.markdown("**🎯 Competencias 2025:**")
-                for _, comp in competencias.iterrows():
-                    porcentaje = comp['%'] * 100 if comp['%'] <= 1 else comp['%']
-                    st.markdown(f"• **{comp['Competencia']}:** {porcentaje:.1f}% (Impacto: {comp['IMPACTO ESPERADO ']:.2f})")
-            else:
-                st.info("No se encontraron competencias registradas para este jefe.")
+            if abrir_seccion("🎯 Competencias 2025", "detalle_competencias", detalle.nombre):
+                competencias = datos_competencias(detalle.nombre)
+                if competencias is not None:
+                    for competencia, porcentaje, impacto, percentil in competencias.competencias:
+                        texto_percentil = f" · Percentil org.: {percentil:.0f}" if percentil is not None else ""
+                        st.markdown(f"• **{competencia}:** {porcentaje:.1f}% (Impacto: {impacto:.2f}{texto_percentil})")
+                    if competencias.promedio is not None:
+                        texto_ponderado = (f" · **Ponderado por impacto:** {competencias.ponderado:.1f}%"
+                                           if competencias.ponderado is not None else "")
+                        st.markdown(f"**📈 Promedio:** {competencias.promedio:.1f}%{texto_ponderado}")
+                else:
+                    st.info("No se encontraron competencias registradas para este jefe.")
             
             # CORRECCIÓN: Mostrar equipo a cargo usando la función corregida
             st.markdown("---")
             st.markdown("**👥 EQUIPO A CARGO**")
-            equipo = obtener_equipo_jefe(empleado_seleccionado)
             
-            if not equipo.empty:
-                st.markdown(f"**Total miembros del equipo:** {len(equipo)}")
-                
-                # Crear tabla del equipo
-                equipo_display = []
-                for _, miembro in equipo.iterrows():
-                    cuadrante_texto = "Sin evaluación"
-                    # CORRECCIÓN: Verificar que las columnas existan antes de acceder
-                    if 'Potencial' in miembro.index and 'Desempeño' in miembro.index:
-                        if pd.notna(miembro.get('Potencial')) and pd.notna(miembro.get('Desempeño')):
-                            cuadrante = calcular_cuadrante(miembro['Potencial'], miembro['Desempeño'])
-                            cuadrante_texto = f"Cuadrante {cuadrante}"
+            if abrir_seccion("👥 Ver equipo", "detalle_equipo", detalle.nombre):
+                equipo = datos_equipo(detalle.nombre)
+                if equipo is not None:
+                    st.markdown(f"**Total miembros del equipo:** {equipo.total}")
                     
-                    equipo_display.append({
-                        "Nombre": miembro['NOMBRE'],
-                        "Cargo": miembro['CARGO'],
-                        "Evaluación 9-Box": cuadrante_texto,
-                        "Resultado Individual": f"{miembro['RESULTADO INDIVIDUAL']:.3f}" if pd.notna(miembro.get('RESULTADO INDIVIDUAL')) else "N/A"
-                    })
-                
-                # Mostrar tabla
-                df_equipo_display = pd.DataFrame(equipo_display)
-                st.dataframe(df_equipo_display, use_container_width=True, hide_index=True)
-                
-                # Estadísticas del equipo - CORRECCIÓN: Verificar que las columnas existan
-                st.markdown("**📊 Estadísticas del Equipo:**")
-                col_eq1, col_eq2 = st.columns(2)
-                
-                # Filtrar solo empleados con evaluación válida
-                equipo_con_evaluacion = equipo[
-                    _has_col_notna(equipo, 'Potencial') & _has_col_notna(equipo, 'Desempeño')
-                ]
-                
-                with col_eq1:
-                    if len(equipo_con_evaluacion) > 0 and 'Potencial' in equipo_con_evaluacion.columns:
-                        promedio_potencial_equipo = equipo_con_evaluacion['Potencial'].mean()
-                        st.metric("Promedio Potencial", f"{promedio_potencial_equipo:.2f}/3")
-                
-                with col_eq2:
-                    if len(equipo_con_evaluacion) > 0 and 'Desempeño' in equipo_con_evaluacion.columns:
-                        promedio_desempeño_equipo = equipo_con_evaluacion['Desempeño'].mean()
-                        st.metric("Promedio Desempeño", f"{promedio_desempeño_equipo:.2f}/3")
+                    # Tabla (paginada si el equipo no cabe en una página)
+                    mostrar_tabla_equipo(detalle.nombre, equipo)
+                    
+                    # Estadísticas del equipo
+                    st.markdown("**📊 Estadísticas del Equipo:**")
+                    col_eq1, col_eq2 = st.columns(2)
+                    
+                    with col_eq1:
+                        if equipo.promedio_potencial is not None:
+                            st.metric("Promedio Potencial", f"{equipo.promedio_potencial:.2f}/3")
+                    
+                    with col_eq2:
+                        if equipo.promedio_desempeño is not None:
+                            st.metric("Promedio Desempeño", f"{equipo.promedio_desempeño:.2f}/3")
+                else:
+                    st.info("Este jefe no tiene equipo directo registrado en el sistema.")
+            
+            if abrir_seccion("📈 Distribución y estructura", "detalle_distribucion", detalle.nombre):
+                equipo = datos_equipo(detalle.nombre)
                 
                 # Distribución por cuadrantes del equipo
-                if len(equipo_con_evaluacion) > 0 and 'Potencial' in equipo_con_evaluacion.columns and 'Desempeño' in equipo_con_evaluacion.columns:
+                if equipo is not None and equipo.distribucion is not None:
                     st.markdown("**📈 Distribución del Equipo por Cuadrantes:**")
-                    cuadrante_counts_equipo = {}
-                    for _, miembro in equipo_con_evaluacion.iterrows():
-                        cuadrante = calcular_cuadrante(miembro['Potencial'], miembro['Desempeño'])
-                        cuadrante_counts_equipo[cuadrante] = cuadrante_counts_equipo.get(cuadrante, 0) + 1
-                    
-                    for cuadrante, count in cuadrante_counts_equipo.items():
+                    for cuadrante, count in equipo.distribucion.items():
                         st.markdown(f"• **{box_descriptions[str(cuadrante)]['titulo']}:** {count} miembro(s)")
-            
-            else:
-                st.info("Este jefe no tiene equipo directo registrado en el sistema.")
-        
-        # Información de evaluación 9-Box (solo si tiene datos)
-        # CORRECCIÓN: Verificar que las columnas existan antes de acceder
-        if 'Potencial' in empleado.index and 'Desempeño' in empleado.index:
-            if pd.notna(empleado.get('Potencial')) and pd.notna(empleado.get('Desempeño')):
-                potencial = int(empleado['Potencial'])
-                desempeño = int(empleado['Desempeño'])
                 
-                cuadrante = calcular_cuadrante(potencial, desempeño)
-                
-                st.markdown("---")
-                st.markdown("**📊 EVALUACIÓN 9-BOX**")
-                st.markdown(f"**🎯 Potencial:** {potencial}/3")
-                st.markdown(f"**⚡ Desempeño:** {desempeño}/3")
-                
-                # Mostrar cuadrante con color
-                color = color_map[cuadrante]
-                st.markdown(f"**📍 {box_descriptions[str(cuadrante)]['titulo']}**")
-                st.markdown(f"<div style='background-color:{color}; padding:15px; border-radius:8px; color:white; font-weight:bold; margin:10px 0;'>{box_descriptions[str(cuadrante)]['descripcion']}</div>", unsafe_allow_html=True)
-            else:
-                if es_jefe_empleado:
+                # Estructura completa (directos e indirectos) desde el organigrama
+                estructura = equipo.estructura if equipo is not None else None
+                if estructura is not None:
                     st.markdown("---")
-                    st.info("📝 Este jefe no tiene evaluación 9-Box registrada en el sistema.")
-        else:
-            if es_jefe_empleado:
+                    st.markdown("**🌳 ESTRUCTURA COMPLETA**")
+                    st.markdown(f"**Total personas a cargo (directas e indirectas):** {estructura.total} en {estructura.niveles} nivel(es)")
+                    st.markdown(f"**Con evaluación 9-Box:** {estructura.evaluados}")
+                    if estructura.evaluados > 0:
+                        col_es1, col_es2 = st.columns(2)
+                        with col_es1:
+                            st.metric("Promedio Potencial (estructura)", f"{estructura.promedio_potencial:.2f}/3")
+                        with col_es2:
+                            st.metric("Promedio Desempeño (estructura)", f"{estructura.promedio_desempeño:.2f}/3")
+                        for cuadrante, count in estructura.distribucion.items():
+                            st.markdown(f"• **{box_descriptions[str(cuadrante)]['titulo']}:** {count} persona(s)")
+                
+                if equipo is None:
+                    st.caption("Sin equipo directo registrado.")
+                elif equipo.distribucion is None and estructura is None:
+                    st.info("No hay evaluaciones 9-Box en el equipo de este jefe.")
+
+        # Organización completa bajo un integrante de la Mesa Gerencial (precalculada en la carga)
+        consolidado = datos.mesa.consolidado(detalle.nombre)
+        if consolidado is not None and consolidado.estructura is not None:
+            estructura = consolidado.estructura
+            st.markdown("---")
+            st.markdown("**🏢 VISTA CONSOLIDADA - MESA GERENCIAL**")
+            col_mg1, col_mg2 = st.columns(2)
+            with col_mg1:
+                st.metric("Personas a cargo", estructura.total)
+            with col_mg2:
+                st.metric("Con evaluación 9-Box", estructura.evaluados)
+            if estructura.evaluados > 0:
+                col_mg3, col_mg4 = st.columns(2)
+                with col_mg3:
+                    st.metric("Promedio Potencial", f"{estructura.promedio_potencial:.2f}/3")
+                with col_mg4:
+                    st.metric("Promedio Desempeño", f"{estructura.promedio_desempeño:.2f}/3")
+                st.dataframe(pd.DataFrame({
+                    "Cuadrante": [box_descriptions[str(c)]['titulo'] for c in estructura.distribucion.index],
+                    "Personas": estructura.distribucion.to_numpy(),
+                }), use_container_width=True, hide_index=True)
+            competencias = consolidado.competencias
+            if competencias.participantes > 0:
+                st.markdown(f"**🎯 Competencias 2025 de la estructura:** {competencias.participantes} jefe(s), "
+                            f"promedio {competencias.promedio:.1f}%")
+                st.dataframe(pd.DataFrame(competencias.por_competencia,
+                                          columns=["Competencia", "Promedio %", "Jefes"]).round({"Promedio %": 1}),
+                             use_container_width=True, hide_index=True)
+
+        # Información de evaluación 9-Box (solo si tiene datos)
+        evaluacion = detalle.evaluacion
+        if evaluacion is not None:
+            cuadrante = evaluacion.cuadrante
+            
+            st.markdown("---")
+            st.markdown("**📊 EVALUACIÓN 9-BOX**")
+            st.markdown(f"**🎯 Potencial:** {evaluacion.potencial}/3")
+            st.markdown(f"**⚡ Desempeño:** {evaluacion.desempeño}/3")
+            
+            # Mostrar cuadrante con color
+            color = color_map[cuadrante]
+            st.markdown(f"**📍 {box_descriptions[str(cuadrante)]['titulo']}**")
+            st.markdown(f"<div style='background-color:{color}; padding:15px; border-radius:8px; color:white; font-weight:bold; margin:10px 0;'>{box_descriptions[str(cuadrante)]['descripcion']}</div>", unsafe_allow_html=True)
+        elif detalle.es_jefe:
+            st.markdown("---")
+            st.info("📝 Este jefe no tiene evaluación 9-Box registrada en el sistema.")
+        
+        # Cuadrante en cada periodo registrado en el historial
+        if historial is not None and detalle.cedula is not None:
+            trayectoria = historial.trayectoria(detalle.cedula)
+            if len(trayectoria) > 1:
                 st.markdown("---")
-                st.info("📝 Este jefe no tiene evaluación 9-Box registrada en el sistema.")
+                st.markdown("**🕒 TRAYECTORIA 9-BOX**")
+                st.dataframe(pd.DataFrame({
+                    "Periodo": trayectoria['PERIODO'],
+                    "Nombre": trayectoria['NOMBRE'],
+                    "Área": trayectoria['ÁREA'],
+                    "Evaluación 9-Box": ("Cuadrante " + trayectoria['CUADRANTE'].astype('string')).fillna("Sin evaluación").astype(object),
+                    "Potencial": trayectoria['Potencial'],
+                    "Desempeño": trayectoria['Desempeño'],
+                }), use_container_width=True, hide_index=True)
+        return detalle
     else:
         st.info("👆 Seleccione un empleado del menú desplegable para ver sus detalles.")
 
@@ -284,56 +361,112 @@ def mostrar_informacion_empleado(empleado_seleccionado):
 st.title("🎯 Dashboard de Talento 9-Box - INDUMA")
 
 # --- Sidebar para navegación jerárquica ---
-st.sidebar.title("🔍 Navegación Jerárquica")
-
-# NUEVA FUNCIONALIDAD: Acceso rápido a Mesa Gerencial
-st.sidebar.markdown("---")
-st.sidebar.markdown("### 👑 Acceso Rápido - Mesa Gerencial")
-
-# Obtener integrantes de Mesa Gerencial
-mesa_gerencial = df_all[df_all['ÁREA'] == 'MESA GERENCIAL'].drop_duplicates(subset=['NOMBRE'])
-
-# Crear botones para cada integrante de la Mesa Gerencial
-mesa_gerencial_seleccionado = None
-for _, integrante in mesa_gerencial.iterrows():
-    nombre_completo = integrante['NOMBRE']
-    nombre_corto = nombre_completo.split()[0] + " " + nombre_completo.split()[1]
-    cargo_corto = integrante['CARGO'].replace('GERENTE', 'GTE').replace('SUBGERENTE', 'SUBGTE')
-    
-    if st.sidebar.button(f"🎯 {nombre_corto}", key=f"mesa_{nombre_completo}", help=f"{cargo_corto}"):
-        mesa_gerencial_seleccionado = nombre_completo
-
-st.sidebar.markdown("---")
-
-# Filtros jerárquicos tradicionales
-gerencias_disponibles = sorted(df_all['GERENCIA'].dropna().unique())
-gerencia_seleccionada = st.sidebar.selectbox("📊 Seleccione una Gerencia", gerencias_disponibles)
-
-# Filtrar áreas por gerencia seleccionada
-areas_disponibles = sorted(df_all[df_all['GERENCIA'] == gerencia_seleccionada]['ÁREA'].dropna().unique())
-area_seleccionada = st.sidebar.selectbox("🏢 Seleccione un Área", areas_disponibles)
-
-# Filtrar empleados por gerencia y área
-empleados_filtrados = df_all[
-    (df_all['GERENCIA'] == gerencia_seleccionada) & 
-    (df_all['ÁREA'] == area_seleccionada)
-].drop_duplicates(subset=['NOMBRE'])  # Eliminar duplicados por nombre
-
-# Separar empleados con y sin datos de evaluación 9-Box
-# CORRECCIÓN: Verificar que las columnas existan antes de filtrar
-empleados_con_evaluacion = empleados_filtrados[
-    _has_col_notna(empleados_filtrados, 'Potencial') & _has_col_notna(empleados_filtrados, 'Desempeño')
-]
-
-empleados_sin_evaluacion = empleados_filtrados[
-    empleados_filtrados.get('Potencial', pd.Series()).isna() | 
-    empleados_filtrados.get('Desempeño', pd.Series()).isna()
-]
-
-st.sidebar.markdown("---")
-st.sidebar.markdown(f"**Total empleados en {area_seleccionada}:** {len(empleados_filtrados)}")
-st.sidebar.markdown(f"**Con evaluación 9-Box:** {len(empleados_con_evaluacion)}")
-st.sidebar.markdown(f"**Jefes sin evaluación:** {len(empleados_sin_evaluacion)}")
+with perfil.seccion("sidebar"):
+    st.sidebar.title("🔍 Navegación Jerárquica")
+
+    # La hoja se edita a mano: avisar si JEFE DIRECTO forma ciclos
+    if organigrama.ciclos:
+        st.sidebar.warning("⚠️ Ciclos en JEFE DIRECTO: " + "; ".join(" → ".join(ciclo) for ciclo in organigrama.ciclos))
+
+    # Referencias por nombre que no coinciden con ningún empleado (ver nombres.py)
+    referencias_sin_resolver = sin_resolver(datos.referencias)
+    if len(referencias_sin_resolver) > 0:
+        with st.sidebar.expander(f"⚠️ Nombres sin resolver ({len(referencias_sin_resolver)})"):
+            st.dataframe(referencias_sin_resolver[['Hoja', 'Columna', 'Valor', 'Filas', 'Sugerencia']],
+                         use_container_width=True, hide_index=True)
+
+    # Incidencias de la validación de la ingesta (ver validacion.py)
+    if len(datos.calidad) > 0:
+        st.sidebar.warning(f"⚠️ Calidad de datos: {len(datos.calidad)} incidencia(s). "
+                           "Ver '🧪 Calidad de Datos' al final de la página.")
+
+    # Búsqueda global por nombre o cargo: solo viajan al navegador los primeros
+    # resultados (ver buscador.py)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 🔎 Buscar Empleado")
+
+    with perfil.seccion("busqueda") as seccion:
+        texto_busqueda = st.sidebar.text_input(
+            "Nombre o cargo", key="busqueda_empleado", placeholder="Ej.: gomez, jefe producción"
+        )
+        empleado_buscado = None
+        if texto_busqueda.strip():
+            resultados_busqueda = datos.buscador.buscar(texto_busqueda)
+            if not resultados_busqueda:
+                st.sidebar.caption("Sin coincidencias.")
+            for resultado in resultados_busqueda:
+                ubicacion = " · ".join(str(v).strip() for v in (resultado['cargo'], resultado['area']) if v is not None)
+                if st.sidebar.button(f"👤 {resultado['nombre']}", key=f"buscar_{resultado['nombre']}", help=ubicacion):
+                    empleado_buscado = resultado['nombre']
+            seccion.registrar(filas=len(resultados_busqueda), carga=resultados_busqueda)
+
+    # NUEVA FUNCIONALIDAD: Acceso rápido a Mesa Gerencial
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 👑 Acceso Rápido - Mesa Gerencial")
+
+    with perfil.seccion("mesa_gerencial") as seccion:
+        # Integrantes y etiquetas de los botones precalculados en la carga (ver mesa.py)
+        mesa_gerencial_seleccionado = None
+        for integrante in datos.mesa.integrantes:
+            if st.sidebar.button(f"🎯 {integrante.etiqueta}", key=f"mesa_{integrante.nombre}", help=integrante.ayuda):
+                mesa_gerencial_seleccionado = integrante.nombre
+        seccion.registrar(filas=len(datos.mesa))
+
+    st.sidebar.markdown("---")
+
+    # Filtros jerárquicos tradicionales
+    gerencias_disponibles = cubo.gerencias
+    gerencia_seleccionada = st.sidebar.selectbox("📊 Seleccione una Gerencia", gerencias_disponibles,
+                                                 on_change=soltar_detalle)
+
+    # Filtrar áreas por gerencia seleccionada
+    areas_disponibles = cubo.areas(gerencia_seleccionada)
+    area_seleccionada = st.sidebar.selectbox("🏢 Seleccione un Área", areas_disponibles, on_change=soltar_detalle)
+
+    with perfil.seccion("filtros") as seccion:
+        # Filtrar empleados por gerencia y área (posiciones precalculadas, sin duplicados por nombre)
+        version_area = datos.version_area(gerencia_seleccionada, area_seleccionada)
+        empleados_area = datos_area(version_area, gerencia_seleccionada, area_seleccionada)
+        empleados_filtrados, empleados_con_evaluacion, empleados_sin_evaluacion, todos_empleados = (
+            empleados_area.empleados, empleados_area.con_evaluacion, empleados_area.sin_evaluacion, empleados_area.nombres
+        )
+        resumen_area = servicio.obtener_resumen_area(datos, gerencia_seleccionada, area_seleccionada)
+        seccion.registrar(filas=len(empleados_filtrados))
+
+    # Los próximos clics probables (empleados del área) se precalientan en
+    # segundo plano mientras se dibuja la página
+    precargador.programar(datos, todos_empleados)
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(f"**Total empleados en {area_seleccionada}:** {resumen_area.total}")
+    st.sidebar.markdown(f"**Con evaluación 9-Box:** {resumen_area.evaluados}")
+    st.sidebar.markdown(f"**Jefes sin evaluación:** {resumen_area.sin_evaluacion}")
+
+    # Exportación masiva (Excel + HTML por área y jefe, ver exportacion.py)
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 📦 Exportar Reportes")
+    alcance_exportacion = st.sidebar.selectbox(
+        "Alcance", ["Área seleccionada", "Gerencia seleccionada", "Toda la organización"], key="alcance_exportacion"
+    )
+    if st.sidebar.button("Generar exportación", key="generar_exportacion"):
+        filtro_exportacion = {
+            "Área seleccionada": dict(gerencia=gerencia_seleccionada, area=area_seleccionada),
+            "Gerencia seleccionada": dict(gerencia=gerencia_seleccionada),
+            "Toda la organización": {},
+        }[alcance_exportacion]
+        with st.spinner("Generando reportes..."):
+            st.session_state["exportacion"] = exportar_a_archivo(datos, **filtro_exportacion)
+    ruta_exportacion = st.session_state.get("exportacion")
+    if ruta_exportacion:
+        try:
+            with open(ruta_exportacion, "rb") as archivo_exportacion:
+                st.sidebar.download_button(
+                    "⬇️ Descargar reportes (.zip)", archivo_exportacion,
+                    file_name=os.path.basename(ruta_exportacion), mime="application/zip", key="descargar_exportacion",
+                )
+        except FileNotFoundError:
+            # El zip ya se limpió: hay que volver a generarlo
+            st.session_state.pop("exportacion", None)
 
 # --- Layout principal ---
 col1, col2 = st.columns([2, 1])
@@ -341,206 +474,166 @@ col1, col2 = st.columns([2, 1])
 with col1:
     st.header("📈 Matriz 9-Box Interactiva")
     
-    if len(empleados_con_evaluacion) > 0:
-        # Crear la matriz 9-Box con Plotly
-        fig = go.Figure()
+    with perfil.seccion("matriz") as seccion:
+        # Crear la matriz 9-Box con Plotly (una sola traza, cacheada por área)
+        fig = figura_matriz_area(version_area, gerencia_seleccionada, area_seleccionada)
+        if fig is not None:
+            # Mostrar el gráfico
+            selected_points = st.plotly_chart(fig, use_container_width=True, on_select="rerun")
         
-        # Agregar puntos para cada empleado con evaluación
-        for _, empleado in empleados_con_evaluacion.iterrows():
-            potencial = empleado['Potencial']
-            desempeño = empleado['Desempeño']
-            nombre = empleado['NOMBRE']
-            
-            cuadrante = calcular_cuadrante(potencial, desempeño)
-            
-            fig.add_trace(go.Scatter(
-                x=[desempeño],
-                y=[potencial],
-                mode='markers+text',
-                text=[nombre.split()[0]],  # Solo primer nombre
-                textposition="middle center",
-                marker=dict(
-                    size=25,
-                    color=color_map[cuadrante],
-                    line=dict(width=2, color='white'),
-                    opacity=0.8
-                ),
-                name=nombre,
-                hovertemplate=f"<b>{nombre}</b><br>" +
-                             f"Desempeño: {desempeño}<br>" +
-                             f"Potencial: {potencial}<br>" +
-                             f"Haga clic para ver detalles<br>" +
-                             "<extra></extra>",
-                customdata=[nombre]
-            ))
-        
-        # Configurar el layout de la matriz
-        fig.update_layout(
-            title="Matriz 9-Box por Desempeño vs Potencial",
-            xaxis=dict(
-                title="Desempeño",
-                tickmode='array',
-                tickvals=[1, 2, 3],
-                ticktext=['Bajo (1)', 'Medio (2)', 'Alto (3)'],
-                range=[0.5, 3.5],
-                gridcolor='lightgray'
-            ),
-            yaxis=dict(
-                title="Potencial",
-                tickmode='array',
-                tickvals=[1, 2, 3],
-                ticktext=['Bajo (1)', 'Medio (2)', 'Alto (3)'],
-                range=[0.5, 3.5],
-                gridcolor='lightgray'
-            ),
-            showlegend=False,
-            height=500,
-            plot_bgcolor='rgba(248,249,250,1)',
-            font=dict(size=12)
-        )
-        
-        # Agregar líneas de cuadrícula para separar cuadrantes
-        for i in [1.5, 2.5]:
-            fig.add_hline(y=i, line_dash="dash", line_color="gray", opacity=0.7, line_width=2)
-            fig.add_vline(x=i, line_dash="dash", line_color="gray", opacity=0.7, line_width=2)
-        
-        # Agregar etiquetas de cuadrantes (solo números)
-        cuadrante_positions = {
-            (1, 3): "6", (2, 3): "2", (3, 3): "1",
-            (1, 2): "8", (2, 2): "5", (3, 2): "3",
-            (1, 1): "9", (2, 1): "7", (3, 1): "4"
-        }
-        
-        for (x, y), label in cuadrante_positions.items():
-            fig.add_annotation(
-                x=x, y=y,
-                text=f"<b>{label}</b>",
-                showarrow=False,
-                font=dict(size=16, color="gray"),
-                bgcolor="rgba(255,255,255,0.9)",
-                bordercolor="gray",
-                borderwidth=1,
-                xshift=40,
-                yshift=40
-            )
-        
-        # Mostrar el gráfico
-        selected_points = st.plotly_chart(fig, use_container_width=True, on_select="rerun")
-        
-    else:
-        st.warning("No hay empleados con datos de evaluación 9-Box en esta área.")
+        else:
+            st.warning("No hay empleados con datos de evaluación 9-Box en esta área.")
+        seccion.registrar(filas=len(empleados_con_evaluacion), carga=fig)
     
     # Selector de empleado (incluyendo TODOS los empleados filtrados)
     st.subheader("👤 Seleccionar Empleado")
     
-    # CORRECCIÓN: Asegurar que todos los empleados filtrados aparezcan en el dropdown
-    todos_empleados = sorted(empleados_filtrados['NOMBRE'].unique().tolist())
-    
-    # Debug: Mostrar cuántos empleados hay
-    st.caption(f"Total empleados disponibles: {len(todos_empleados)}")
-    
     empleado_seleccionado = st.selectbox(
         "Elija un empleado para ver detalles:",
         ["Seleccione un empleado..."] + todos_empleados,
-        key="empleado_selector"
+        key="empleado_selector",
+        on_change=soltar_detalle,
     )
 
 with col2:
     st.header("📋 Detalles del Evaluado")
     
-    # Si se seleccionó alguien de la Mesa Gerencial, mostrar su información
-    if mesa_gerencial_seleccionado:
-        mostrar_informacion_empleado(mesa_gerencial_seleccionado)
-    else:
-        mostrar_informacion_empleado(empleado_seleccionado)
+    with perfil.seccion("detalle") as seccion:
+        # Si se seleccionó alguien de la Mesa Gerencial o de la búsqueda, mostrar su información
+        if mesa_gerencial_seleccionado or empleado_buscado:
+            soltar_detalle()
+        if mesa_gerencial_seleccionado:
+            detalle = mostrar_informacion_empleado(mesa_gerencial_seleccionado)
+        elif empleado_buscado:
+            detalle = mostrar_informacion_empleado(empleado_buscado)
+        elif st.session_state.get("detalle_fijado"):
+            # Panel fijado al usar la tabla paginada del equipo
+            detalle = mostrar_informacion_empleado(st.session_state["detalle_fijado"])
+        else:
+            detalle = mostrar_informacion_empleado(empleado_seleccionado)
+        seccion.registrar(carga=detalle)
 
 # --- Información adicional sobre jefes sin evaluación ---
-if len(empleados_sin_evaluacion) > 0:
-    st.markdown("---")
-    st.header("👑 Jefes en esta Área")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("📋 Lista de Jefes")
-        for _, jefe in empleados_sin_evaluacion.iterrows():
-            if es_jefe(jefe['NOMBRE']):
-                st.markdown(f"• **{jefe['NOMBRE']}** - {jefe['CARGO']}")
-    
-    with col2:
-        st.subheader("📊 Estadísticas de Jefes")
-        jefes_con_promedio = empleados_sin_evaluacion[empleados_sin_evaluacion.apply(lambda x: es_jefe(x['NOMBRE']), axis=1)]
-        if len(jefes_con_promedio) > 0:
-            # Calcular promedio de equipos
-            promedios_equipos = []
-            for _, jefe in jefes_con_promedio.iterrows():
-                if pd.notna(jefe.get('PROMEDIO EQUIPO')):
-                    promedios_equipos.append(jefe['PROMEDIO EQUIPO'])
-                else:
-                    # Buscar en la otra hoja
-                    jefe_otra_hoja = df_jefes[df_jefes['NOMBRE'] == jefe['NOMBRE']]
-                    if not jefe_otra_hoja.empty and pd.notna(jefe_otra_hoja.iloc[0].get('PROMEDIO EQUIPO')):
-                        promedios_equipos.append(jefe_otra_hoja.iloc[0]['PROMEDIO EQUIPO'])
-            
-            if promedios_equipos:
-                promedio_equipos = sum(promedios_equipos) / len(promedios_equipos)
-                st.metric("Promedio de Equipos", f"{promedio_equipos:.3f}")
-            
-            # Mostrar jefes con competencias
-            jefes_con_competencias = df_competencias_jefes[
-                df_competencias_jefes['Nombre del participante'].isin(empleados_sin_evaluacion['NOMBRE'])
-            ]['Nombre del participante'].nunique()
-            st.metric("Jefes con Competencias", jefes_con_competencias)
+with perfil.seccion("jefes") as seccion:
+    if len(empleados_sin_evaluacion) > 0:
+        st.markdown("---")
+        st.header("👑 Jefes en esta Área")
+        
+        datos_jefes = datos_jefes_area(version_area, gerencia_seleccionada, area_seleccionada)
+        seccion.registrar(filas=len(empleados_sin_evaluacion), carga=datos_jefes)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("📋 Lista de Jefes")
+            for nombre_jefe, cargo_jefe in datos_jefes.jefes:
+                st.markdown(f"• **{nombre_jefe}** - {cargo_jefe}")
+        
+        with col2:
+            st.subheader("📊 Estadísticas de Jefes")
+            if datos_jefes.jefes:
+                if datos_jefes.promedio_equipos is not None:
+                    st.metric("Promedio de Equipos", f"{datos_jefes.promedio_equipos:.3f}")
+                
+                # Mostrar jefes con competencias
+                st.metric("Jefes con Competencias", datos_jefes.con_competencias)
 
 # --- Resumen estadístico ---
-st.markdown("---")
-st.header("📊 Resumen Estadístico")
+with perfil.seccion("resumen") as seccion:
+    st.markdown("---")
+    st.header("📊 Resumen Estadístico")
 
-col1, col2, col3 = st.columns(3)
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.metric("Total Empleados", len(empleados_filtrados))
+    # Métricas y distribución leídas del cubo de agregados
+    with col1:
+        st.metric("Total Empleados", resumen_area.total)
 
-with col2:
-    if len(empleados_con_evaluacion) > 0 and 'Potencial' in empleados_con_evaluacion.columns:
-        promedio_potencial = empleados_con_evaluacion['Potencial'].mean()
-        st.metric("Promedio Potencial", f"{promedio_potencial:.2f}/3")
-
-with col3:
-    if len(empleados_con_evaluacion) > 0 and 'Desempeño' in empleados_con_evaluacion.columns:
-        promedio_desempeño = empleados_con_evaluacion['Desempeño'].mean()
-        st.metric("Promedio Desempeño", f"{promedio_desempeño:.2f}/3")
-
-# Distribución por cuadrantes
-if len(empleados_con_evaluacion) > 0 and 'Potencial' in empleados_con_evaluacion.columns and 'Desempeño' in empleados_con_evaluacion.columns:
-    st.subheader("📈 Distribución por Cuadrantes")
-    
-    # Calcular distribución
-    cuadrante_counts = {}
-    for _, empleado in empleados_con_evaluacion.iterrows():
-        potencial = empleado['Potencial']
-        desempeño = empleado['Desempeño']
-        cuadrante = calcular_cuadrante(potencial, desempeño)
-        cuadrante_counts[cuadrante] = cuadrante_counts.get(cuadrante, 0) + 1
-    
-    # Crear gráfico de barras
-    if cuadrante_counts:
-        cuadrantes = list(cuadrante_counts.keys())
-        counts = list(cuadrante_counts.values())
-        labels = [f"{box_descriptions[str(c)]['titulo']}" for c in cuadrantes]
-        colors = [color_map[c] for c in cuadrantes]
-        
-        fig_bar = go.Figure(data=[
-            go.Bar(x=labels, y=counts, marker_color=colors, text=counts, textposition='auto')
-        ])
-        
-        fig_bar.update_layout(
-            title="Distribución de Empleados por Cuadrante 9-Box",
-            xaxis_title="Cuadrante",
-            yaxis_title="Número de Empleados",
-            height=400,
-            showlegend=False
-        )
+    with col2:
+        if resumen_area.evaluados > 0:
+            promedio_potencial = resumen_area.promedio_potencial
+            st.metric("Promedio Potencial", f"{promedio_potencial:.2f}/3")
+
+    with col3:
+        if resumen_area.evaluados > 0:
+            promedio_desempeño = resumen_area.promedio_desempeño
+            st.metric("Promedio Desempeño", f"{promedio_desempeño:.2f}/3")
+
+    # Distribución por cuadrantes
+    if resumen_area.evaluados > 0:
+        st.subheader("📈 Distribución por Cuadrantes")
         
-        st.plotly_chart(fig_bar, use_container_width=True)
-
+        # Crear gráfico de barras
+        if len(resumen_area.distribucion) > 0:
+            fig_bar = figura_distribucion_area(version_area, gerencia_seleccionada, area_seleccionada)
+            st.plotly_chart(fig_bar, use_container_width=True)
+            seccion.registrar(filas=resumen_area.evaluados, carga=fig_bar)
+
+# --- Comparativo entre áreas (una sola tabla del cubo, ver agregados.py) ---
+with perfil.seccion("comparativo") as seccion:
+    st.markdown("---")
+    st.header("🗺️ Comparativo entre Áreas")
+
+    if st.toggle("Comparar áreas lado a lado", key="modo_comparativo"):
+        alcance_comparativo = st.radio("Áreas", ["Toda la organización", "Gerencia seleccionada"],
+                                       horizontal=True, key="alcance_comparativo")
+        gerencia_comparativo = gerencia_seleccionada if alcance_comparativo == "Gerencia seleccionada" else None
+        # Depende de todas las áreas: se cachea por la versión global
+        fig_comparativo = figura_comparativo(datos.version, gerencia_comparativo)
+        st.plotly_chart(fig_comparativo, use_container_width=True)
+        st.caption("Talento top: evaluados en los cuadrantes 1, 2 y 3. Los % son sobre los evaluados de cada área.")
+        seccion.registrar(filas=len(fig_comparativo.data[0].y), carga=fig_comparativo)
+
+# --- Movimientos entre periodos (solo con historial, ver historial.py) ---
+with perfil.seccion("historial") as seccion:
+    if historial is not None and len(historial) >= 2:
+        st.markdown("---")
+        st.header("🔀 Movimientos entre Periodos")
+
+        col_h1, col_h2 = st.columns(2)
+        with col_h1:
+            periodo_desde = st.selectbox("Desde", historial.periodos[:-1],
+                                         index=len(historial) - 2, key="periodo_desde")
+        with col_h2:
+            periodos_hasta = historial.periodos[historial.periodos.index(periodo_desde) + 1:]
+            periodo_hasta = st.selectbox("Hasta", periodos_hasta, index=len(periodos_hasta) - 1, key="periodo_hasta")
+
+        # Transiciones precalculadas al registrar cada periodo
+        matriz = historial.matriz_transicion(periodo_desde, periodo_hasta, gerencia_seleccionada, area_seleccionada)
+        en_ambos = int(matriz.to_numpy().sum())
+        sin_cambio = int(np.trace(matriz.to_numpy()))
+        col_h3, col_h4 = st.columns(2)
+        with col_h3:
+            st.metric("Personas en ambos periodos", en_ambos)
+        with col_h4:
+            st.metric("Cambiaron de cuadrante", en_ambos - sin_cambio)
+
+        etiquetas = {c: "Sin evaluación" if c == 0 else f"Cuadrante {c}" for c in matriz.index}
+        st.caption(f"Filas: cuadrante en {periodo_desde} · Columnas: cuadrante en {periodo_hasta}")
+        st.dataframe(matriz.rename(index=etiquetas, columns=etiquetas), use_container_width=True)
+        seccion.registrar(filas=en_ambos, carga=matriz)
+
+# --- Calidad de datos (reporte calculado en la ingesta, ver validacion.py) ---
+with perfil.seccion("calidad") as seccion:
+    st.markdown("---")
+    st.header("🧪 Calidad de Datos")
+
+    if len(datos.calidad) == 0:
+        st.success("Sin incidencias: el libro cumple el esquema, la escala 1-3 y los cruces entre hojas.")
+    elif st.toggle(f"Ver reporte ({len(datos.calidad)} incidencia(s))", key="ver_calidad"):
+        st.dataframe(resumen_calidad_version(datos.version), use_container_width=True, hide_index=True)
+        problemas = st.multiselect("Problema", sorted(datos.calidad['Problema'].unique()), key="calidad_problemas")
+        incidencias = datos.calidad[datos.calidad['Problema'].isin(problemas)] if problemas else datos.calidad
+        st.dataframe(incidencias, use_container_width=True, hide_index=True)
+        st.caption("Fila: posición entre las filas con datos de la hoja (1 = la primera bajo el encabezado). "
+                   "Los valores inválidos se tratan como vacíos en el resto del tablero.")
+        seccion.registrar(filas=len(incidencias), carga=incidencias)
+
+# --- Tiempos por sección (solo con el perfilado activo) ---
+perfil.mostrar(
+    gerencia=gerencia_seleccionada,
+    area=area_seleccionada,
+    empleado=(mesa_gerencial_seleccionado or empleado_buscado or st.session_state.get("detalle_fijado")
+              or empleado_seleccionado),
+    version=datos.version,
+)
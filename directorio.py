@@ -0,0 +1,107 @@
+"""Directorio de empleados precalculado a partir de las hojas del libro.
+
+Reemplaza los filtros ``df[df['NOMBRE'] == nombre]`` sobre las tablas completas
+por búsquedas O(1) en diccionarios construidos una sola vez en la carga.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _indice_por_nombre(df, columna='NOMBRE'):
+    """nombre -> posición de la primera fila con ese nombre."""
+    indice = {}
+    if columna not in df.columns:
+        return indice
+    for posicion, nombre in enumerate(df[columna].tolist()):
+        if pd.notna(nombre) and nombre not in indice:
+            indice[nombre] = posicion
+    return indice
+
+
+def _adyacencia(df, columna='JEFE DIRECTO'):
+    """jefe -> posiciones (en orden de la hoja) de sus reportes directos."""
+    reportes = {}
+    if columna not in df.columns:
+        return reportes
+    for posicion, jefe in enumerate(df[columna].tolist()):
+        if pd.notna(jefe):
+            reportes.setdefault(jefe, []).append(posicion)
+    return reportes
+
+
+class DirectorioEmpleados:
+    """Índices de nombre, reportes directos y jefatura para ambas hojas.
+
+    - ``posicion_nm`` / ``posicion_j``: nombre -> fila en cada hoja.
+    - ``reportes_nm`` / ``reportes_j``: JEFE DIRECTO -> filas de sus reportes.
+    - ``ids``: nombre -> id entero; ``jefe`` es el bitset (array bool) por id.
+    """
+
+    def __init__(self, df_niveles_medios, df_jefes):
+        self.df_niveles_medios = df_niveles_medios
+        self.df_jefes = df_jefes
+
+        self.posicion_nm = _indice_por_nombre(df_niveles_medios)
+        self.posicion_j = _indice_por_nombre(df_jefes)
+        self.reportes_nm = _adyacencia(df_niveles_medios)
+        self.reportes_j = _adyacencia(df_jefes)
+
+        # Ids estables para todo nombre que aparezca como empleado o como jefe
+        self.ids = {}
+        for fuente in (self.posicion_nm, self.posicion_j, self.reportes_nm, self.reportes_j):
+            for nombre in fuente:
+                self.ids.setdefault(nombre, len(self.ids))
+        self.nombres = list(self.ids)
+
+        self.jefe = np.zeros(len(self.ids), dtype=bool)
+        # Criterio 1: está en la hoja de Jefes
+        self._marcar(self.posicion_j)
+        # Criterio 2: su primera fila en alguna hoja tiene PROMEDIO EQUIPO
+        for df, posiciones in ((df_niveles_medios, self.posicion_nm), (df_jefes, self.posicion_j)):
+            tiene_promedio = df['PROMEDIO EQUIPO'].notna().to_numpy()
+            self._marcar(n for n, pos in posiciones.items() if tiene_promedio[pos])
+        # Criterio 3: aparece como JEFE DIRECTO de alguien
+        self._marcar(self.reportes_nm)
+        self._marcar(self.reportes_j)
+
+    def _marcar(self, nombres):
+        ids = [self.ids[n] for n in nombres]
+        if ids:
+            self.jefe[ids] = True
+
+    def es_jefe(self, nombre):
+        id_empleado = self.ids.get(nombre)
+        return id_empleado is not None and bool(self.jefe[id_empleado])
+
+    def mascara_jefes(self, nombres):
+        """Versión vectorizada de ``es_jefe`` para una Serie de nombres."""
+        if isinstance(nombres.dtype, pd.CategoricalDtype):
+            # Una evaluación por nombre distinto presente (código -1: nulo)
+            codigos, posiciones = np.unique(nombres.cat.codes.to_numpy(), return_inverse=True)
+            categorias = nombres.cat.categories
+            valores = np.array([c >= 0 and self.es_jefe(categorias[c]) for c in codigos], dtype=bool)
+            return pd.Series(valores[posiciones], index=nombres.index)
+        return nombres.map(self.es_jefe).astype(bool)
+
+    def fila_nm(self, nombre):
+        """Primera fila del empleado en 'Niveles medios' o None."""
+        posicion = self.posicion_nm.get(nombre)
+        return None if posicion is None else self.df_niveles_medios.iloc[posicion]
+
+    def fila_j(self, nombre):
+        """Primera fila del empleado en 'Jefes' o None."""
+        posicion = self.posicion_j.get(nombre)
+        return None if posicion is None else self.df_jefes.iloc[posicion]
+
+    def equipo_directo(self, nombre_jefe):
+        """Reportes directos de ambas hojas (niveles medios primero)."""
+        partes = []
+        posiciones_nm = self.reportes_nm.get(nombre_jefe)
+        if posiciones_nm:
+            partes.append(self.df_niveles_medios.iloc[posiciones_nm])
+        posiciones_j = self.reportes_j.get(nombre_jefe)
+        if posiciones_j:
+            partes.append(self.df_jefes.iloc[posiciones_j])
+        if partes:
+            return pd.concat(partes, ignore_index=True, sort=False)
+        return pd.DataFrame()
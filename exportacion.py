@@ -0,0 +1,363 @@
+"""Exportación masiva de reportes 9-Box por gerencia, área y jefe.
+
+Genera un zip con, por cada área:
+
+- ``<gerencia>/<área>/reporte.xlsx``: una hoja con los empleados y la
+  distribución del área y una hoja por cada jefe del área con su equipo
+  directo (la misma tabla del panel de detalle), su distribución y la
+  estructura completa.
+- ``<gerencia>/<área>/area.html`` y ``<gerencia>/<área>/jefes/<jefe>.html``:
+  las mismas figuras del dashboard (matriz y distribución) en HTML estático.
+
+Más ``indice.xlsx`` con el resumen de cada área y ``plotly.min.js``, al que
+apuntan todos los HTML, para que el zip se abra sin conexión.
+
+Cada área es una unidad de trabajo independiente. Con organizaciones grandes
+se reparten entre procesos y el proceso principal escribe cada resultado en el
+zip apenas llega, con un número acotado de áreas en vuelo, así la memoria no
+crece con el tamaño de la organización.
+
+Uso::
+
+    python exportacion.py ["Tactico_9box (1).xlsx"] [--salida reportes_9box.zip]
+                          [--gerencia G] [--area A] [--procesos N]
+"""
+import argparse
+import glob
+import html
+import io
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from almacen import vistas_hojas
+from cuadrantes import box_descriptions, distribucion_cuadrantes, tabla_equipo
+from graficos import figura_distribucion_cuadrantes, figura_matriz_9box
+from ingesta import EXCEL_FILE, escribir_atomico
+from recarga import DatosTablero, RecargadorLibro
+
+DIRECTORIO_EXPORTACIONES = '.exportaciones_9box'
+# Otras sesiones pueden seguir descargando zips de versiones anteriores
+ANTIGUEDAD_EXPORTACIONES = 24 * 3600
+COLUMNAS_AREA = ['NOMBRE', 'CARGO', 'JEFE DIRECTO', 'Potencial', 'Desempeño', 'CUADRANTE',
+                 'RESULTADO INDIVIDUAL', 'PROMEDIO EQUIPO']
+# Jefes que no tienen fila propia (solo aparecen como JEFE DIRECTO)
+SIN_AREA = ('SIN GERENCIA', 'SIN ÁREA')
+# Con menos áreas que esto no compensa arrancar procesos
+MINIMO_AREAS_PARALELO = 8
+# Áreas pendientes por proceso: acota lo que espera a ser escrito en el zip
+AREAS_EN_VUELO_POR_PROCESO = 2
+PLOTLY_JS = 'plotly.min.js'
+_LARGO_HOJA = 31
+_CARACTERES_INVALIDOS_HOJA = re.compile(r'[\[\]:*?/\\]')
+_CARACTERES_INVALIDOS_RUTA = re.compile(r'[\\/:*?"<>|]+')
+
+_PLANTILLA_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="utf-8"><title>{titulo}</title><script src="{plotly_js}"></script></head>
+<body style="font-family: sans-serif; margin: 2em;">
+<h1>{titulo}</h1>
+{contenido}
+</body>
+</html>
+"""
+
+# Datos del proceso de exportación (ver _inicializar_proceso)
+_datos_proceso = None
+
+
+def _ruta_segura(texto):
+    return _CARACTERES_INVALIDOS_RUTA.sub('_', str(texto).strip()) or '_'
+
+
+def _nombre_hoja(texto, usados):
+    """Nombre de hoja válido en Excel (31 caracteres, único sin distinguir mayúsculas)."""
+    base = _CARACTERES_INVALIDOS_HOJA.sub('_', str(texto).strip())[:_LARGO_HOJA] or 'Hoja'
+    nombre, n = base, 1
+    while nombre.casefold() in usados:
+        n += 1
+        sufijo = f' ({n})'
+        nombre = base[:_LARGO_HOJA - len(sufijo)] + sufijo
+    usados.add(nombre.casefold())
+    return nombre
+
+
+def _tabla_distribucion(distribucion):
+    return pd.DataFrame({
+        'Cuadrante': distribucion.index.astype(int),
+        'Descripción': [box_descriptions[str(c)]['titulo'] for c in distribucion.index],
+        'Personas': distribucion.to_numpy(),
+    })
+
+
+def _escribir_hoja(escritor, hoja, encabezado, tabla, distribucion):
+    """Encabezado (campo, valor), la tabla y la distribución, uno debajo del otro."""
+    fila = 0
+    pd.DataFrame(list(encabezado.items()), columns=['Campo', 'Valor']).to_excel(
+        escritor, sheet_name=hoja, index=False, startrow=fila)
+    fila += len(encabezado) + 2
+    tabla.astype(object).to_excel(escritor, sheet_name=hoja, index=False, startrow=fila)
+    fila += len(tabla) + 2
+    if len(distribucion) > 0:
+        _tabla_distribucion(distribucion).to_excel(escritor, sheet_name=hoja, index=False, startrow=fila)
+
+
+def _html(titulo, encabezado, figuras, tabla, profundidad):
+    """Página estática; ``profundidad`` es la distancia a la raíz del zip (para plotly.min.js)."""
+    partes = ['<ul>'] + [f'<li><b>{html.escape(str(k))}:</b> {html.escape(str(v))}</li>'
+                         for k, v in encabezado.items()] + ['</ul>']
+    # div_id fijo: el mismo libro produce siempre el mismo zip
+    partes += [pio.to_html(figura, full_html=False, include_plotlyjs=False, div_id=f'figura-{i}')
+               for i, figura in enumerate(figuras)]
+    if tabla is not None and len(tabla) > 0:
+        partes.append(tabla.to_html(index=False, na_rep='', border=0))
+    return _PLANTILLA_HTML.format(
+        titulo=html.escape(titulo),
+        plotly_js='../' * profundidad + PLOTLY_JS,
+        contenido='\n'.join(partes),
+    )
+
+
+def _promedio(serie):
+    return round(float(serie.mean()), 2) if len(serie) else None
+
+
+def unidades(datos, gerencia=None, area=None):
+    """Lista de (gerencia, área, jefes, carpeta en el zip) a exportar.
+
+    Cada jefe con equipo directo va en el área de su propia fila; los que no
+    tienen fila quedan en ``SIN_AREA``. Áreas que solo difieren en espacios o
+    caracteres no válidos en rutas reciben carpetas distintas.
+    """
+    directorio = datos.directorio
+    jefes_por_area = {}
+    for nombre in directorio.nombres:
+        if not (directorio.reportes_nm.get(nombre) or directorio.reportes_j.get(nombre)):
+            continue
+        fila = directorio.fila_nm(nombre)
+        if fila is None:
+            fila = directorio.fila_j(nombre)
+        clave = SIN_AREA
+        if fila is not None and pd.notna(fila['GERENCIA']) and pd.notna(fila['ÁREA']):
+            clave = (fila['GERENCIA'], fila['ÁREA'])
+        jefes_por_area.setdefault(clave, []).append(nombre)
+
+    claves = [(g, a) for g in datos.cubo.gerencias for a in datos.cubo.areas(g)]
+    if SIN_AREA in jefes_por_area:
+        claves.append(SIN_AREA)
+    trabajos, carpetas = [], set()
+    for g, a in claves:
+        if (gerencia is not None and g != gerencia) or (area is not None and a != area):
+            continue
+        base = carpeta = f'{_ruta_segura(g)}/{_ruta_segura(a)}'
+        n = 1
+        while carpeta.casefold() in carpetas:
+            n += 1
+            carpeta = f'{base} ({n})'
+        carpetas.add(carpeta.casefold())
+        trabajos.append((g, a, sorted(jefes_por_area.get((g, a), [])), carpeta))
+    return trabajos
+
+
+def reporte_jefe(datos, jefe, escritor, usados, base):
+    """Escribe la hoja del jefe en ``escritor`` y devuelve su HTML (ruta, contenido)."""
+    directorio, organigrama = datos.directorio, datos.organigrama
+    equipo = directorio.equipo_directo(jefe)
+    con_evaluacion = equipo[equipo['CUADRANTE'].notna()]
+    distribucion = distribucion_cuadrantes(con_evaluacion)
+    fila = directorio.fila_nm(jefe)
+    if fila is None:
+        fila = directorio.fila_j(jefe)
+    encabezado = {
+        'Jefe': jefe,
+        'Cargo': fila['CARGO'] if fila is not None else None,
+        'Miembros del equipo directo': len(equipo),
+        'Con evaluación 9-Box': len(con_evaluacion),
+        'Promedio Potencial (equipo)': _promedio(con_evaluacion['Potencial']),
+        'Promedio Desempeño (equipo)': _promedio(con_evaluacion['Desempeño']),
+    }
+    if organigrama.contiene(jefe):
+        estructura = organigrama.resumen_subarbol(jefe)
+        encabezado['Personas a cargo (directas e indirectas)'] = estructura['total']
+        encabezado['Niveles'] = estructura['niveles']
+    tabla = tabla_equipo(equipo)
+    _escribir_hoja(escritor, _nombre_hoja(jefe, usados), encabezado, tabla, distribucion)
+
+    figuras = []
+    if len(con_evaluacion) > 0:
+        figuras.append(figura_matriz_9box(con_evaluacion))
+        figuras.append(figura_distribucion_cuadrantes(distribucion))
+    return f'{base}/jefes/{_ruta_segura(jefe)}.html', _html(jefe, encabezado, figuras, tabla, profundidad=3)
+
+
+def reporte_area(datos, gerencia, area, jefes, base):
+    """Archivos (ruta en el zip, contenido) de un área y sus jefes, bajo la carpeta ``base``."""
+    if (gerencia, area) == SIN_AREA:
+        empleados = datos.df_all.iloc[0:0]
+    else:
+        empleados = datos.cubo.filtrar(datos.df_all, gerencia, area)
+    con_evaluacion = empleados[empleados['CUADRANTE'].notna()]
+    resumen = datos.cubo.resumen(gerencia, area)
+    encabezado = {
+        'Gerencia': gerencia,
+        'Área': area,
+        'Total empleados': resumen['total'],
+        'Con evaluación 9-Box': resumen['evaluados'],
+        'Promedio Potencial': round(resumen['promedio_potencial'], 2) if resumen['evaluados'] else None,
+        'Promedio Desempeño': round(resumen['promedio_desempeño'], 2) if resumen['evaluados'] else None,
+    }
+    tabla = empleados[[c for c in COLUMNAS_AREA if c in empleados.columns]]
+
+    archivos = []
+    libro = io.BytesIO()
+    with pd.ExcelWriter(libro, engine='openpyxl') as escritor:
+        usados = set()
+        _escribir_hoja(escritor, _nombre_hoja('Área', usados), encabezado, tabla, resumen['distribucion'])
+        for jefe in jefes:
+            archivos.append(reporte_jefe(datos, jefe, escritor, usados, base))
+    archivos.append((f'{base}/reporte.xlsx', libro.getvalue()))
+
+    figuras = []
+    if len(con_evaluacion) > 0:
+        figuras.append(figura_matriz_9box(con_evaluacion))
+        figuras.append(figura_distribucion_cuadrantes(resumen['distribucion']))
+    archivos.append((f'{base}/area.html', _html(f'{gerencia} / {area}', encabezado, figuras, tabla, profundidad=2)))
+    return archivos
+
+
+def _indice(datos, trabajos):
+    filas = []
+    for gerencia, area, jefes, base in trabajos:
+        resumen = datos.cubo.resumen(gerencia, area)
+        fila = {
+            'Gerencia': gerencia,
+            'Área': area,
+            'Total empleados': resumen['total'],
+            'Con evaluación 9-Box': resumen['evaluados'],
+            'Jefes': len(jefes),
+            'Promedio Potencial': resumen['promedio_potencial'],
+            'Promedio Desempeño': resumen['promedio_desempeño'],
+            'Reporte': f'{base}/reporte.xlsx',
+        }
+        for cuadrante in range(1, 10):
+            fila[f'Cuadrante {cuadrante}'] = int(resumen['distribucion'].get(cuadrante, 0))
+        filas.append(fila)
+    libro = io.BytesIO()
+    pd.DataFrame(filas).to_excel(libro, sheet_name='Índice', index=False, engine='openpyxl')
+    return libro.getvalue()
+
+
+def _inicializar_proceso(df_all, n_niveles_medios, df_competencias_jefes, version):
+    global _datos_proceso
+    df_niveles_medios, df_jefes = vistas_hojas(df_all, n_niveles_medios)
+    _datos_proceso = DatosTablero(df_niveles_medios, df_jefes, df_competencias_jefes, version, df_all=df_all)
+
+
+def _reporte_area_proceso(gerencia, area, jefes, base):
+    return reporte_area(_datos_proceso, gerencia, area, jefes, base)
+
+
+def _generar(datos, trabajos, procesos):
+    """Archivos de cada área en el orden de ``trabajos``, con a lo sumo unas pocas áreas en vuelo."""
+    hechos = 0
+    if procesos > 1:
+        # forkserver/spawn: el servidor de Streamlit tiene hilos y no conviene hacer fork
+        metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        try:
+            with ProcessPoolExecutor(
+                max_workers=procesos,
+                mp_context=multiprocessing.get_context(metodo),
+                initializer=_inicializar_proceso,
+                initargs=(datos.df_all, len(datos.df_niveles_medios), datos.df_competencias_jefes, datos.version),
+            ) as pool:
+                pendientes = deque()
+                siguientes = iter(trabajos)
+                for trabajo in siguientes:
+                    pendientes.append(pool.submit(_reporte_area_proceso, *trabajo))
+                    if len(pendientes) >= procesos * AREAS_EN_VUELO_POR_PROCESO:
+                        break
+                while pendientes:
+                    archivos = pendientes.popleft().result()
+                    trabajo = next(siguientes, None)
+                    if trabajo is not None:
+                        pendientes.append(pool.submit(_reporte_area_proceso, *trabajo))
+                    hechos += 1
+                    yield archivos
+            return
+        except (OSError, BrokenProcessPool):
+            # Entornos sin procesos: lo que falta se genera en serie
+            pass
+    for trabajo in trabajos[hechos:]:
+        yield reporte_area(datos, *trabajo)
+
+
+def exportar(datos, destino, gerencia=None, area=None, procesos=None, progreso=None):
+    """Escribe el zip de reportes en ``destino`` (ruta o archivo binario).
+
+    ``gerencia``/``area`` restringen lo exportado. Con ``procesos=None`` se
+    usan todos los CPU si hay suficientes áreas. ``progreso(hechas, total)``
+    se llama tras escribir cada área. Devuelve el número de áreas exportadas.
+    """
+    trabajos = unidades(datos, gerencia, area)
+    if procesos is None:
+        procesos = (os.cpu_count() or 1) if len(trabajos) >= MINIMO_AREAS_PARALELO else 1
+    with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(PLOTLY_JS, get_plotlyjs())
+        zf.writestr('indice.xlsx', _indice(datos, trabajos))
+        for hechas, archivos in enumerate(_generar(datos, trabajos, min(procesos, len(trabajos) or 1)), 1):
+            for ruta, contenido in archivos:
+                zf.writestr(ruta, contenido)
+            if progreso is not None:
+                progreso(hechas, len(trabajos))
+    return len(trabajos)
+
+
+def exportar_a_archivo(datos, gerencia=None, area=None, directorio=DIRECTORIO_EXPORTACIONES, **opciones):
+    """Exporta a ``directorio`` y devuelve la ruta del zip.
+
+    El nombre incluye la versión de los datos y el alcance: si ya existe, se
+    reutiliza. Se borran los zips de otras versiones sin uso hace más de
+    ``ANTIGUEDAD_EXPORTACIONES`` segundos.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    prefijo = f'9box_{datos.version[:12]}'
+    alcance = '_'.join(_ruta_segura(p).replace(' ', '_') for p in (gerencia, area) if p is not None) or 'organizacion'
+    ruta = os.path.join(directorio, f'{prefijo}_{alcance}.zip')
+    limite = time.time() - ANTIGUEDAD_EXPORTACIONES
+    for anterior in glob.glob(os.path.join(directorio, '9box_*.zip')):
+        if os.path.basename(anterior).startswith(prefijo):
+            continue
+        try:
+            if os.path.getmtime(anterior) < limite:
+                os.remove(anterior)
+        except FileNotFoundError:
+            # Otra sesión lo borró primero
+            pass
+    if os.path.exists(ruta):
+        os.utime(ruta)
+    else:
+        escribir_atomico(ruta, lambda tmp: exportar(datos, tmp, gerencia, area, **opciones))
+    return ruta
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('excel', nargs='?', default=EXCEL_FILE)
+    parser.add_argument('--salida', default='reportes_9box.zip')
+    parser.add_argument('--gerencia')
+    parser.add_argument('--area')
+    parser.add_argument('--procesos', type=int)
+    args = parser.parse_args()
+    datos = RecargadorLibro(args.excel, vigilar=False).actual
+    n = exportar(datos, args.salida, args.gerencia, args.area, args.procesos,
+                 progreso=lambda hechas, total: print(f"\r{hechas}/{total} áreas", end='', flush=True))
+    print(f"\nReportes de {n} áreas en {args.salida}")
@@ -0,0 +1,192 @@
+"""Construcción de las figuras Plotly del dashboard."""
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from cuadrantes import CUADRANTES_TALENTO_TOP, box_descriptions, color_map
+
+# Por encima de este número de puntos la matriz se dibuja con WebGL
+UMBRAL_WEBGL = 300
+# Desplazamiento máximo (en unidades de eje) del jitter para puntos superpuestos
+AMPLITUD_JITTER = 0.38
+
+# Posición (desempeño, potencial) de la etiqueta de cada cuadrante
+cuadrante_positions = {
+    (1, 3): "6", (2, 3): "2", (3, 3): "1",
+    (1, 2): "8", (2, 2): "5", (3, 2): "3",
+    (1, 1): "9", (2, 1): "7", (3, 1): "4"
+}
+
+
+def figura_matriz_9box(empleados_con_evaluacion):
+    """Matriz 9-Box con todos los evaluados en una sola traza.
+
+    Colores, etiquetas, hover y customdata van como arrays. Con más de
+    ``UMBRAL_WEBGL`` puntos se usa ``Scattergl``, se dispersan los puntos que
+    comparten celda (jitter determinista) y cada etiqueta de cuadrante muestra
+    el total de personas en la celda.
+    """
+    nombres = empleados_con_evaluacion['NOMBRE'].to_numpy(dtype=object)
+    potencial = empleados_con_evaluacion['Potencial'].to_numpy()
+    desempeño = empleados_con_evaluacion['Desempeño'].to_numpy()
+    cuadrantes = empleados_con_evaluacion['CUADRANTE'].astype(int).to_numpy()
+    colores = [color_map[c] for c in cuadrantes]
+    customdata = np.column_stack([nombres, desempeño, potencial])
+
+    usar_webgl = len(nombres) > UMBRAL_WEBGL
+    hovertemplate = ("<b>%{customdata[0]}</b><br>"
+                     "Desempeño: %{customdata[1]}<br>"
+                     "Potencial: %{customdata[2]}<br>"
+                     "Haga clic para ver detalles<br>"
+                     "<extra></extra>")
+
+    if usar_webgl:
+        rng = np.random.default_rng(0)
+        x = desempeño + rng.uniform(-AMPLITUD_JITTER, AMPLITUD_JITTER, len(nombres))
+        y = potencial + rng.uniform(-AMPLITUD_JITTER, AMPLITUD_JITTER, len(nombres))
+        traza = go.Scattergl(
+            x=x,
+            y=y,
+            mode='markers',
+            marker=dict(size=8, color=colores, line=dict(width=1, color='white'), opacity=0.7),
+            name="Evaluados",
+            hovertemplate=hovertemplate,
+            customdata=customdata
+        )
+    else:
+        traza = go.Scatter(
+            x=desempeño,
+            y=potencial,
+            mode='markers+text',
+            text=[nombre.split()[0] for nombre in nombres],  # Solo primer nombre
+            textposition="middle center",
+            marker=dict(
+                size=25,
+                color=colores,
+                line=dict(width=2, color='white'),
+                opacity=0.8
+            ),
+            name="Evaluados",
+            hovertemplate=hovertemplate,
+            customdata=customdata
+        )
+
+    fig = go.Figure(data=[traza])
+
+    # Configurar el layout de la matriz
+    fig.update_layout(
+        title="Matriz 9-Box por Desempeño vs Potencial",
+        xaxis=dict(
+            title="Desempeño",
+            tickmode='array',
+            tickvals=[1, 2, 3],
+            ticktext=['Bajo (1)', 'Medio (2)', 'Alto (3)'],
+            range=[0.5, 3.5],
+            gridcolor='lightgray'
+        ),
+        yaxis=dict(
+            title="Potencial",
+            tickmode='array',
+            tickvals=[1, 2, 3],
+            ticktext=['Bajo (1)', 'Medio (2)', 'Alto (3)'],
+            range=[0.5, 3.5],
+            gridcolor='lightgray'
+        ),
+        showlegend=False,
+        height=500,
+        plot_bgcolor='rgba(248,249,250,1)',
+        font=dict(size=12)
+    )
+
+    # Líneas que separan cuadrantes y etiquetas de cuadrante (número y, en modo
+    # WebGL, total por celda). Se asignan en un solo update_layout: add_hline y
+    # add_annotation validan la figura completa en cada llamada.
+    linea = dict(color="gray", dash="dash", width=2)
+    lineas = []
+    for i in [1.5, 2.5]:
+        lineas.append(dict(type="line", xref="x domain", x0=0, x1=1, yref="y", y0=i, y1=i, line=linea, opacity=0.7))
+        lineas.append(dict(type="line", xref="x", x0=i, x1=i, yref="y domain", y0=0, y1=1, line=linea, opacity=0.7))
+
+    conteos = np.bincount(cuadrantes, minlength=10) if usar_webgl else None
+    etiquetas = []
+    for (x, y), label in cuadrante_positions.items():
+        texto = f"<b>{label}</b>"
+        if conteos is not None:
+            texto += f" · {conteos[int(label)]}"
+        etiquetas.append(dict(
+            x=x, y=y,
+            text=texto,
+            showarrow=False,
+            font=dict(size=16, color="gray"),
+            bgcolor="rgba(255,255,255,0.9)",
+            bordercolor="gray",
+            borderwidth=1,
+            xshift=40,
+            yshift=40
+        ))
+    fig.update_layout(shapes=lineas, annotations=etiquetas)
+
+    return fig
+
+
+def figura_distribucion_cuadrantes(cuadrante_counts):
+    """Gráfico de barras con el número de empleados por cuadrante."""
+    cuadrantes = cuadrante_counts.index.tolist()
+    counts = cuadrante_counts.tolist()
+    labels = [f"{box_descriptions[str(c)]['titulo']}" for c in cuadrantes]
+    colors = [color_map[c] for c in cuadrantes]
+
+    fig_bar = go.Figure(data=[
+        go.Bar(x=labels, y=counts, marker_color=colors, text=counts, textposition='auto')
+    ])
+
+    fig_bar.update_layout(
+        title="Distribución de Empleados por Cuadrante 9-Box",
+        xaxis_title="Cuadrante",
+        yaxis_title="Número de Empleados",
+        height=400,
+        showlegend=False
+    )
+
+    return fig_bar
+
+
+def figura_comparativo_areas(comparativo):
+    """Mapa de calor con todas las áreas lado a lado (ver servicio.obtener_comparativo_areas).
+
+    A la izquierda el % de evaluados por cuadrante y de talento top; a la
+    derecha los promedios de Potencial y Desempeño (escala 1-3).
+    """
+    tabla, porcentajes = comparativo.tabla, comparativo.porcentajes
+    filas = [f"{gerencia} · {area}" for gerencia, area in tabla.index]
+    cuadrantes = [f"C{c}" for c in porcentajes.columns] + ["Talento top"]
+    distribucion = np.column_stack([porcentajes.to_numpy(dtype=float), tabla['talento_top'].to_numpy(dtype=float) * 100])
+    personas = np.column_stack([tabla[porcentajes.columns].to_numpy(),
+                                tabla[list(CUADRANTES_TALENTO_TOP)].sum(axis=1).to_numpy()])
+    promedios = tabla[['promedio_potencial', 'promedio_desempeño']].to_numpy(dtype=float)
+    evaluados = np.repeat(tabla['evaluados'].to_numpy()[:, None], 2, axis=1)
+
+    fig = make_subplots(rows=1, cols=2, shared_yaxes=True, column_widths=[0.78, 0.22], horizontal_spacing=0.02)
+    fig.add_trace(go.Heatmap(
+        z=distribucion, x=cuadrantes, y=filas, customdata=personas,
+        colorscale="Greens", zmin=0, zmax=100,
+        text=np.where(np.isnan(distribucion), "", np.char.mod("%.0f%%", np.nan_to_num(distribucion))),
+        texttemplate="%{text}", colorbar=dict(title="% evaluados", x=0.76),
+        hovertemplate="<b>%{y}</b><br>%{x}: %{z:.1f}% (%{customdata} persona(s))<extra></extra>",
+    ), row=1, col=1)
+    fig.add_trace(go.Heatmap(
+        z=promedios, x=["Potencial", "Desempeño"], y=filas, customdata=evaluados,
+        colorscale="RdYlGn", zmin=1, zmax=3,
+        text=np.where(np.isnan(promedios), "", np.char.mod("%.2f", np.nan_to_num(promedios))),
+        texttemplate="%{text}", colorbar=dict(title="Promedio", x=1.02),
+        hovertemplate="<b>%{y}</b><br>%{x}: %{z:.2f}/3 (%{customdata} evaluado(s))<extra></extra>",
+    ), row=1, col=2)
+    fig.update_yaxes(autorange="reversed", automargin=True)
+    fig.update_xaxes(side="top")
+    fig.update_layout(
+        title="Comparativo 9-Box entre Áreas",
+        height=max(400, 160 + 32 * len(filas)),
+        plot_bgcolor='rgba(248,249,250,1)',
+        font=dict(size=12),
+    )
+    return fig
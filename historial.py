@@ -0,0 +1,280 @@
+"""Historial de evaluaciones 9-Box por periodo.
+
+El libro solo trae el ciclo vigente. ``registrar_periodo`` agrega una versión
+del libro como un periodo nuevo del historial: una partición columnar
+(``periodo=<periodo>/empleados.arrow``, Feather sin comprimir y mapeable en
+memoria) con una fila por empleado, y la tabla de transiciones de cuadrante
+frente al periodo anterior ya agregada por (GERENCIA, ÁREA, origen, destino).
+Los periodos se registran en orden y las particiones no se reescriben
+nunca: el historial solo crece.
+
+La clave entre periodos es la Cédula: una corrección de grafía, un cambio
+de nombre o dos homónimos no parten ni mezclan trayectorias. Quien no tiene
+Cédula en un periodo queda fuera de él (la falta se ve en el reporte de
+calidad, ver validacion.py). El nombre solo se muestra y sirve para buscar.
+
+``HistorialEvaluaciones`` responde matrices de transición entre periodos
+consecutivos sumando las precalculadas, y entre periodos lejanos cruzando
+solo las dos particiones; la trayectoria de una persona se lee de un índice
+por Cédula construido una vez. Las consultas no recorren todo el historial.
+
+Uso::
+
+    python historial.py registrar 2025 ["Tactico_9box (1).xlsx"]
+    python historial.py transiciones [--desde 2024] [--hasta 2025] [--gerencia G] [--area A]
+    python historial.py trayectoria 1053787788   # o "APELLIDO NOMBRE"
+"""
+import argparse
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, timezone
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from agregados import SIN_EVALUACION
+from ingesta import EXCEL_FILE, escribir_json, guardar_tabla, leer_tabla
+from nombres import normalizar_nombre
+from recarga import RecargadorLibro
+
+DIRECTORIO_HISTORIAL = '.historial_9box'
+VERSION_FORMATO = 2
+COLUMNAS_PERIODO = [
+    'Cédula', 'NOMBRE', 'CARGO', 'GERENCIA', 'ÁREA', 'JEFE DIRECTO',
+    'Potencial', 'Desempeño', 'CUADRANTE', 'RESULTADO INDIVIDUAL', 'PROMEDIO COMPETENCIAS',
+]
+# Cuadrantes de la matriz de transición (0 = sin evaluación)
+CUADRANTES = list(range(SIN_EVALUACION, 10))
+
+_PERIODO_VALIDO = re.compile(r'^[\w.-]+$')
+_NUMEROS = re.compile(r'(\d+)')
+
+
+def _orden_periodo(periodo):
+    """Clave de orden de un periodo: los números se comparan como números (2025-S2 < 2025-S10)."""
+    return [(0, int(parte)) if parte.isdigit() else (1, parte.lower()) for parte in _NUMEROS.split(periodo)]
+
+
+def _ruta_manifiesto(directorio):
+    return os.path.join(directorio, 'historial.json')
+
+
+def leer_manifiesto(directorio=DIRECTORIO_HISTORIAL):
+    """Manifiesto del historial, o None si no hay periodos registrados."""
+    try:
+        with open(_ruta_manifiesto(directorio), encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifiesto.get('formato') != VERSION_FORMATO:
+        return None
+    return manifiesto
+
+
+def huella_historial(directorio=DIRECTORIO_HISTORIAL):
+    """mtime del manifiesto (cambia con cada periodo registrado), o None."""
+    try:
+        return os.stat(_ruta_manifiesto(directorio)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def empleados_periodo(datos):
+    """Una fila por Cédula (la primera, como en df_all) con las columnas del historial."""
+    df_all = datos.df_all
+    # Columnas y tipos garantizados por la validación de la ingesta
+    unicos = df_all[df_all['Cédula'].notna() & ~df_all['Cédula'].duplicated()]
+    periodo = unicos[COLUMNAS_PERIODO[:-1]].reset_index(drop=True)
+    promedios = {nombre: perfil['promedio'] for nombre, perfil in datos.competencias.perfiles.items()}
+    periodo['PROMEDIO COMPETENCIAS'] = periodo['NOMBRE'].astype(object).map(promedios).astype(float)
+    return periodo
+
+
+def transiciones(anterior, actual):
+    """Personas por (GERENCIA, ÁREA, ORIGEN, DESTINO) entre dos periodos.
+
+    Se cruzan por Cédula; gerencia y área son las del periodo ``actual``. Quien no
+    estaba en ambos periodos no cuenta como transición.
+    """
+    cruce = actual[['Cédula', 'GERENCIA', 'ÁREA', 'CUADRANTE']].merge(
+        anterior[['Cédula', 'CUADRANTE']], on='Cédula', suffixes=('', '_ANTERIOR'))
+    cruce['ORIGEN'] = cruce['CUADRANTE_ANTERIOR'].fillna(SIN_EVALUACION).astype('int8')
+    cruce['DESTINO'] = cruce['CUADRANTE'].fillna(SIN_EVALUACION).astype('int8')
+    return (cruce.groupby(['GERENCIA', 'ÁREA', 'ORIGEN', 'DESTINO'], observed=True, sort=True)
+            .size().rename('PERSONAS').reset_index())
+
+
+def _matriz(celdas):
+    """Tabla ORIGEN x DESTINO (0-9) a partir de filas con PERSONAS."""
+    matriz = celdas.pivot_table(index='ORIGEN', columns='DESTINO', values='PERSONAS',
+                                aggfunc='sum', fill_value=0, observed=True)
+    return matriz.reindex(index=CUADRANTES, columns=CUADRANTES, fill_value=0).astype('int64')
+
+
+def registrar_periodo(datos, periodo, directorio=DIRECTORIO_HISTORIAL):
+    """Agrega ``datos`` como el periodo más reciente del historial.
+
+    Registrar otra vez la misma versión del libro con el mismo periodo no hace
+    nada; un periodo existente con otro contenido es un error (solo se agrega),
+    igual que uno que no ordena después del último (ver ``_orden_periodo``).
+    Devuelve la entrada del manifiesto del periodo.
+    """
+    periodo = str(periodo)
+    if not _PERIODO_VALIDO.match(periodo):
+        raise ValueError(f"Periodo inválido: '{periodo}' (use letras, números, '.', '-' o '_')")
+    manifiesto = leer_manifiesto(directorio) or {'formato': VERSION_FORMATO, 'periodos': []}
+    for entrada in manifiesto['periodos']:
+        if entrada['periodo'] == periodo:
+            if entrada['version'] == datos.version:
+                return entrada
+            raise ValueError(f"El periodo '{periodo}' ya está registrado con otra versión del libro")
+    if manifiesto['periodos']:
+        ultimo = manifiesto['periodos'][-1]['periodo']
+        if _orden_periodo(periodo) <= _orden_periodo(ultimo):
+            raise ValueError(f"El periodo '{periodo}' no es posterior al último registrado ('{ultimo}')")
+
+    carpeta = f'periodo={periodo}'
+    os.makedirs(os.path.join(directorio, carpeta), exist_ok=True)
+    empleados = empleados_periodo(datos)
+    entrada = {
+        'periodo': periodo,
+        'version': datos.version,
+        'registrado': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'empleados': len(empleados),
+        'archivos': {
+            'empleados': os.path.join(carpeta, guardar_tabla(empleados, os.path.join(directorio, carpeta), 'empleados')),
+        },
+    }
+    if manifiesto['periodos']:
+        previa = manifiesto['periodos'][-1]
+        anterior = leer_tabla(directorio, previa['archivos']['empleados'])
+        entrada['anterior'] = previa['periodo']
+        entrada['altas'] = int((~empleados['Cédula'].isin(anterior['Cédula'])).sum())
+        entrada['bajas'] = int((~anterior['Cédula'].isin(empleados['Cédula'])).sum())
+        entrada['archivos']['transiciones'] = os.path.join(carpeta, guardar_tabla(
+            transiciones(anterior, empleados), os.path.join(directorio, carpeta), 'transiciones'))
+    # El periodo existe para los lectores solo cuando el manifiesto lo nombra
+    manifiesto['periodos'].append(entrada)
+    escribir_json(_ruta_manifiesto(directorio), manifiesto)
+    return entrada
+
+
+class HistorialEvaluaciones:
+    """Consultas sobre los periodos registrados (una instancia por versión del manifiesto)."""
+
+    def __init__(self, directorio=DIRECTORIO_HISTORIAL):
+        self.directorio = directorio
+        manifiesto = leer_manifiesto(directorio) or {'periodos': []}
+        self._entradas = {entrada['periodo']: entrada for entrada in manifiesto['periodos']}
+        # En orden de registro, que es el cronológico
+        self.periodos = [entrada['periodo'] for entrada in manifiesto['periodos']]
+
+    def __len__(self):
+        return len(self.periodos)
+
+    def empleados(self, periodo):
+        """Partición de un periodo (mapeada en memoria)."""
+        return leer_tabla(self.directorio, self._entradas[periodo]['archivos']['empleados'])
+
+    @cached_property
+    def _transiciones(self):
+        """Transiciones precalculadas de todos los periodos, con PERIODO de destino."""
+        tablas = [
+            leer_tabla(self.directorio, entrada['archivos']['transiciones']).assign(PERIODO=periodo)
+            for periodo, entrada in self._entradas.items() if 'transiciones' in entrada['archivos']
+        ]
+        if not tablas:
+            return pd.DataFrame(columns=['GERENCIA', 'ÁREA', 'ORIGEN', 'DESTINO', 'PERSONAS', 'PERIODO'])
+        return pd.concat(tablas, ignore_index=True)
+
+    @cached_property
+    def _trayectorias(self):
+        """Filas de todos los periodos indexadas por Cédula en formato CSR.
+
+        Devuelve (filas, Cédula -> código, orden por código, desplazamientos,
+        nombre normalizado -> códigos con ese nombre en algún periodo).
+        """
+        tablas = [self.empleados(periodo).assign(PERIODO=periodo) for periodo in self.periodos]
+        filas = pd.concat(tablas, ignore_index=True) if tablas else pd.DataFrame(columns=COLUMNAS_PERIODO + ['PERIODO'])
+        cedulas = pd.Categorical(filas['Cédula'])
+        # Orden estable: dentro de cada Cédula las filas quedan en orden de periodo
+        orden = np.argsort(cedulas.codes, kind='stable')
+        desplazamientos = np.searchsorted(cedulas.codes[orden], np.arange(len(cedulas.categories) + 1))
+        codigos = {int(cedula): codigo for codigo, cedula in enumerate(cedulas.categories)}
+        alias = (pd.Series(cedulas.codes).groupby(filas['NOMBRE'].astype(object).map(normalizar_nombre).to_numpy())
+                 .unique().to_dict())
+        return filas, codigos, orden, desplazamientos, alias
+
+    def matriz_transicion(self, desde=None, hasta=None, gerencia=None, area=None):
+        """Personas por cuadrante de origen (filas) y destino (columnas), 0 = sin evaluación.
+
+        Por defecto compara los dos últimos periodos. Gerencia y área filtran
+        por la ubicación en ``hasta``.
+        """
+        if len(self.periodos) < 2:
+            raise ValueError("Se necesitan al menos dos periodos registrados")
+        desde = desde if desde is not None else self.periodos[-2]
+        hasta = hasta if hasta is not None else self.periodos[-1]
+        for periodo in (desde, hasta):
+            if periodo not in self._entradas:
+                raise KeyError(f"Periodo no registrado: '{periodo}'")
+        if self.periodos.index(desde) + 1 == self.periodos.index(hasta):
+            celdas = self._transiciones[self._transiciones['PERIODO'] == hasta]
+        else:
+            celdas = transiciones(self.empleados(desde), self.empleados(hasta))
+        if gerencia is not None:
+            celdas = celdas[celdas['GERENCIA'] == gerencia]
+        if area is not None:
+            celdas = celdas[celdas['ÁREA'] == area]
+        return _matriz(celdas)
+
+    def trayectoria(self, persona):
+        """Filas de la persona en cada periodo en que aparece, en orden cronológico.
+
+        ``persona`` es la Cédula o un nombre con el que aparece en algún
+        periodo; un nombre de varias cédulas (homónimos) es un error.
+        """
+        filas, codigos, orden, desplazamientos, alias = self._trayectorias
+        try:
+            codigo = codigos.get(int(persona))
+        except (TypeError, ValueError):
+            candidatos = alias.get(normalizar_nombre(persona), [])
+            if len(candidatos) > 1:
+                raise ValueError(f"'{persona}' corresponde a varias cédulas; use la Cédula") from None
+            codigo = candidatos[0] if len(candidatos) else None
+        if codigo is None:
+            return filas.iloc[0:0]
+        return filas.iloc[orden[desplazamientos[codigo]:desplazamientos[codigo + 1]]]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--directorio', default=DIRECTORIO_HISTORIAL)
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    registrar = subcomandos.add_parser('registrar', help='agrega el libro como un periodo nuevo')
+    registrar.add_argument('periodo')
+    registrar.add_argument('excel', nargs='?', default=EXCEL_FILE)
+    consulta = subcomandos.add_parser('transiciones', help='matriz de transición entre dos periodos')
+    consulta.add_argument('--desde')
+    consulta.add_argument('--hasta')
+    consulta.add_argument('--gerencia')
+    consulta.add_argument('--area')
+    persona = subcomandos.add_parser('trayectoria', help='cuadrante de una persona en cada periodo')
+    persona.add_argument('nombre')
+    args = parser.parse_args()
+
+    if args.comando == 'registrar':
+        # Snapshot propio: el de DIRECTORIO_SNAPSHOT es el que sirven el
+        # dashboard y el publicador, y un libro de otro periodo lo reemplazaría
+        with tempfile.TemporaryDirectory(prefix='snapshot_historial_') as snapshot:
+            datos = RecargadorLibro(args.excel, directorio=snapshot, vigilar=False).actual
+            entrada = registrar_periodo(datos, args.periodo, args.directorio)
+        print(json.dumps(entrada, ensure_ascii=False, indent=2))
+    elif args.comando == 'transiciones':
+        historial = HistorialEvaluaciones(args.directorio)
+        print(historial.matriz_transicion(args.desde, args.hasta, args.gerencia, args.area).to_string())
+    else:
+        print(HistorialEvaluaciones(args.directorio).trayectoria(args.nombre).to_string(index=False))
@@ -0,0 +1,528 @@
+"""Ingesta del libro 9-Box a un snapshot columnar.
+
+El Excel se parsea una sola vez y se guarda como archivos Arrow/Feather sin
+comprimir en ``.snapshot_9box/``. Los workers de Streamlit leen el snapshot con
+memory-map y solo se vuelve a parsear el xlsx cuando su contenido cambia; en
+ese caso se re-parsean únicamente las hojas cuyo XML cambió.
+
+Los archivos de cada hoja llevan el hash del xlsx que los originó y nunca se
+sobrescriben: una reconstrucción escribe archivos nuevos, activa el
+manifiesto con un solo reemplazo y después borra los que ya no referencia
+ni el manifiesto nuevo ni el anterior. Un worker que leyó el manifiesto
+previo sigue encontrando sus archivos.
+
+El parseo recorre el XML de cada hoja en streaming (sin estilos ni modelo de
+celdas de openpyxl), lee solo las columnas que usa el dashboard y convierte los
+tipos al vuelo. En libros grandes las hojas se parsean en procesos paralelos.
+
+Uso desde la línea de comandos (pre-construir el snapshot antes de desplegar)::
+
+    python ingesta.py ["Tactico_9box (1).xlsx"]
+"""
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from openpyxl import load_workbook
+
+EXCEL_FILE = 'Tactico_9box (1).xlsx'
+DIRECTORIO_SNAPSHOT = '.snapshot_9box'
+VERSION_FORMATO = 5
+
+# Nombre lógico -> nombre de la hoja en el libro
+HOJAS = {
+    'niveles_medios': 'Niveles medios',
+    'jefes': 'Jefes',
+    'competencias_jefes': 'Competencias Jefes 2025',
+}
+
+# Columnas que usa el dashboard en cada hoja (se comparan sin espacios a los
+# lados); las demás no se leen. Las ausentes en una hoja simplemente se omiten.
+_COLUMNAS_EMPLEADOS = (
+    'Cédula', 'NOMBRE', 'CARGO', 'JEFE DIRECTO', 'GERENCIA', 'ÁREA', 'Potencial', 'Desempeño',
+    'RESULTADO INDIVIDUAL', 'PROMEDIO EQUIPO',
+)
+COLUMNAS_PROYECTADAS = {
+    'niveles_medios': _COLUMNAS_EMPLEADOS,
+    'jefes': _COLUMNAS_EMPLEADOS,
+    'competencias_jefes': ('Nombre del participante', 'Competencia', '%', 'IMPACTO ESPERADO'),
+}
+
+# Tipo aplicado al leer cada columna; si un valor no cabe (p. ej. un puntaje
+# con decimales) la columna queda con el tipo que infiera pandas
+TIPOS_COLUMNAS = {
+    'Cédula': 'Int64',
+    'Potencial': 'Int8',
+    'Desempeño': 'Int8',
+    'GERENCIA': 'category',
+    'ÁREA': 'category',
+    'CARGO': 'category',
+}
+
+# Textos que se leen como vacío (los mismos que reconoce pd.read_excel)
+VALORES_NULOS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
+
+# A partir de este tamaño de archivo las hojas se parsean en paralelo; por
+# debajo, arrancar los procesos cuesta más que parsear
+UMBRAL_PARALELO_BYTES = 4 << 20
+
+
+def huella_archivo(ruta):
+    """Devuelve (mtime_ns, tamaño) del archivo: la verificación barata."""
+    st_archivo = os.stat(ruta)
+    return st_archivo.st_mtime_ns, st_archivo.st_size
+
+
+def hash_archivo(ruta, bloque=1 << 20):
+    """SHA-256 del contenido del archivo, leído por bloques."""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for trozo in iter(lambda: f.read(bloque), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+_NS_LIBRO = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_RELACIONES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_FILA, _CELDA, _VALOR = f'{_NS_LIBRO}row', f'{_NS_LIBRO}c', f'{_NS_LIBRO}v'
+_SI, _TEXTO, _RUN, _INLINE = f'{_NS_LIBRO}si', f'{_NS_LIBRO}t', f'{_NS_LIBRO}r', f'{_NS_LIBRO}is'
+# Partes del xlsx compartidas por todas las hojas: si cambian, cambian todas
+_PARTES_COMPARTIDAS = ('xl/sharedStrings.xml', 'xl/styles.xml')
+
+
+def _rutas_hojas(libro):
+    """{nombre de hoja: ruta de su XML dentro del zip}."""
+    relaciones = ET.fromstring(libro.read('xl/_rels/workbook.xml.rels'))
+    destinos = {r.get('Id'): r.get('Target') for r in relaciones}
+    hojas_xml = {}
+    for hoja in ET.fromstring(libro.read('xl/workbook.xml')).iter(f'{_NS_LIBRO}sheet'):
+        destino = destinos[hoja.get(f'{_NS_RELACIONES}id')].lstrip('/')
+        hojas_xml[hoja.get('name')] = destino if destino.startswith('xl/') else f'xl/{destino}'
+    return hojas_xml
+
+
+def huellas_hojas(ruta):
+    """Huella por hoja a partir de los CRC del zip, sin descomprimir datos.
+
+    Devuelve {nombre lógico: crc del XML de la hoja, '_compartido': crc de
+    sharedStrings/styles}, o None si el archivo no es un xlsx legible.
+    """
+    try:
+        with zipfile.ZipFile(ruta) as libro:
+            hojas_xml = _rutas_hojas(libro)
+            crc = {info.filename: info.CRC for info in libro.infolist()}
+            huellas = {
+                '_compartido': '-'.join(str(crc.get(parte, 0)) for parte in _PARTES_COMPARTIDAS)
+            }
+            for nombre, hoja in HOJAS.items():
+                huellas[nombre] = crc[hojas_xml[hoja]]
+            return huellas
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return None
+
+
+def hojas_modificadas(huellas_previas, huellas):
+    """Nombres lógicos de las hojas cuyo contenido pudo cambiar."""
+    if not huellas_previas or not huellas or huellas_previas.get('_compartido') != huellas['_compartido']:
+        return list(HOJAS)
+    return [nombre for nombre in HOJAS if huellas_previas.get(nombre) != huellas[nombre]]
+
+
+def _ruta_manifiesto(directorio):
+    return os.path.join(directorio, 'manifiesto.json')
+
+
+def _leer_manifiesto(directorio):
+    try:
+        with open(_ruta_manifiesto(directorio), encoding='utf-8') as f:
+            manifiesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifiesto.get('formato') != VERSION_FORMATO:
+        return None
+    return manifiesto
+
+
+def escribir_atomico(ruta, escribir):
+    """Escribe en un temporal del mismo directorio y lo renombra sobre ``ruta``.
+
+    Así un worker nunca lee un archivo a medio escribir.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(ruta), prefix='.tmp_')
+    os.close(fd)
+    try:
+        escribir(tmp)
+        os.replace(tmp, ruta)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def guardar_tabla(df, directorio, nombre):
+    """Guarda una tabla como Feather sin comprimir (mapeable en memoria).
+
+    Si la hoja tiene columnas con tipos mezclados que Arrow no acepta, se
+    recurre a pickle para no perder el snapshot completo.
+    """
+    try:
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        archivo = f'{nombre}.pkl'
+        escribir_atomico(
+            os.path.join(directorio, archivo),
+            lambda tmp: df.to_pickle(tmp, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        return archivo
+    for posicion, tipo in enumerate(df.dtypes):
+        if isinstance(tipo, np.dtype) and tipo.kind == 'f':
+            # NaN como valor y no como vacío de Arrow: la columna se lee sin copiar
+            tabla = tabla.set_column(posicion, tabla.field(posicion).with_nullable(True),
+                                     pa.array(df.iloc[:, posicion].to_numpy(), from_pandas=False))
+    archivo = f'{nombre}.arrow'
+    # Un solo bloque por columna: con varios, leerla obliga a concatenarlos (copia)
+    escribir_atomico(
+        os.path.join(directorio, archivo),
+        lambda tmp: feather.write_feather(tabla, tmp, compression='uncompressed',
+                                          chunksize=max(tabla.num_rows, 1)),
+    )
+    return archivo
+
+
+def _enteros_mapeados(tabla, df):
+    """``df`` con las columnas Int8/Int64 como arrays sobre el buffer mapeado de ``tabla``.
+
+    ``to_pandas`` copia los enteros con vacíos para armar la máscara; así solo
+    la máscara (un byte por fila) queda en la memoria propia del proceso.
+    """
+    arrays = {}
+    for posicion, campo in enumerate(tabla.schema):
+        arrays[posicion] = df.iloc[:, posicion].array
+        tipo = df.dtypes.iloc[posicion]
+        if not (isinstance(tipo, pd.api.extensions.ExtensionDtype) and tipo.kind in 'iu'):
+            continue
+        columna = tabla.column(posicion)
+        if (columna.num_chunks != 1 or not pa.types.is_integer(campo.type)
+                or campo.type.bit_width != tipo.numpy_dtype.itemsize * 8 or len(columna) == 0):
+            continue
+        arreglo = columna.chunk(0)
+        valores = np.frombuffer(arreglo.buffers()[1], dtype=tipo.numpy_dtype, count=len(arreglo),
+                                offset=arreglo.offset * tipo.numpy_dtype.itemsize)
+        arrays[posicion] = pd.arrays.IntegerArray(valores, arreglo.is_null().to_numpy(zero_copy_only=False))
+    # Asignar columna por columna copiaría; un DataFrame nuevo con copy=False no
+    mapeado = pd.DataFrame(arrays, copy=False)
+    mapeado.columns = df.columns
+    return mapeado
+
+
+def leer_tabla(directorio, archivo, columnas=None):
+    ruta = os.path.join(directorio, archivo)
+    if archivo.endswith('.pkl'):
+        return pd.read_pickle(ruta)
+    tabla = feather.read_table(ruta, memory_map=True)
+    # split_blocks: unir columnas del mismo tipo en un bloque 2D las copiaría
+    df = _enteros_mapeados(tabla, tabla.to_pandas(split_blocks=True))
+    # Arrow solo admite nombres de columna str; se restauran los originales
+    # (p. ej. las columnas de años 2024/2025 son enteros en el Excel)
+    if columnas is not None:
+        df.columns = columnas
+    return df
+
+
+def _columna(valores, encabezado):
+    tipo = TIPOS_COLUMNAS.get(encabezado.strip())
+    if tipo == 'category':
+        return pd.Categorical(valores)
+    if tipo is not None:
+        try:
+            return pd.array(valores, dtype=tipo)
+        except (TypeError, ValueError):
+            pass
+    serie = pd.Series(valores)
+    if serie.isna().all():
+        # Columna vacía: flotante con NaN, como la dejaría pd.read_excel
+        return serie.astype('float64').to_numpy()
+    return serie.to_numpy()
+
+
+def _texto(elemento):
+    """Texto de un <si>/<is>: <t> directo o la suma de los <r><t> (sin fonética)."""
+    partes = []
+    for hijo in elemento:
+        if hijo.tag == _TEXTO:
+            partes.append(hijo.text or '')
+        elif hijo.tag == _RUN:
+            t = hijo.find(_TEXTO)
+            if t is not None:
+                partes.append(t.text or '')
+    return ''.join(partes)
+
+
+def _cadenas_compartidas(libro):
+    try:
+        archivo = libro.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    cadenas = []
+    with archivo:
+        for _, elemento in ET.iterparse(archivo):
+            if elemento.tag == _SI:
+                cadenas.append(_texto(elemento))
+                elemento.clear()
+    return cadenas
+
+
+@lru_cache(maxsize=None)
+def _indice_columna(letras):
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + ord(letra) - 64
+    return indice - 1
+
+
+def _valor_celda(celda, cadenas):
+    tipo = celda.get('t', 'n')
+    if tipo == 'inlineStr':
+        contenido = celda.find(_INLINE)
+        return _texto(contenido) if contenido is not None else None
+    valor = celda.find(_VALOR)
+    if valor is None or valor.text is None:
+        return None
+    texto = valor.text
+    if tipo == 's':
+        return cadenas[int(texto)]
+    if tipo == 'n':
+        # Misma regla que openpyxl: entero salvo que tenga punto o exponente
+        return float(texto) if '.' in texto or 'E' in texto or 'e' in texto else int(texto)
+    if tipo == 'b':
+        return texto == '1'
+    # 'str' (resultado de fórmula), 'e' (error) y 'd' (fecha ISO) quedan como texto
+    return texto
+
+
+def _filas_xml(libro, ruta_hoja, cadenas, columnas=None):
+    """Genera cada fila como {índice de columna: valor}, solo con ``columnas``.
+
+    No se interpretan formatos de número, así que una fecha guardada como
+    número llega como número (ninguna columna proyectada es fecha).
+    """
+    with libro.open(ruta_hoja) as archivo:
+        for _, elemento in ET.iterparse(archivo):
+            if elemento.tag != _FILA:
+                continue
+            fila = {}
+            posicion = -1
+            for celda in elemento.iter(_CELDA):
+                referencia = celda.get('r')
+                posicion = _indice_columna(referencia.rstrip('0123456789')) if referencia else posicion + 1
+                if columnas is None or posicion in columnas:
+                    fila[posicion] = _valor_celda(celda, cadenas)
+            elemento.clear()
+            yield fila
+
+
+def _filas_openpyxl(excel_file, hoja_nombre):
+    """Alternativa con openpyxl en modo read-only para libros no estándar."""
+    libro = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        hoja = libro[hoja_nombre]
+        # El tamaño declarado en el XML puede estar desactualizado
+        hoja.reset_dimensions()
+        for fila in hoja.iter_rows(values_only=True):
+            yield dict(enumerate(fila))
+    finally:
+        libro.close()
+
+
+def _proyectar(filas, nombre):
+    """Arma el DataFrame de la hoja a partir de su primera fila (encabezado)."""
+    encabezado = next(filas, {})
+    proyectadas = set(COLUMNAS_PROYECTADAS[nombre])
+    indices = sorted(i for i, h in encabezado.items() if h is not None and str(h).strip() in proyectadas)
+    columnas = [encabezado[i] for i in indices]
+    valores = [[] for _ in indices]
+    for fila in filas:
+        if all(v is None for v in fila.values()):
+            continue
+        for destino, i in zip(valores, indices):
+            valor = fila.get(i)
+            if isinstance(valor, str) and valor in VALORES_NULOS:
+                valor = None
+            destino.append(valor)
+    return pd.DataFrame({c: _columna(v, str(c)) for c, v in zip(columnas, valores)}, columns=columnas)
+
+
+def parsear_hoja(excel_file, nombre):
+    """Lee una hoja en streaming, solo con sus columnas proyectadas.
+
+    Las filas completamente vacías se descartan. Los nombres de columna se
+    conservan tal como están en el libro (incluidos espacios sobrantes).
+    """
+    try:
+        with zipfile.ZipFile(excel_file) as libro:
+            ruta_hoja = _rutas_hojas(libro)[HOJAS[nombre]]
+            cadenas = _cadenas_compartidas(libro)
+            # Primera pasada corta para el encabezado; la segunda extrae solo
+            # las celdas de las columnas proyectadas
+            primera = _filas_xml(libro, ruta_hoja, cadenas)
+            encabezado = next(primera, {})
+            primera.close()
+            proyectadas = set(COLUMNAS_PROYECTADAS[nombre])
+            columnas = {i for i, h in encabezado.items() if h is not None and str(h).strip() in proyectadas}
+            return _proyectar(_filas_xml(libro, ruta_hoja, cadenas, columnas), nombre)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return _proyectar(_filas_openpyxl(excel_file, HOJAS[nombre]), nombre)
+
+
+def parsear_hojas(excel_file, nombres, paralelo=None):
+    """Parsea las hojas indicadas: {nombre lógico: DataFrame}.
+
+    Con ``paralelo=None`` se usan procesos solo si el libro es grande, hay
+    más de una hoja y más de un CPU.
+    """
+    nombres = list(nombres)
+    if paralelo is None:
+        paralelo = (len(nombres) > 1 and (os.cpu_count() or 1) > 1
+                    and os.path.getsize(excel_file) >= UMBRAL_PARALELO_BYTES)
+    if paralelo:
+        try:
+            with ProcessPoolExecutor(max_workers=len(nombres)) as procesos:
+                resultados = procesos.map(parsear_hoja, [excel_file] * len(nombres), nombres)
+                return dict(zip(nombres, resultados))
+        except (OSError, BrokenProcessPool):
+            # Entornos sin fork/semáforos: se parsea en serie
+            pass
+    return {nombre: parsear_hoja(excel_file, nombre) for nombre in nombres}
+
+
+def construir_snapshot(excel_file=EXCEL_FILE, directorio=DIRECTORIO_SNAPSHOT, sha256=None, anterior=None):
+    """Parsea el libro y escribe el snapshot y su manifiesto.
+
+    Con un manifiesto ``anterior`` solo se parsean las hojas modificadas; las
+    demás conservan sus archivos del snapshot previo.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    mtime_ns, tamaño = huella_archivo(excel_file)
+    if sha256 is None:
+        sha256 = hash_archivo(excel_file)
+    huellas = huellas_hojas(excel_file)
+
+    if anterior is not None:
+        modificadas = hojas_modificadas(anterior.get('huellas'), huellas)
+        archivos = dict(anterior['archivos'])
+        columnas = dict(anterior['columnas'])
+    else:
+        modificadas = list(HOJAS)
+        archivos, columnas = {}, {}
+
+    if modificadas:
+        hojas = parsear_hojas(excel_file, modificadas)
+        for nombre in modificadas:
+            df = hojas[nombre]
+            archivos[nombre] = guardar_tabla(df, directorio, f'{sha256[:16]}_{nombre}')
+            columnas[nombre] = df.columns.tolist()
+
+    manifiesto = {
+        'formato': VERSION_FORMATO,
+        'origen': os.path.abspath(excel_file),
+        'mtime_ns': mtime_ns,
+        'tamaño': tamaño,
+        'sha256': sha256,
+        'archivos': archivos,
+        'columnas': columnas,
+        'huellas': huellas,
+        'modificadas': modificadas,
+    }
+    escribir_json(_ruta_manifiesto(directorio), manifiesto)
+    _limpiar(directorio, manifiesto, anterior)
+    return manifiesto
+
+
+def _limpiar(directorio, manifiesto, anterior):
+    """Borra las tablas que no referencia el manifiesto vigente ni el anterior."""
+    vigentes = set(manifiesto['archivos'].values())
+    if anterior is not None:
+        vigentes.update(anterior['archivos'].values())
+    for archivo in os.listdir(directorio):
+        if archivo.endswith(('.arrow', '.pkl')) and archivo not in vigentes:
+            # En Linux un archivo borrado sigue mapeado por quien ya lo abrió
+            os.remove(os.path.join(directorio, archivo))
+
+
+def _volcar_json(datos, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+
+def escribir_json(ruta, datos):
+    """Escribe ``datos`` como JSON de forma atómica."""
+    escribir_atomico(ruta, lambda tmp: _volcar_json(datos, tmp))
+
+
+def snapshot_vigente(excel_file=EXCEL_FILE, directorio=DIRECTORIO_SNAPSHOT):
+    """Devuelve el manifiesto del snapshot vigente, reconstruyéndolo si hace falta.
+
+    Si mtime y tamaño coinciden no se lee el xlsx. Si cambiaron pero el hash
+    es el mismo (p. ej. el archivo se copió de nuevo) solo se actualiza el
+    manifiesto. Únicamente un cambio real de contenido vuelve a parsear, y
+    solo las hojas que cambiaron.
+    """
+    manifiesto = _leer_manifiesto(directorio)
+    mtime_ns, tamaño = huella_archivo(excel_file)
+
+    if manifiesto and (manifiesto['mtime_ns'], manifiesto['tamaño']) == (mtime_ns, tamaño):
+        return manifiesto
+
+    sha256 = hash_archivo(excel_file)
+    if manifiesto and manifiesto['sha256'] == sha256:
+        manifiesto.update(mtime_ns=mtime_ns, tamaño=tamaño)
+        escribir_json(_ruta_manifiesto(directorio), manifiesto)
+        return manifiesto
+
+    return construir_snapshot(excel_file, directorio, sha256=sha256, anterior=manifiesto)
+
+
+def cargar_hojas(manifiesto, nombres, directorio=DIRECTORIO_SNAPSHOT):
+    """Lee del snapshot solo las hojas indicadas: {nombre lógico: DataFrame}."""
+    columnas = manifiesto.get('columnas', {})
+    return {
+        nombre: leer_tabla(directorio, manifiesto['archivos'][nombre], columnas.get(nombre))
+        for nombre in nombres
+    }
+
+
+def cargar_libro(excel_file=EXCEL_FILE, directorio=DIRECTORIO_SNAPSHOT):
+    """Carga las tres hojas del libro desde el snapshot columnar.
+
+    Devuelve (df_niveles_medios, df_jefes, df_competencias_jefes, version),
+    donde ``version`` es el SHA-256 del xlsx que originó el snapshot.
+    """
+    manifiesto = snapshot_vigente(excel_file, directorio)
+    hojas = cargar_hojas(manifiesto, HOJAS, directorio)
+    return (
+        hojas['niveles_medios'],
+        hojas['jefes'],
+        hojas['competencias_jefes'],
+        manifiesto['sha256'],
+    )
+
+
+if __name__ == '__main__':
+    origen = sys.argv[1] if len(sys.argv) > 1 else EXCEL_FILE
+    resultado = construir_snapshot(origen)
+    print(f"Snapshot generado en {DIRECTORIO_SNAPSHOT}/ (sha256 {resultado['sha256'][:12]})")
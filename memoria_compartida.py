@@ -0,0 +1,179 @@
+"""Publicación de las tablas de empleados en memoria compartida.
+
+Con varios procesos de Streamlit detrás de un balanceador, cada uno parseaba
+el libro y armaba sus propias tablas. En este modo un único proceso
+publicador hace la ingesta y la recarga (ver recarga.py) y escribe la tabla
+compacta de empleados, las competencias y los tokens de caché como archivos
+Arrow IPC en un tmpfs (``/dev/shm`` por defecto). Los dashboards los abren con
+memory-map: las páginas viven una sola vez en la memoria del sistema sin
+importar cuántos workers haya, y el arranque de un worker ya no parsea nada.
+
+Las columnas se leen sin copiar (ver ``ingesta.leer_tabla``): numéricas,
+enteros con vacíos y códigos de categorías sin vacíos apuntan a las páginas
+mapeadas. Cada worker sí copia en su memoria la máscara de vacíos de los
+enteros (un byte por fila), los códigos de las categorías con vacíos (JEFE
+DIRECTO, un byte por fila), los diccionarios de categorías y sus índices
+(directorio, organigrama, cubo), que son lineales y rápidos de construir.
+
+Uso::
+
+    # proceso publicador (uno por máquina)
+    python memoria_compartida.py ["Tactico_9box (1).xlsx"] [--directorio /dev/shm/tablero_9box]
+
+    # cada dashboard
+    TABLERO_9BOX_MEMORIA_COMPARTIDA=/dev/shm/tablero_9box streamlit run dashboard_v11_final_corregido_fixed.py
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from almacen import vistas_hojas
+from ingesta import EXCEL_FILE, escribir_json, guardar_tabla, leer_tabla
+from nombres import COLUMNAS_REPORTE
+from recarga import INTERVALO_REVISION, DatosTablero, RecargadorLibro
+from validacion import COLUMNAS_CALIDAD
+
+# Directorio compartido; vacío desactiva el modo
+DIRECTORIO_COMPARTIDO = os.environ.get('TABLERO_9BOX_MEMORIA_COMPARTIDA', '')
+DIRECTORIO_POR_DEFECTO = '/dev/shm/tablero_9box'
+# Versiones publicadas que se conservan: un worker que está mapeando la
+# anterior puede terminar su rerun aunque ya exista una nueva
+VERSIONES_CONSERVADAS = 2
+
+_PUBLICADO = 'publicado.json'
+
+logger = logging.getLogger(__name__)
+
+
+def _ruta_publicado(directorio):
+    return os.path.join(directorio, _PUBLICADO)
+
+
+def publicar(datos, directorio):
+    """Escribe una versión de ``datos`` y la activa reemplazando el manifiesto."""
+    os.makedirs(directorio, exist_ok=True)
+    prefijo = f"v{time.time_ns()}"
+    manifiesto = {
+        'version': datos.version,
+        'version_base': datos.version_base,
+        'n_niveles_medios': len(datos.df_niveles_medios),
+        'archivos': {
+            'empleados': guardar_tabla(datos.df_all, directorio, f'{prefijo}_empleados'),
+            'competencias_jefes': guardar_tabla(datos.df_competencias_jefes, directorio, f'{prefijo}_competencias'),
+        },
+        'columnas': {
+            'empleados': datos.df_all.columns.tolist(),
+            'competencias_jefes': datos.df_competencias_jefes.columns.tolist(),
+        },
+        'versiones_area': [[g, a, v] for (g, a), v in datos.versiones_area.items()],
+        'versiones_empleado': datos.versiones_empleado,
+        'referencias': datos.referencias.astype(object).where(datos.referencias.notna(), None).to_dict('records'),
+        'calidad': datos.calidad.astype(object).where(datos.calidad.notna(), None).to_dict('records'),
+    }
+    escribir_json(_ruta_publicado(directorio), manifiesto)
+    _limpiar(directorio)
+    return manifiesto
+
+
+def _limpiar(directorio):
+    prefijos = sorted({os.path.basename(r).split('_', 1)[0] for r in glob.glob(os.path.join(directorio, 'v*_*'))})
+    for prefijo in prefijos[:-VERSIONES_CONSERVADAS]:
+        for ruta in glob.glob(os.path.join(directorio, f'{prefijo}_*')):
+            # En Linux un archivo borrado sigue mapeado por quien ya lo abrió
+            os.remove(ruta)
+
+
+def leer_publicado(directorio):
+    """Manifiesto de la versión publicada, o None si aún no hay ninguna."""
+    try:
+        with open(_ruta_publicado(directorio), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def mapear(directorio, manifiesto):
+    """Abre la versión publicada (memory-map) como un ``DatosTablero``."""
+    archivos, columnas = manifiesto['archivos'], manifiesto['columnas']
+    df_all = leer_tabla(directorio, archivos['empleados'], columnas['empleados'])
+    df_competencias_jefes = leer_tabla(directorio, archivos['competencias_jefes'], columnas['competencias_jefes'])
+    df_niveles_medios, df_jefes = vistas_hojas(df_all, manifiesto['n_niveles_medios'])
+    return DatosTablero(
+        df_niveles_medios, df_jefes, df_competencias_jefes, manifiesto['version'],
+        df_all=df_all,
+        versiones_area={(g, a): v for g, a, v in manifiesto['versiones_area']},
+        versiones_empleado=manifiesto['versiones_empleado'],
+        version_base=manifiesto['version_base'],
+        referencias=pd.DataFrame(manifiesto.get('referencias', []), columns=COLUMNAS_REPORTE),
+        calidad=pd.DataFrame(manifiesto.get('calidad', []), columns=COLUMNAS_CALIDAD),
+    )
+
+
+class LectorCompartido:
+    """Lado del dashboard: misma interfaz que ``RecargadorLibro`` (``actual``).
+
+    Revisa el manifiesto publicado cada ``intervalo`` segundos y, si cambió
+    de versión, mapea la nueva y la publica con una sola asignación.
+    """
+
+    def __init__(self, directorio, intervalo=INTERVALO_REVISION, vigilar=True):
+        self.directorio = directorio
+        self._lock = threading.Lock()
+        self._manifiesto = leer_publicado(directorio)
+        if self._manifiesto is None:
+            raise FileNotFoundError(f"No hay tablas publicadas en {directorio}")
+        self.actual = mapear(directorio, self._manifiesto)
+
+        if vigilar:
+            hilo = threading.Thread(target=self._vigilar, args=(intervalo,), daemon=True,
+                                    name='lector-compartido-9box')
+            hilo.start()
+
+    def _vigilar(self, intervalo):
+        while True:
+            time.sleep(intervalo)
+            try:
+                self.revisar()
+            except Exception:
+                logger.exception("No se pudo mapear la versión publicada en %s", self.directorio)
+
+    def revisar(self):
+        """Mapea la versión publicada si cambió. Devuelve True si hubo cambio."""
+        with self._lock:
+            manifiesto = leer_publicado(self.directorio)
+            if manifiesto is None or manifiesto['archivos'] == self._manifiesto['archivos']:
+                return False
+            self.actual = mapear(self.directorio, manifiesto)
+            self._manifiesto = manifiesto
+            return True
+
+
+def publicador(excel_file=EXCEL_FILE, directorio=DIRECTORIO_POR_DEFECTO, intervalo=INTERVALO_REVISION):
+    """Bucle del proceso publicador: publica al iniciar y en cada recarga."""
+    recargador = RecargadorLibro(excel_file, vigilar=False)
+    publicar(recargador.actual, directorio)
+    logger.info("Tablas publicadas en %s", directorio)
+    while True:
+        time.sleep(intervalo)
+        try:
+            if recargador.revisar():
+                publicar(recargador.actual, directorio)
+                logger.info("Nueva versión publicada en %s", directorio)
+        except Exception:
+            logger.exception("No se pudo recargar %s", excel_file)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('excel', nargs='?', default=EXCEL_FILE)
+    parser.add_argument('--directorio', default=DIRECTORIO_COMPARTIDO or DIRECTORIO_POR_DEFECTO)
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_REVISION)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    publicador(args.excel, args.directorio, args.intervalo)
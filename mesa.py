@@ -0,0 +1,130 @@
+"""Mesa Gerencial precalculada en la carga.
+
+Los integrantes de la Mesa Gerencial son los botones de acceso rápido del
+sidebar y, por estar en la cima del organigrama, las vistas más pesadas del
+panel de detalle: su estructura es casi toda la empresa. ``MesaGerencial`` se
+construye una vez por versión de los datos (ver recarga.py) con la lista de
+integrantes ya lista para los botones, un consolidado de la organización bajo
+cada uno y las consultas del panel de detalle ya resueltas, así abrirlos solo
+lee diccionarios.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+import servicio
+
+AREA_MESA_GERENCIAL = 'MESA GERENCIAL'
+# Filtros de la tabla del equipo con que se abre el panel (página 1, sin filtrar)
+_FILTROS_INICIALES = ((), None, None, False, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class IntegranteMesa:
+    nombre: str
+    cargo: str
+    # Texto del botón (dos primeras palabras del nombre) y cargo abreviado
+    etiqueta: str
+    ayuda: str
+
+
+@dataclass(frozen=True, slots=True)
+class ResumenCompetencias:
+    """Competencias 2025 de los jefes de una estructura."""
+    participantes: int
+    # Promedio de los promedios individuales (escala 0-100)
+    promedio: float | None
+    # (competencia, promedio %, participantes), de mayor a menor promedio
+    por_competencia: list
+
+
+@dataclass(frozen=True, slots=True)
+class ConsolidadoMesa:
+    """Organización completa bajo un integrante de la Mesa Gerencial."""
+    estructura: servicio.Estructura | None
+    competencias: ResumenCompetencias
+
+
+def _integrante(nombre, cargo):
+    cargo = cargo if isinstance(cargo, str) else ''
+    return IntegranteMesa(
+        nombre=nombre,
+        cargo=cargo,
+        etiqueta=' '.join(nombre.split()[:2]),
+        ayuda=cargo.replace('GERENTE', 'GTE').replace('SUBGERENTE', 'SUBGTE'),
+    )
+
+
+def _resumen_competencias(indice, nombres):
+    """Agrega los perfiles de competencias de ``nombres`` (sin repetir)."""
+    promedios = []
+    por_competencia = {}
+    for nombre in nombres:
+        perfil = indice.perfil(nombre)
+        if perfil is None:
+            continue
+        if perfil['promedio'] is not None:
+            promedios.append(perfil['promedio'])
+        for competencia, porcentaje, _ in perfil['competencias']:
+            if not np.isnan(porcentaje):
+                por_competencia.setdefault(competencia, []).append(porcentaje)
+    return ResumenCompetencias(
+        participantes=len(promedios),
+        promedio=float(np.mean(promedios)) if promedios else None,
+        por_competencia=sorted(
+            ((competencia, float(np.mean(valores)), len(valores)) for competencia, valores in por_competencia.items()),
+            key=lambda fila: -fila[1],
+        ),
+    )
+
+
+class MesaGerencial:
+    """Integrantes, consolidados y vistas del panel de detalle de la Mesa Gerencial.
+
+    ``vistas`` usa las mismas claves que ``precarga.CacheDetalle`` sin el token
+    de versión: (consulta, nombre, *argumentos) -> resultado.
+    """
+
+    def __init__(self, datos):
+        df_all = datos.df_all
+        mesa = df_all.loc[df_all['ÁREA'] == AREA_MESA_GERENCIAL, ['NOMBRE', 'CARGO']]
+        mesa = mesa.dropna(subset=['NOMBRE']).drop_duplicates(subset=['NOMBRE'])
+        self.integrantes = [_integrante(nombre, cargo) for nombre, cargo in
+                            zip(mesa['NOMBRE'].astype(object), mesa['CARGO'].astype(object))]
+        self.nombres = [integrante.nombre for integrante in self.integrantes]
+
+        organigrama = datos.organigrama
+        self.consolidados = {}
+        self.vistas = {}
+        for nombre in self.nombres:
+            estructura = None
+            subordinados = []
+            if organigrama.contiene(nombre):
+                estructura = servicio.Estructura(**organigrama.resumen_subarbol(nombre))
+                subordinados = [organigrama.nombres[i] for i in organigrama.ids_subarbol(nombre)]
+            self.consolidados[nombre] = ConsolidadoMesa(
+                estructura, _resumen_competencias(datos.competencias, subordinados))
+            self._resolver_vistas(datos, nombre)
+
+    def _resolver_vistas(self, datos, nombre):
+        vistas = self.vistas
+        vistas[('perfil', nombre)] = servicio.obtener_perfil_empleado(datos, nombre)
+        if not datos.directorio.es_jefe(nombre):
+            return
+        vistas[('competencias', nombre)] = servicio.obtener_competencias(datos, nombre)
+        vistas[('equipo', nombre)] = servicio.obtener_equipo(datos, nombre)
+        vistas[('pagina_equipo', nombre)] = servicio.obtener_pagina_equipo(datos, nombre)
+        for alcance in ('directos', 'estructura'):
+            vistas[('filtros_equipo', nombre, alcance)] = servicio.obtener_filtros_equipo(datos, nombre, alcance)
+            vistas[('pagina_equipo', nombre, alcance, *_FILTROS_INICIALES)] = servicio.obtener_pagina_equipo(
+                datos, nombre, alcance, *_FILTROS_INICIALES)
+
+    def consolidado(self, nombre):
+        """Consolidado del integrante, o None si ``nombre`` no es de la Mesa Gerencial."""
+        return self.consolidados.get(nombre)
+
+    def __contains__(self, nombre):
+        return nombre in self.consolidados
+
+    def __len__(self):
+        return len(self.integrantes)
@@ -0,0 +1,188 @@
+"""Resolución de nombres de persona entre las hojas del libro.
+
+El libro se edita a mano: el mismo nombre aparece con espacios de más, sin
+tildes o con otras mayúsculas en NOMBRE, JEFE DIRECTO y 'Nombre del
+participante', y con igualdad exacta esos reportes y competencias se perdían
+sin aviso. ``ResolutorNombres`` se construye una vez en la carga con los
+NOMBRE de ambas hojas; cada referencia se resuelve por igualdad exacta, luego
+por clave normalizada (casefold, sin tildes, espacios colapsados) y por último
+con un índice de trigramas para errores de tipeo. Las referencias se
+reescriben a la grafía canónica, así NOMBRE y JEFE DIRECTO comparten los
+mismos códigos en el diccionario del almacén (ver almacen.py) y los cruces
+comparan ids enteros. Lo que no se puede resolver queda en un reporte.
+"""
+import unicodedata
+from functools import cached_property
+
+import pandas as pd
+
+from competencias import COLUMNA_PARTICIPANTE
+
+# Columnas que referencian a un empleado por nombre, por hoja
+REFERENCIAS = {
+    'niveles_medios': ('JEFE DIRECTO',),
+    'jefes': ('JEFE DIRECTO',),
+    'competencias_jefes': (COLUMNA_PARTICIPANTE,),
+}
+# Similitud de Jaccard mínima entre trigramas para aceptar un nombre aproximado
+UMBRAL_SIMILITUD = 0.7
+# Ventaja mínima del mejor candidato sobre el segundo; si no, es ambiguo
+MARGEN_AMBIGUEDAD = 0.05
+# Similitud mínima para sugerir un nombre en el reporte de no resueltos
+UMBRAL_SUGERENCIA = 0.4
+COLUMNAS_REPORTE = ['Hoja', 'Columna', 'Valor', 'Filas', 'Resolución', 'Nombre canónico', 'Sugerencia']
+
+
+def normalizar_nombre(texto):
+    """Clave de comparación: casefold, sin tildes y con espacios colapsados."""
+    texto = str(texto)
+    if not texto.isascii():
+        descompuesto = unicodedata.normalize('NFKD', texto)
+        texto = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(texto.split()).casefold()
+
+
+def trigramas(clave):
+    """Trigramas de una clave normalizada, con bordes marcados por espacios."""
+    relleno = f'  {clave} '
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class ResolutorNombres:
+    """Nombres canónicos con ids enteros y búsqueda exacta, normalizada y aproximada.
+
+    - ``nombres``: grafías canónicas; el id de cada una es su posición.
+    - ``ids``: grafía canónica -> id.
+    - ``claves``: clave normalizada -> id (la primera grafía vista gana).
+    """
+
+    def __init__(self, nombres):
+        self.nombres = []
+        self.ids = {}
+        self.claves = {}
+        for nombre in nombres:
+            if pd.isna(nombre) or nombre in self.ids:
+                continue
+            clave = normalizar_nombre(nombre)
+            if clave in self.claves:
+                # Otra grafía de un nombre ya registrado: se resuelve a ese
+                continue
+            self.claves[clave] = self.ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+
+    @cached_property
+    def _trigramas(self):
+        """(trigrama -> ids, trigramas por id); se construye con la primera búsqueda aproximada."""
+        indice = {}
+        tamaños = [0] * len(self.nombres)
+        for clave, id_nombre in self.claves.items():
+            propios = trigramas(clave)
+            tamaños[id_nombre] = len(propios)
+            for trigrama in propios:
+                indice.setdefault(trigrama, []).append(id_nombre)
+        return indice, tamaños
+
+    def candidatos(self, texto, limite=5):
+        """Hasta ``limite`` pares (nombre canónico, similitud) ordenados por similitud."""
+        indice, tamaños = self._trigramas
+        buscados = trigramas(normalizar_nombre(texto))
+        comunes = {}
+        for trigrama in buscados:
+            for id_nombre in indice.get(trigrama, ()):
+                comunes[id_nombre] = comunes.get(id_nombre, 0) + 1
+        puntajes = [(n_comunes / (len(buscados) + tamaños[id_nombre] - n_comunes), id_nombre)
+                    for id_nombre, n_comunes in comunes.items()]
+        puntajes.sort(key=lambda p: (-p[0], p[1]))
+        return [(self.nombres[id_nombre], similitud) for similitud, id_nombre in puntajes[:limite]]
+
+    def resolver(self, texto):
+        """(id, método) de ``texto``; método es 'exacto', 'normalizado',
+        'aproximado', 'ambiguo' o 'sin_coincidencia' (estos dos con id None)."""
+        id_nombre = self.ids.get(texto)
+        if id_nombre is not None:
+            return id_nombre, 'exacto'
+        id_nombre = self.claves.get(normalizar_nombre(texto))
+        if id_nombre is not None:
+            return id_nombre, 'normalizado'
+        mejores = self.candidatos(texto, limite=2)
+        if not mejores or mejores[0][1] < UMBRAL_SIMILITUD:
+            return None, 'sin_coincidencia'
+        if len(mejores) > 1 and mejores[0][1] - mejores[1][1] < MARGEN_AMBIGUEDAD:
+            return None, 'ambiguo'
+        return self.ids[mejores[0][0]], 'aproximado'
+
+    def canonico(self, texto, aproximado=True):
+        """Grafía canónica de ``texto`` o None si no se resuelve.
+
+        Con ``aproximado=False`` solo valen las coincidencias exactas o
+        normalizadas: los trigramas corrigen el libro en la carga, pero un
+        nombre parcial de afuera no debe responder por otra persona.
+        """
+        id_nombre, metodo = self.resolver(texto)
+        if id_nombre is None or (not aproximado and metodo == 'aproximado'):
+            return None
+        return self.nombres[id_nombre]
+
+    def sugerencia(self, texto):
+        """Nombre más parecido a ``texto`` si supera ``UMBRAL_SUGERENCIA``, o None."""
+        mejores = self.candidatos(texto, limite=1)
+        return mejores[0][0] if mejores and mejores[0][1] >= UMBRAL_SUGERENCIA else None
+
+    def canonicalizar(self, serie):
+        """Serie con las grafías canónicas; lo no resuelto queda como estaba.
+
+        Devuelve (serie, resoluciones) con ``resoluciones``: valor -> (id, método)
+        para cada valor distinto que no era exacto. Se resuelve una vez por valor.
+        """
+        resoluciones = {}
+        for valor in serie.dropna().unique():
+            if valor not in self.ids:
+                resoluciones[valor] = self.resolver(valor)
+        reemplazos = {v: self.nombres[i] for v, (i, _) in resoluciones.items() if i is not None}
+        if reemplazos:
+            serie = serie.astype(object).replace(reemplazos)
+        return serie, resoluciones
+
+
+def nombres_canonicos(*dfs):
+    """Valores de NOMBRE en el orden de las hojas (la primera grafía gana)."""
+    for df in dfs:
+        if 'NOMBRE' in df.columns:
+            yield from df['NOMBRE'].tolist()
+
+
+def resolver_hojas(hojas, resolutor):
+    """Reescribe en el lugar NOMBRE y las columnas de ``REFERENCIAS`` de ``hojas``.
+
+    Devuelve el reporte (DataFrame) de las grafías corregidas o no resueltas.
+    """
+    filas = []
+    for hoja, df in hojas.items():
+        columnas = REFERENCIAS.get(hoja, ())
+        if hoja in ('niveles_medios', 'jefes'):
+            columnas = ('NOMBRE', *columnas)
+        for columna in columnas:
+            if columna not in df.columns:
+                continue
+            canonica, resoluciones = resolutor.canonicalizar(df[columna])
+            if not resoluciones:
+                continue
+            cuentas = df[columna].value_counts()
+            for valor, (id_nombre, metodo) in resoluciones.items():
+                sugerencia = resolutor.sugerencia(valor) if id_nombre is None else None
+                filas.append({
+                    'Hoja': hoja,
+                    'Columna': columna,
+                    'Valor': valor,
+                    'Filas': int(cuentas.get(valor, 0)),
+                    'Resolución': metodo,
+                    'Nombre canónico': resolutor.nombres[id_nombre] if id_nombre is not None else None,
+                    'Sugerencia': sugerencia,
+                })
+            df[columna] = canonica
+    return pd.DataFrame(filas, columns=COLUMNAS_REPORTE)
+
+
+def sin_resolver(reporte):
+    """Filas del reporte cuyas referencias no se pudieron resolver."""
+    return reporte[reporte['Nombre canónico'].isna()]
@@ -0,0 +1,186 @@
+"""Árbol organizacional construido a partir de las columnas JEFE DIRECTO.
+
+El árbol se recorre una sola vez en preorden (recorrido de Euler): el
+subárbol de cada jefe ocupa el intervalo ``[entrada, salida)`` del orden, de
+modo que "todos los que están bajo este gerente" es un slice y los agregados
+9-Box del subárbol salen de sumas prefijas en O(1).
+
+La hoja se edita a mano, así que se detectan ciclos (A reporta a B y B a A,
+o alguien que es su propio jefe); cada ciclo se rompe cortando la arista que
+lo cierra y queda registrado en ``ciclos``.
+"""
+import numpy as np
+import pandas as pd
+
+# Columnas de la matriz de atributos acumulada
+_COL_EVALUADO = 9
+_COL_POTENCIAL = 10
+_COL_DESEMPEÑO = 11
+
+
+class ArbolOrganizacional:
+    """Jerarquía completa con intervalos de Euler y agregados por subárbol.
+
+    ``df_empleados`` debe traer NOMBRE, JEFE DIRECTO, Potencial, Desempeño
+    y CUADRANTE (columnas garantizadas por validacion.py). Cuando un nombre aparece en varias
+    filas se usa la primera (niveles medios antes que jefes).
+    """
+
+    def __init__(self, df_empleados):
+        filas = df_empleados.dropna(subset=['NOMBRE']).drop_duplicates(subset=['NOMBRE'])
+        nombres = filas['NOMBRE'].tolist()
+        jefes = filas['JEFE DIRECTO'].tolist()
+
+        # Los jefes que no tienen fila propia también son nodos del árbol
+        self.ids = {nombre: i for i, nombre in enumerate(nombres)}
+        for jefe in jefes:
+            if pd.notna(jefe) and jefe not in self.ids:
+                self.ids[jefe] = len(self.ids)
+                nombres.append(jefe)
+        self.nombres = nombres
+        n = len(nombres)
+
+        # Filas alineadas con los ids (NaN para jefes sin fila)
+        self.filas = filas.reset_index(drop=True).reindex(range(n))
+
+        padre = np.full(n, -1, dtype=np.int64)
+        for i, jefe in enumerate(jefes):
+            if pd.notna(jefe):
+                padre[i] = self.ids[jefe]
+        self.ciclos = self._romper_ciclos(padre)
+        self.padre = padre
+
+        self.hijos = [[] for _ in range(n)]
+        for i in range(n):
+            if padre[i] >= 0:
+                self.hijos[padre[i]].append(i)
+
+        self._recorrido_euler()
+        self._acumular_atributos()
+
+    def _romper_ciclos(self, padre):
+        """Detecta ciclos subiendo por los jefes y corta la arista que los cierra."""
+        estado = np.zeros(len(padre), dtype=np.int8)  # 0 nuevo, 1 en camino, 2 listo
+        ciclos = []
+        for inicio in range(len(padre)):
+            camino = []
+            nodo = inicio
+            while nodo != -1 and estado[nodo] == 0:
+                estado[nodo] = 1
+                camino.append(nodo)
+                nodo = padre[nodo]
+            if nodo != -1 and estado[nodo] == 1:
+                ciclo = camino[camino.index(nodo):]
+                ciclos.append([self.nombres[i] for i in ciclo])
+                padre[ciclo[-1]] = -1
+            for visitado in camino:
+                estado[visitado] = 2
+        return ciclos
+
+    def _recorrido_euler(self):
+        n = len(self.nombres)
+        orden = []
+        profundidad = np.zeros(n, dtype=np.int32)
+        raices = [i for i in range(n) if self.padre[i] < 0]
+        pila = list(reversed(raices))
+        while pila:
+            nodo = pila.pop()
+            orden.append(nodo)
+            for hijo in self.hijos[nodo]:
+                profundidad[hijo] = profundidad[nodo] + 1
+            pila.extend(reversed(self.hijos[nodo]))
+
+        self.orden = np.asarray(orden, dtype=np.int64)
+        self.entrada = np.empty(n, dtype=np.int64)
+        self.entrada[self.orden] = np.arange(n)
+
+        # Tamaño y altura de cada subárbol, de las hojas hacia la raíz
+        tamaño = np.ones(n, dtype=np.int64)
+        altura = np.zeros(n, dtype=np.int32)
+        for nodo in reversed(orden):
+            jefe = self.padre[nodo]
+            if jefe >= 0:
+                tamaño[jefe] += tamaño[nodo]
+                altura[jefe] = max(altura[jefe], altura[nodo] + 1)
+        self.salida = self.entrada + tamaño
+        self.profundidad = profundidad
+        self.altura = altura
+        self.raices = raices
+
+    def _acumular_atributos(self):
+        """Sumas prefijas (en orden de Euler) de cuadrantes, evaluados y puntajes."""
+        n = len(self.nombres)
+        atributos = np.zeros((n, 12), dtype=np.float64)
+        cuadrante = self.filas['CUADRANTE']
+        evaluado = cuadrante.notna().to_numpy()
+        indices = np.flatnonzero(evaluado)
+        atributos[indices, cuadrante[evaluado].astype(int).to_numpy() - 1] = 1
+        atributos[:, _COL_EVALUADO] = evaluado
+        atributos[indices, _COL_POTENCIAL] = self.filas['Potencial'].to_numpy(dtype=float)[indices]
+        atributos[indices, _COL_DESEMPEÑO] = self.filas['Desempeño'].to_numpy(dtype=float)[indices]
+        self._prefijos = np.vstack([np.zeros((1, 12)), np.cumsum(atributos[self.orden], axis=0)])
+
+    # --- Consultas ---
+    def contiene(self, nombre):
+        return nombre in self.ids
+
+    def profundidad_de(self, nombre):
+        return int(self.profundidad[self.ids[nombre]])
+
+    def span_de_control(self, nombre):
+        """Número de reportes directos."""
+        return len(self.hijos[self.ids[nombre]])
+
+    def tamaño_subarbol(self, nombre):
+        """Número de personas bajo el jefe (sin contarlo a él)."""
+        i = self.ids[nombre]
+        return int(self.salida[i] - self.entrada[i] - 1)
+
+    def niveles_debajo(self, nombre):
+        """Profundidad máxima del subárbol relativa al jefe."""
+        return int(self.altura[self.ids[nombre]])
+
+    def es_subordinado(self, nombre, jefe):
+        """True si ``nombre`` está en el subárbol de ``jefe`` (directo o indirecto)."""
+        i, j = self.ids.get(nombre), self.ids.get(jefe)
+        if i is None or j is None or i == j:
+            return False
+        return bool(self.entrada[j] < self.entrada[i] < self.salida[j])
+
+    def ancestros(self, nombre):
+        """Cadena de jefes de ``nombre`` (del jefe directo hacia la raíz)."""
+        cadena = []
+        i = self.padre[self.ids[nombre]] if nombre in self.ids else -1
+        while i >= 0:
+            cadena.append(self.nombres[i])
+            i = self.padre[i]
+        return cadena
+
+    def ids_subarbol(self, nombre):
+        """Ids de todos los subordinados (directos e indirectos) en preorden."""
+        i = self.ids[nombre]
+        return self.orden[self.entrada[i] + 1:self.salida[i]]
+
+    def subordinados(self, nombre):
+        """Filas de todos los subordinados, en preorden."""
+        return self.filas.iloc[self.ids_subarbol(nombre)]
+
+    def resumen_subarbol(self, nombre):
+        """Agregados 9-Box del subárbol del jefe (sin incluirlo), en O(1).
+
+        Devuelve un dict con total, evaluados, distribución por cuadrante
+        (Serie indexada 1..9, solo cuadrantes con personas) y promedios.
+        """
+        i = self.ids[nombre]
+        suma = self._prefijos[self.salida[i]] - self._prefijos[self.entrada[i] + 1]
+        evaluados = int(suma[_COL_EVALUADO])
+        distribucion = pd.Series(suma[:9].astype(int), index=range(1, 10))
+        return {
+            'total': int(self.salida[i] - self.entrada[i] - 1),
+            'evaluados': evaluados,
+            'distribucion': distribucion[distribucion > 0],
+            'promedio_potencial': float(suma[_COL_POTENCIAL] / evaluados) if evaluados else None,
+            'promedio_desempeño': float(suma[_COL_DESEMPEÑO] / evaluados) if evaluados else None,
+            'directos': len(self.hijos[i]),
+            'niveles': self.niveles_debajo(nombre),
+        }
@@ -0,0 +1,232 @@
+"""Medición opcional de tiempos por sección del dashboard.
+
+Se activa con ``?perfil=1`` en la URL o con la variable de entorno
+``TABLERO_9BOX_PERFIL=1``. Apagado, cada sección es un contexto vacío y no se
+mide nada. Encendido, al final de cada rerun se muestra una tabla plegable con
+los tiempos (y un gráfico tipo flame) y se agrega una línea al log JSONL, que
+``python perfilado.py`` resume en p50/p95 por sección.
+"""
+import dataclasses
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from functools import cached_property
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+VARIABLE_ENTORNO = 'TABLERO_9BOX_PERFIL'
+PARAMETRO_URL = 'perfil'
+LOG_TIEMPOS = os.environ.get('TABLERO_9BOX_LOG_PERFIL', os.path.join('.perfil_9box', 'tiempos.jsonl'))
+
+_VALORES_ACTIVO = {'1', 'true', 'si', 'sí', 'on'}
+
+
+def perfilado_solicitado():
+    """True si la URL o el entorno piden medir tiempos."""
+    if os.environ.get(VARIABLE_ENTORNO, '').strip().lower() in _VALORES_ACTIVO:
+        return True
+    return st.query_params.get(PARAMETRO_URL, '').strip().lower() in _VALORES_ACTIVO
+
+
+def tamaño_carga(objeto):
+    """Tamaño aproximado en bytes de lo que se envía al navegador."""
+    if objeto is None:
+        return 0
+    if hasattr(objeto, 'to_json') and hasattr(objeto, 'data'):
+        # Figura Plotly: es lo que viaja serializado al frontend
+        return len(objeto.to_json().encode('utf-8'))
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True).sum())
+    if isinstance(objeto, pd.Series):
+        return int(objeto.memory_usage(deep=True))
+    if dataclasses.is_dataclass(objeto):
+        # Resultados de servicio.py: suma de sus campos
+        return sum(tamaño_carga(getattr(objeto, campo.name)) for campo in dataclasses.fields(objeto))
+    try:
+        return len(json.dumps(objeto, default=str, ensure_ascii=False).encode('utf-8'))
+    except (TypeError, ValueError):
+        return sys.getsizeof(objeto)
+
+
+class Seccion:
+    """Una sección medida; ``registrar`` anota filas procesadas y carga útil.
+
+    La carga solo se guarda: su tamaño (p. ej. serializar una figura) se
+    calcula al armar la tabla, fuera del tiempo de esta sección y de las que
+    la contienen.
+    """
+
+    def __init__(self, perfilador, nombre):
+        self._perfilador = perfilador
+        self.nombre = nombre
+        self.nivel = 0
+        self.inicio = None
+        self.duracion = None
+        self.filas = None
+        self._cargas = []
+
+    def registrar(self, filas=None, carga=None):
+        if filas is not None:
+            self.filas = int(filas)
+        if carga is not None:
+            self._cargas.append(carga)
+            self.__dict__.pop('bytes', None)
+
+    @cached_property
+    def bytes(self):
+        if not self._cargas:
+            return None
+        return sum(tamaño_carga(carga) for carga in self._cargas)
+
+    def __enter__(self):
+        self.nivel = len(self._perfilador._pila)
+        self._perfilador._pila.append(self)
+        self._perfilador.secciones.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duracion = time.perf_counter() - self.inicio
+        self._perfilador._pila.pop()
+        return False
+
+
+class _SeccionInactiva:
+    """Sustituto sin costo cuando el perfilado está apagado."""
+
+    def registrar(self, filas=None, carga=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SECCION_INACTIVA = _SeccionInactiva()
+
+
+class PerfiladorSecciones:
+    """Acumula los tiempos de las secciones de un rerun."""
+
+    def __init__(self, activo, log=LOG_TIEMPOS):
+        self.activo = activo
+        self.log = log
+        self.secciones = []
+        self._pila = []
+        self._inicio = time.perf_counter()
+        # Fin del rerun medido: lo que cuesta armar el resumen no cuenta
+        self._fin = None
+
+    def _total(self):
+        return (self._fin or time.perf_counter()) - self._inicio
+
+    def seccion(self, nombre):
+        """Contexto que mide ``nombre``; las secciones pueden anidarse."""
+        if not self.activo:
+            return _SECCION_INACTIVA
+        return Seccion(self, nombre)
+
+    def tabla(self):
+        """DataFrame con una fila por sección, en orden de ejecución."""
+        filas = []
+        total = self._total()
+        for s in self.secciones:
+            if s.duracion is None:
+                continue
+            filas.append({
+                'Sección': '  ' * s.nivel + ('↳ ' if s.nivel else '') + s.nombre,
+                'Inicio (ms)': round((s.inicio - self._inicio) * 1000, 1),
+                'Duración (ms)': round(s.duracion * 1000, 1),
+                '% del rerun': round(100 * s.duracion / total, 1) if total else 0.0,
+                'Filas': s.filas,
+                'Bytes': s.bytes,
+            })
+        return pd.DataFrame(filas)
+
+    def figura_flame(self):
+        """Barras horizontales inicio-fin por sección (una fila por nivel)."""
+        medidas = [s for s in self.secciones if s.duracion is not None]
+        fig = go.Figure(go.Bar(
+            x=[s.duracion * 1000 for s in medidas],
+            base=[(s.inicio - self._inicio) * 1000 for s in medidas],
+            y=[f"nivel {s.nivel}" for s in medidas],
+            orientation='h',
+            text=[s.nombre for s in medidas],
+            textposition='inside',
+            insidetextanchor='middle',
+            hovertemplate="%{text}: %{x:.1f} ms<extra></extra>",
+        ))
+        fig.update_layout(
+            height=120 + 40 * (max((s.nivel for s in medidas), default=0) + 1),
+            xaxis_title="ms desde el inicio del rerun",
+            yaxis=dict(autorange='reversed'),
+            showlegend=False,
+            margin=dict(l=10, r=10, t=10, b=40),
+        )
+        return fig
+
+    def escribir_log(self, **contexto):
+        """Agrega el rerun al log JSONL (una línea por rerun)."""
+        registro = {
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'total_ms': round(self._total() * 1000, 2),
+            **contexto,
+            'secciones': [
+                {'nombre': s.nombre, 'nivel': s.nivel, 'ms': round(s.duracion * 1000, 3),
+                 'filas': s.filas, 'bytes': s.bytes}
+                for s in self.secciones if s.duracion is not None
+            ],
+        }
+        directorio = os.path.dirname(self.log)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        # Una sola escritura por línea: las sesiones concurrentes no se intercalan
+        with open(self.log, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False, default=str) + '\n')
+
+    def mostrar(self, **contexto):
+        """Muestra el resumen plegable y registra el rerun en el log."""
+        if not self.activo:
+            return
+        self._fin = time.perf_counter()
+        tabla = self.tabla()
+        with st.expander(f"⏱️ Tiempos por sección ({len(tabla)} secciones)"):
+            st.dataframe(tabla, use_container_width=True, hide_index=True)
+            if len(tabla) > 0:
+                st.plotly_chart(self.figura_flame(), use_container_width=True)
+            st.caption(f"Registro acumulado en {self.log}")
+        try:
+            self.escribir_log(**contexto)
+        except OSError as error:
+            st.caption(f"No se pudo escribir el log de tiempos: {error}")
+
+
+def resumir_log(ruta=LOG_TIEMPOS):
+    """p50/p95 por sección a partir del log JSONL."""
+    filas = []
+    with open(ruta, encoding='utf-8') as f:
+        for linea in f:
+            if not linea.strip():
+                continue
+            registro = json.loads(linea)
+            filas.append({'seccion': '(rerun completo)', 'ms': registro['total_ms']})
+            filas.extend({'seccion': s['nombre'], 'ms': s['ms']} for s in registro['secciones'])
+    if not filas:
+        return pd.DataFrame(columns=['reruns', 'p50_ms', 'p95_ms', 'max_ms'])
+    tiempos = pd.DataFrame(filas).groupby('seccion', sort=False)['ms']
+    return pd.DataFrame({
+        'reruns': tiempos.size(),
+        'p50_ms': tiempos.quantile(0.50).round(2),
+        'p95_ms': tiempos.quantile(0.95).round(2),
+        'max_ms': tiempos.max().round(2),
+    })
+
+
+if __name__ == '__main__':
+    print(resumir_log(sys.argv[1] if len(sys.argv) > 1 else LOG_TIEMPOS).to_string())
@@ -0,0 +1,124 @@
+"""Caché del panel de detalle y precarga en segundo plano.
+
+Las consultas del panel de detalle (ver servicio.py) se guardan en una caché
+LRU por proceso, indexada por el token de versión del empleado
+(``version_empleado``). ``Precargador`` la llena desde un hilo de fondo con
+los empleados que probablemente se elijan a continuación (los del área
+seleccionada), así un clic sobre ellos solo lee la caché. Las consultas de la
+Mesa Gerencial ya vienen resueltas con los datos (ver mesa.py) y no ocupan
+lugar en la caché.
+
+No se usa ``st.cache_data``: fuera del hilo de un rerun Streamlit no guarda
+resultados. Los resultados son dataclasses inmutables que se comparten sin
+copiarlas entre sesiones.
+"""
+import itertools
+import logging
+import threading
+from collections import OrderedDict, deque
+
+import servicio
+
+# Entradas de la caché (desalojo LRU)
+MAX_ENTRADAS_DETALLE = 4096
+# Empleados por programación: un área enorme no debe desalojar toda la caché
+MAX_NOMBRES_PRECARGA = 500
+
+# Consultas del panel: nombre -> función (datos, nombre, *args)
+CONSULTAS = {
+    'perfil': servicio.obtener_perfil_empleado,
+    'competencias': servicio.obtener_competencias,
+    'equipo': servicio.obtener_equipo,
+    'filtros_equipo': servicio.obtener_filtros_equipo,
+    'pagina_equipo': servicio.obtener_pagina_equipo,
+}
+# Lo que se precalienta de cada jefe: lo que muestra el panel al abrir sus secciones
+_PRECARGA_JEFE = ('competencias', 'equipo', 'pagina_equipo')
+
+# Marca de "no precalculada" (una vista puede valer None)
+_SIN_VISTA = object()
+
+logger = logging.getLogger(__name__)
+
+
+class CacheDetalle:
+    """Resultados de ``CONSULTAS`` por (consulta, versión del empleado, nombre, argumentos)."""
+
+    def __init__(self, maximo=MAX_ENTRADAS_DETALLE):
+        self.maximo = maximo
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(datos, consulta, nombre, args):
+        return (consulta, datos.version_empleado(nombre), nombre, *args)
+
+    def contiene(self, datos, consulta, nombre, *args):
+        return ((consulta, nombre, *args) in datos.mesa.vistas
+                or self._clave(datos, consulta, nombre, args) in self._entradas)
+
+    def obtener(self, datos, consulta, nombre, *args):
+        """Resultado cacheado o calculado de ``CONSULTAS[consulta](datos, nombre, *args)``."""
+        precalculada = datos.mesa.vistas.get((consulta, nombre, *args), _SIN_VISTA)
+        if precalculada is not _SIN_VISTA:
+            return precalculada
+        clave = self._clave(datos, consulta, nombre, args)
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                return self._entradas[clave]
+        # Se calcula fuera del lock: si dos hilos piden lo mismo a la vez, ambos
+        # obtienen el mismo valor y solo se guarda una vez
+        valor = CONSULTAS[consulta](datos, nombre, *args)
+        with self._lock:
+            self._entradas[clave] = valor
+            if len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+class Precargador:
+    """Hilo de fondo que llena una ``CacheDetalle`` con los nombres programados.
+
+    Cada ``programar`` reemplaza lo pendiente: la última selección (de
+    cualquier sesión) es la que se precalienta primero.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._pendientes = deque()
+        self._condicion = threading.Condition()
+        hilo = threading.Thread(target=self._trabajar, daemon=True, name='precarga-detalle-9box')
+        hilo.start()
+
+    def programar(self, datos, nombres):
+        """Precalienta perfil y, para los jefes, las secciones del panel de ``nombres``.
+
+        Se toman los primeros ``MAX_NOMBRES_PRECARGA`` nombres distintos, en orden.
+        """
+        tareas = deque()
+        for nombre in itertools.islice(dict.fromkeys(nombres), MAX_NOMBRES_PRECARGA):
+            consultas = ('perfil', *_PRECARGA_JEFE) if datos.directorio.es_jefe(nombre) else ('perfil',)
+            tareas.extend((datos, consulta, nombre) for consulta in consultas
+                          if not self.cache.contiene(datos, consulta, nombre))
+        with self._condicion:
+            self._pendientes = tareas
+            self._condicion.notify()
+        return len(tareas)
+
+    def pendientes(self):
+        return len(self._pendientes)
+
+    def _trabajar(self):
+        while True:
+            with self._condicion:
+                while not self._pendientes:
+                    self._condicion.wait()
+                datos, consulta, nombre = self._pendientes.popleft()
+            try:
+                self.cache.obtener(datos, consulta, nombre)
+            except Exception:
+                logger.exception("No se pudo precargar %s de %s", consulta, nombre)
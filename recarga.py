@@ -0,0 +1,272 @@
+"""Recarga en caliente del libro 9-Box con actualización incremental.
+
+``RecargadorLibro`` vigila el xlsx en un hilo de fondo. Cuando el contenido
+cambia, el snapshot re-parsea solo las hojas modificadas (ver ingesta.py), las
+filas se comparan por NOMBRE y únicamente se reconstruye lo que depende de
+lo que cambió. Cada versión se publica como un ``DatosTablero`` inmutable que
+reemplaza al anterior con una sola asignación, así cada rerun trabaja de
+principio a fin con una versión consistente.
+
+Las cachés del dashboard se indexan con ``version_area`` / ``version_empleado``
+en lugar de la versión global: un área o empleado no afectado conserva su
+token y sus entradas cacheadas siguen siendo válidas tras la recarga.
+"""
+import logging
+import threading
+import time
+from functools import cached_property
+
+import pandas as pd
+
+from agregados import CuboAgregados
+from almacen import construir_almacen
+from buscador import BuscadorEmpleados
+from competencias import IndiceCompetencias
+from cuadrantes import agregar_cuadrante
+from directorio import DirectorioEmpleados
+from ingesta import (DIRECTORIO_SNAPSHOT, EXCEL_FILE, HOJAS, cargar_hojas, hojas_modificadas,
+                     huella_archivo, snapshot_vigente)
+from mesa import MesaGerencial
+from nombres import COLUMNAS_REPORTE, ResolutorNombres, nombres_canonicos, resolver_hojas
+from organigrama import ArbolOrganizacional
+from validacion import COLUMNAS_CALIDAD, PROBLEMAS_CRUCE, normalizar_hoja, validar_cruces
+
+# Segundos entre revisiones del archivo
+INTERVALO_REVISION = 5
+
+logger = logging.getLogger(__name__)
+
+
+def _huellas_por_nombre(df, columna):
+    """Hash del contenido de las filas de cada nombre (Serie indexada por nombre)."""
+    filas = df[df[columna].notna()]
+    hashes = pd.util.hash_pandas_object(filas, index=False)
+    # La suma (módulo 2**64) no depende del orden de las filas repetidas
+    return hashes.groupby(filas[columna].to_numpy()).sum()
+
+
+def nombres_modificados(df_anterior, df_nuevo, columna='NOMBRE'):
+    """Nombres agregados, eliminados o con alguna fila distinta entre versiones."""
+    if list(df_anterior.columns) != list(df_nuevo.columns):
+        return set(df_anterior[columna].dropna()) | set(df_nuevo[columna].dropna())
+    anterior = _huellas_por_nombre(df_anterior, columna)
+    nuevo = _huellas_por_nombre(df_nuevo, columna)
+    anterior, nuevo = anterior.align(nuevo)
+    distintos = anterior.isna() | nuevo.isna() | (anterior != nuevo)
+    return set(anterior.index[distintos])
+
+
+def _areas_de(df_all, nombres):
+    filas = df_all[df_all['NOMBRE'].isin(nombres)]
+    return set(filas[['GERENCIA', 'ÁREA']].itertuples(index=False, name=None))
+
+
+def _jefes_de(df_all, nombres):
+    return set(df_all.loc[df_all['NOMBRE'].isin(nombres), 'JEFE DIRECTO'].dropna())
+
+
+class DatosTablero:
+    """Una versión completa de tablas, índices y agregados (no se modifica)."""
+
+    def __init__(self, df_niveles_medios, df_jefes, df_competencias_jefes, version,
+                 df_all=None, directorio=None, organigrama=None, cubo=None,
+                 versiones_area=None, versiones_empleado=None, version_base=None, competencias=None,
+                 nombres=None, referencias=None, mesa=None, calidad=None):
+        if df_all is None:
+            # Una sola tabla compacta con todos los empleados; las hojas pasan
+            # a ser vistas de ella (ver almacen.py)
+            df_all, df_niveles_medios, df_jefes = construir_almacen(df_niveles_medios, df_jefes)
+        self.df_niveles_medios = df_niveles_medios
+        self.df_jefes = df_jefes
+        self.df_competencias_jefes = df_competencias_jefes
+        self.version = version
+        # Nombres canónicos con ids y reporte de grafías corregidas o sin
+        # resolver (ver nombres.py); las hojas ya llegan canonicalizadas
+        self.nombres = nombres if nombres is not None else ResolutorNombres(
+            nombres_canonicos(df_niveles_medios, df_jefes))
+        self.referencias = referencias if referencias is not None else pd.DataFrame(columns=COLUMNAS_REPORTE)
+        # Incidencias de la validación de la ingesta (ver validacion.py)
+        self.calidad = calidad if calidad is not None else pd.DataFrame(columns=COLUMNAS_CALIDAD)
+        # Perfiles de competencias normalizados por participante
+        self.competencias = competencias if competencias is not None else IndiceCompetencias(df_competencias_jefes)
+
+        if directorio is None:
+            # Índices de nombre, reportes directos y jefatura (búsquedas O(1))
+            directorio = DirectorioEmpleados(df_niveles_medios, df_jefes)
+            # Jerarquía completa con agregados por subárbol
+            organigrama = ArbolOrganizacional(df_all)
+            # Agregados por (GERENCIA, ÁREA, CUADRANTE) para sidebar y resumen
+            cubo = CuboAgregados(df_all)
+        self.df_all = df_all
+        self.directorio = directorio
+        self.organigrama = organigrama
+        self.cubo = cubo
+
+        self.versiones_area = versiones_area or {}
+        self.versiones_empleado = versiones_empleado or {}
+        self.version_base = version_base or version
+        # Integrantes, consolidados y panel de detalle de la Mesa Gerencial
+        # (ver mesa.py); se calcula al final porque consulta esta misma versión
+        self.mesa = mesa if mesa is not None else MesaGerencial(self)
+
+    @cached_property
+    def buscador(self):
+        """Buscador global por NOMBRE y CARGO; se construye con la primera búsqueda."""
+        return BuscadorEmpleados(self.df_all)
+
+    def version_area(self, gerencia, area):
+        """Token de caché del área: cambia solo cuando una recarga la afecta."""
+        return self.versiones_area.get((gerencia, area), self.version_base)
+
+    def version_empleado(self, nombre):
+        """Token de caché del detalle de un empleado."""
+        return self.versiones_empleado.get(nombre, self.version_base)
+
+
+def construir_datos(hojas, version, anterior=None):
+    """Construye un ``DatosTablero`` a partir de las hojas recién leídas.
+
+    Sin ``anterior`` se construye todo. Con ``anterior``, ``hojas`` trae solo
+    las hojas re-parseadas: las demás, y los índices que no dependen de filas
+    cambiadas, se reutilizan tal cual.
+    """
+    # Esquema y escalas de las hojas recién leídas: desde aquí las columnas
+    # existen y los puntajes son Int8 en 1..3 o vacíos
+    calidad = [normalizar_hoja(nombre, df) for nombre, df in hojas.items()]
+    if anterior is not None:
+        # Las hojas que no cambiaron conservan sus incidencias propias
+        calidad.append(anterior.calidad[~anterior.calidad['Hoja'].isin(list(hojas))
+                                        & ~anterior.calidad['Problema'].isin(PROBLEMAS_CRUCE)])
+    for nombre in ('niveles_medios', 'jefes'):
+        if nombre in hojas:
+            # Cuadrante 9-Box precalculado (vectorizado) para todas las filas
+            agregar_cuadrante(hojas[nombre])
+
+    # Las referencias por nombre de las hojas recién leídas se reescriben a la
+    # grafía canónica antes de cualquier cruce o comparación. Las hojas que no
+    # cambiaron ya se resolvieron al leerse y conservan su parte del reporte.
+    df_niveles_medios = hojas['niveles_medios'] if 'niveles_medios' in hojas else anterior.df_niveles_medios
+    df_jefes = hojas['jefes'] if 'jefes' in hojas else anterior.df_jefes
+    nombres = ResolutorNombres(nombres_canonicos(df_niveles_medios, df_jefes))
+    referencias = resolver_hojas(hojas, nombres)
+    if anterior is not None:
+        conservadas = anterior.referencias[~anterior.referencias['Hoja'].isin(list(hojas))]
+        if len(conservadas):
+            referencias = pd.concat([conservadas, referencias], ignore_index=True) if len(referencias) else conservadas
+
+    # Cruces entre hojas, ya con los nombres en su grafía canónica
+    df_competencias = hojas['competencias_jefes'] if 'competencias_jefes' in hojas else anterior.df_competencias_jefes
+    calidad.append(validar_cruces(df_niveles_medios, df_jefes, df_competencias))
+    calidad = pd.concat([c for c in calidad if len(c)] or [pd.DataFrame(columns=COLUMNAS_CALIDAD)], ignore_index=True)
+
+    if anterior is None:
+        return DatosTablero(hojas['niveles_medios'], hojas['jefes'], hojas['competencias_jefes'], version,
+                            nombres=nombres, referencias=referencias, calidad=calidad)
+
+    cambiados = set()
+    if 'niveles_medios' in hojas or 'jefes' in hojas:
+        # Se compara en el formato compacto: las hojas recién leídas traen
+        # otros tipos y no tienen las columnas de la otra hoja
+        df_all, df_niveles_medios, df_jefes = construir_almacen(
+            hojas.get('niveles_medios', anterior.df_niveles_medios),
+            hojas.get('jefes', anterior.df_jefes),
+        )
+        for nombre, df_anterior, df_nuevo in (('niveles_medios', anterior.df_niveles_medios, df_niveles_medios),
+                                              ('jefes', anterior.df_jefes, df_jefes)):
+            if nombre in hojas:
+                cambiados |= nombres_modificados(df_anterior, df_nuevo)
+    competencias_cambiadas = set()
+    if 'competencias_jefes' in hojas:
+        competencias_cambiadas = nombres_modificados(
+            anterior.df_competencias_jefes, hojas['competencias_jefes'], 'Nombre del participante'
+        )
+
+    df_competencias_jefes = hojas['competencias_jefes'] if competencias_cambiadas else anterior.df_competencias_jefes
+    competencias = None if competencias_cambiadas else anterior.competencias
+
+    if cambiados:
+        nuevo = DatosTablero(df_niveles_medios, df_jefes, df_competencias_jefes, version, df_all=df_all,
+                             competencias=competencias, nombres=nombres, referencias=referencias, calidad=calidad)
+    else:
+        # Ninguna fila de empleados cambió: se reutilizan tablas e índices
+        nuevo = DatosTablero(
+            anterior.df_niveles_medios, anterior.df_jefes, df_competencias_jefes, version,
+            df_all=anterior.df_all, directorio=anterior.directorio,
+            organigrama=anterior.organigrama, cubo=anterior.cubo, competencias=competencias,
+            nombres=anterior.nombres, referencias=referencias, calidad=calidad,
+            # Sus consolidados incluyen competencias: solo se reutiliza si no cambiaron
+            mesa=anterior.mesa if competencias is not None else None,
+        )
+
+    # Afectados: los cambiados, sus jefes (antes y después) y toda la cadena
+    # hacia arriba, cuyas estructuras completas incluyen a los cambiados
+    empleados_afectados = set(cambiados) | competencias_cambiadas
+    for datos in (anterior, nuevo):
+        for nombre in cambiados:
+            empleados_afectados.update(datos.organigrama.ancestros(nombre))
+    areas_afectadas = set()
+    for datos in (anterior, nuevo):
+        areas_afectadas |= _areas_de(datos.df_all, cambiados | competencias_cambiadas)
+        areas_afectadas |= _areas_de(datos.df_all, _jefes_de(datos.df_all, cambiados))
+
+    nuevo.version_base = anterior.version_base
+    nuevo.versiones_area = {**anterior.versiones_area, **{area: version for area in areas_afectadas}}
+    nuevo.versiones_empleado = {**anterior.versiones_empleado, **{n: version for n in empleados_afectados}}
+    return nuevo
+
+
+class RecargadorLibro:
+    """Publica la versión vigente del libro y la reemplaza cuando cambia.
+
+    ``actual`` siempre apunta a un ``DatosTablero`` completo; el reemplazo es
+    una sola asignación, por lo que los lectores nunca ven una versión a medias.
+    """
+
+    def __init__(self, excel_file=EXCEL_FILE, directorio=DIRECTORIO_SNAPSHOT,
+                 intervalo=INTERVALO_REVISION, vigilar=True):
+        self.excel_file = excel_file
+        self.directorio = directorio
+        self._lock = threading.Lock()
+
+        self._huella = huella_archivo(excel_file)
+        self._manifiesto = snapshot_vigente(excel_file, directorio)
+        hojas = cargar_hojas(self._manifiesto, HOJAS, directorio)
+        self.actual = construir_datos(hojas, self._manifiesto['sha256'])
+
+        if vigilar:
+            hilo = threading.Thread(target=self._vigilar, args=(intervalo,), daemon=True,
+                                    name='recarga-libro-9box')
+            hilo.start()
+
+    def _vigilar(self, intervalo):
+        while True:
+            time.sleep(intervalo)
+            try:
+                self.revisar()
+            except Exception:
+                # Archivo a medio copiar o inválido: se conserva la versión vigente
+                # y se reintenta en la siguiente revisión
+                logger.exception("No se pudo recargar %s", self.excel_file)
+
+    def revisar(self):
+        """Recarga si el archivo cambió. Devuelve True si publicó una versión nueva."""
+        with self._lock:
+            huella = huella_archivo(self.excel_file)
+            if huella == self._huella:
+                return False
+
+            manifiesto = snapshot_vigente(self.excel_file, self.directorio)
+            if manifiesto['sha256'] == self._manifiesto['sha256']:
+                self._huella = huella
+                self._manifiesto = manifiesto
+                return False
+
+            modificadas = hojas_modificadas(self._manifiesto.get('huellas'), manifiesto.get('huellas'))
+            hojas = cargar_hojas(manifiesto, modificadas, self.directorio)
+            nuevo = construir_datos(hojas, manifiesto['sha256'], anterior=self.actual)
+
+            self._huella = huella
+            self._manifiesto = manifiesto
+            self.actual = nuevo
+            logger.info("Libro recargado (hojas: %s)", ", ".join(modificadas) or "ninguna")
+            return True
@@ -0,0 +1,348 @@
+"""Consultas del tablero 9-Box sin dependencias de Streamlit.
+
+Cada función recibe un ``DatosTablero`` (ver recarga.py) y devuelve una
+dataclass compacta (``slots``, inmutable) con lo que una interfaz necesita
+mostrar. El dashboard es solo un renderizador sobre estas consultas y las
+cachea por token de versión; la exportación y otros clientes las usan tal cual.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from agregados import SIN_EVALUACION
+from cuadrantes import CUADRANTES_TALENTO_TOP, distribucion_cuadrantes, tabla_equipo
+
+# Filas por página de la tabla del equipo; los equipos que caben en una sola
+# página se muestran completos
+POR_PAGINA_EQUIPO = 25
+# Columna visible de la tabla del equipo -> columna por la que se ordena
+ORDEN_EQUIPO = {
+    'Nombre': 'NOMBRE',
+    'Cargo': 'CARGO',
+    'Evaluación 9-Box': 'CUADRANTE',
+    'Resultado Individual': 'RESULTADO INDIVIDUAL',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EmpleadosArea:
+    """Empleados de un área (sin nombres repetidos) separados por evaluación."""
+    empleados: pd.DataFrame
+    con_evaluacion: pd.DataFrame
+    sin_evaluacion: pd.DataFrame
+    nombres: list
+
+
+@dataclass(frozen=True, slots=True)
+class ResumenArea:
+    """Totales, promedios y distribución por cuadrante de un área."""
+    total: int
+    evaluados: int
+    sin_evaluacion: int
+    promedio_potencial: float | None
+    promedio_desempeño: float | None
+    distribucion: pd.Series
+
+
+@dataclass(frozen=True, slots=True)
+class JefesArea:
+    """Jefes sin evaluación de un área y sus estadísticas."""
+    jefes: list
+    promedio_equipos: float | None
+    con_competencias: int
+
+
+@dataclass(frozen=True, slots=True)
+class ComparativoAreas:
+    """Todas las áreas lado a lado (una fila por gerencia y área)."""
+    # total, evaluados, promedio_potencial, promedio_desempeño, talento_top
+    # (proporción de evaluados en CUADRANTES_TALENTO_TOP) y personas por cuadrante (1..9)
+    tabla: pd.DataFrame
+    # % de los evaluados del área en cada cuadrante (columnas 1..9; NaN sin evaluados)
+    porcentajes: pd.DataFrame
+
+
+@dataclass(frozen=True, slots=True)
+class Evaluacion:
+    potencial: int
+    desempeño: int
+    cuadrante: int
+
+
+@dataclass(frozen=True, slots=True)
+class Estructura:
+    """Subárbol completo de un jefe (directos e indirectos), ver organigrama.py."""
+    total: int
+    evaluados: int
+    distribucion: pd.Series
+    promedio_potencial: float | None
+    promedio_desempeño: float | None
+    directos: int
+    niveles: int
+
+
+@dataclass(frozen=True, slots=True)
+class Equipo:
+    """Estadísticas del equipo directo de un jefe (la tabla va por páginas)."""
+    total: int
+    promedio_potencial: float | None
+    promedio_desempeño: float | None
+    distribucion: pd.Series | None
+    # Solo cuando hay personas a cargo además de las directas
+    estructura: Estructura | None
+
+
+@dataclass(frozen=True, slots=True)
+class FiltrosEquipo:
+    """Valores disponibles para filtrar la tabla del equipo."""
+    cargos: list
+    # 0 = sin evaluación
+    cuadrantes: list
+
+
+@dataclass(frozen=True, slots=True)
+class PaginaEquipo:
+    """Una página de la tabla del equipo, ya filtrada y ordenada."""
+    tabla: pd.DataFrame
+    # Filas que pasan el filtro (todas las páginas)
+    total: int
+    pagina: int
+    paginas: int
+    # Posición (desde 1) de la primera fila de la página
+    desde: int
+
+
+@dataclass(frozen=True, slots=True)
+class CompetenciasJefe:
+    """Competencias 2025 de un participante, ya normalizadas (ver competencias.py)."""
+    # (competencia, porcentaje 0-100, impacto esperado, percentil 0-100 en la
+    # organización para esa competencia o None), en el orden de la hoja
+    competencias: list
+    promedio: float | None
+    # Promedio de los porcentajes ponderado por IMPACTO ESPERADO
+    ponderado: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class PerfilEmpleado:
+    """Encabezado del panel de detalle; competencias y equipo se piden aparte."""
+    nombre: str
+    cargo: str
+    jefe_directo: str | None
+    resultado_individual: float | None
+    es_jefe: bool
+    evaluacion: Evaluacion | None = None
+    # Solo para jefes
+    promedio_equipo: float | None = None
+    # Clave del empleado entre periodos (ver historial.py)
+    cedula: int | None = None
+
+
+def es_jefe(datos, nombre):
+    """Verifica si un empleado es jefe basado en múltiples criterios"""
+    # Los criterios (hoja de Jefes, PROMEDIO EQUIPO, aparecer como JEFE DIRECTO)
+    # se evalúan una sola vez al construir el directorio
+    return datos.directorio.es_jefe(nombre)
+
+
+def obtener_empleados_area(datos, gerencia, area):
+    """Empleados del área (con y sin evaluación) y la lista para el selector."""
+    empleados = datos.cubo.filtrar(datos.df_all, gerencia, area)
+    # CUADRANTE es vacío justo cuando falta Potencial o Desempeño (ver validacion.py)
+    evaluado = empleados['CUADRANTE'].notna()
+    con_evaluacion = empleados[evaluado]
+    sin_evaluacion = empleados[~evaluado]
+    # Todos los empleados del área aparecen en el selector
+    nombres = sorted(empleados['NOMBRE'].unique().tolist())
+    return EmpleadosArea(empleados, con_evaluacion, sin_evaluacion, nombres)
+
+
+def obtener_resumen_area(datos, gerencia, area):
+    """Resumen del área leído del cubo de agregados."""
+    return ResumenArea(**datos.cubo.resumen(gerencia, area))
+
+
+def obtener_distribucion(datos, gerencia, area):
+    """Personas evaluadas por cuadrante en el área (Serie indexada por cuadrante)."""
+    return datos.cubo.resumen(gerencia, area)['distribucion']
+
+
+def obtener_comparativo_areas(datos, gerencia=None):
+    """Distribución, promedios y talento top de todas las áreas (o las de ``gerencia``).
+
+    Sale de una sola tabla del cubo de agregados, sin filtrar área por área.
+    """
+    tabla = datos.cubo.comparativo(gerencia)
+    cuadrantes = list(range(1, 10))
+    evaluados = tabla['evaluados'].where(tabla['evaluados'] > 0)
+    porcentajes = tabla[cuadrantes].div(evaluados, axis=0).mul(100)
+    tabla = tabla.copy()
+    tabla.insert(4, 'talento_top', tabla[list(CUADRANTES_TALENTO_TOP)].sum(axis=1) / evaluados)
+    return ComparativoAreas(tabla, porcentajes)
+
+
+def obtener_jefes_area(datos, gerencia, area):
+    """Lista y estadísticas de los jefes sin evaluación del área."""
+    sin_evaluacion = obtener_empleados_area(datos, gerencia, area).sin_evaluacion
+    directorio = datos.directorio
+
+    jefes = sin_evaluacion[directorio.mascara_jefes(sin_evaluacion['NOMBRE'])]
+    promedios_equipos = []
+    for nombre, promedio in zip(jefes['NOMBRE'], jefes['PROMEDIO EQUIPO']):
+        if pd.notna(promedio):
+            promedios_equipos.append(promedio)
+        else:
+            # Buscar en la otra hoja
+            fila_otra_hoja = directorio.fila_j(nombre)
+            if fila_otra_hoja is not None and pd.notna(fila_otra_hoja['PROMEDIO EQUIPO']):
+                promedios_equipos.append(fila_otra_hoja['PROMEDIO EQUIPO'])
+
+    return JefesArea(
+        jefes=list(zip(jefes['NOMBRE'], jefes['CARGO'])),
+        promedio_equipos=sum(promedios_equipos) / len(promedios_equipos) if promedios_equipos else None,
+        # Participantes precalculados en el índice de competencias
+        con_competencias=datos.competencias.contar_participantes(sin_evaluacion['NOMBRE']),
+    )
+
+
+def obtener_equipo(datos, nombre_jefe):
+    """Equipo directo del jefe (ambas hojas), o None si no tiene."""
+    equipo = datos.directorio.equipo_directo(nombre_jefe)
+    if equipo.empty:
+        return None
+    con_evaluacion = equipo[equipo['CUADRANTE'].notna()]
+    hay_evaluados = len(con_evaluacion) > 0
+
+    estructura = None
+    if datos.organigrama.contiene(nombre_jefe):
+        resumen = datos.organigrama.resumen_subarbol(nombre_jefe)
+        if resumen['total'] > resumen['directos']:
+            estructura = Estructura(**resumen)
+
+    return Equipo(
+        total=len(equipo),
+        promedio_potencial=con_evaluacion['Potencial'].mean() if hay_evaluados else None,
+        promedio_desempeño=con_evaluacion['Desempeño'].mean() if hay_evaluados else None,
+        distribucion=distribucion_cuadrantes(con_evaluacion) if hay_evaluados else None,
+        estructura=estructura,
+    )
+
+
+def _miembros_equipo(datos, nombre_jefe, alcance):
+    """Filas del equipo directo, o de toda la estructura con ``alcance='estructura'``."""
+    if alcance != 'estructura':
+        return datos.directorio.equipo_directo(nombre_jefe)
+    organigrama = datos.organigrama
+    if not organigrama.contiene(nombre_jefe):
+        return pd.DataFrame()
+    ids = organigrama.ids_subarbol(nombre_jefe)
+    miembros = organigrama.filas.iloc[ids]
+    if miembros['NOMBRE'].isna().any():
+        # Los jefes sin fila propia solo tienen nombre
+        miembros = miembros.assign(NOMBRE=[organigrama.nombres[i] for i in ids])
+    return miembros
+
+
+def _clave_orden(columna):
+    # Las categorías del almacén no están en orden alfabético
+    return columna.astype(object) if isinstance(columna.dtype, pd.CategoricalDtype) else columna
+
+
+def obtener_filtros_equipo(datos, nombre_jefe, alcance='directos'):
+    """Cargos y cuadrantes presentes en el equipo, para los filtros de la tabla."""
+    miembros = _miembros_equipo(datos, nombre_jefe, alcance)
+    if len(miembros) == 0:
+        return FiltrosEquipo([], [])
+    return FiltrosEquipo(
+        cargos=sorted(miembros['CARGO'].dropna().astype(object).unique()),
+        cuadrantes=sorted(miembros['CUADRANTE'].fillna(SIN_EVALUACION).astype(int).unique().tolist()),
+    )
+
+
+def obtener_pagina_equipo(datos, nombre_jefe, alcance='directos', cuadrantes=(), cargo=None,
+                          orden=None, descendente=False, pagina=1, por_pagina=POR_PAGINA_EQUIPO):
+    """Página de la tabla del equipo, o None si el jefe no tiene equipo.
+
+    Filtro y orden se aplican sobre las columnas ya calculadas en la carga
+    (CUADRANTE, CARGO, RESULTADO INDIVIDUAL); solo las filas de la página se
+    formatean como texto. Sin ``orden`` se conserva el orden del equipo.
+    """
+    miembros = _miembros_equipo(datos, nombre_jefe, alcance)
+    if len(miembros) == 0:
+        return None
+    mascara = np.ones(len(miembros), dtype=bool)
+    if cuadrantes:
+        mascara &= miembros['CUADRANTE'].fillna(SIN_EVALUACION).isin(list(cuadrantes)).to_numpy()
+    if cargo is not None:
+        mascara &= (miembros['CARGO'] == cargo).to_numpy()
+    filtrados = miembros[mascara] if not mascara.all() else miembros
+    if orden is not None:
+        filtrados = filtrados.sort_values(ORDEN_EQUIPO[orden], ascending=not descendente,
+                                          na_position='last', kind='stable', key=_clave_orden)
+
+    total = len(filtrados)
+    paginas = max(1, -(-total // por_pagina))
+    pagina = min(max(1, pagina), paginas)
+    inicio = (pagina - 1) * por_pagina
+    tabla = tabla_equipo(filtrados.iloc[inicio:inicio + por_pagina]).reset_index(drop=True)
+    return PaginaEquipo(tabla, total, pagina, paginas, inicio + 1)
+
+
+def _promedio_equipo(datos, nombre, empleado, fuente):
+    if pd.notna(empleado['PROMEDIO EQUIPO']):
+        return empleado['PROMEDIO EQUIPO']
+    # Buscar en la otra hoja
+    if fuente == "niveles_medios":
+        otra_hoja = datos.directorio.fila_j(nombre)
+    else:
+        otra_hoja = datos.directorio.fila_nm(nombre)
+    if otra_hoja is not None and pd.notna(otra_hoja['PROMEDIO EQUIPO']):
+        return otra_hoja['PROMEDIO EQUIPO']
+    return None
+
+
+def obtener_competencias(datos, nombre):
+    """Competencias del participante con percentiles y puntajes, o None si no tiene."""
+    # Ya normalizadas en la carga (ver competencias.py)
+    perfil = datos.competencias.perfil(nombre)
+    if perfil is None:
+        return None
+    return CompetenciasJefe(
+        competencias=[(*fila, percentil) for fila, percentil in zip(perfil['competencias'], perfil['percentiles'])],
+        promedio=perfil['promedio'],
+        ponderado=perfil['ponderado'],
+    )
+
+
+def obtener_perfil_empleado(datos, nombre):
+    """Encabezado del panel de detalle (datos básicos y evaluación), o None si no existe."""
+    # Se usa su fila de 'Niveles medios' y, si no está, la de 'Jefes'
+    empleado = datos.directorio.fila_nm(nombre)
+    fuente = "niveles_medios"
+    if empleado is None:
+        empleado = datos.directorio.fila_j(nombre)
+        fuente = "jefes"
+    if empleado is None:
+        return None
+
+    evaluacion = None
+    # Puntajes ya validados en 1..3 (ver validacion.py)
+    if pd.notna(empleado['CUADRANTE']):
+        evaluacion = Evaluacion(
+            potencial=int(empleado['Potencial']),
+            desempeño=int(empleado['Desempeño']),
+            cuadrante=int(empleado['CUADRANTE']),
+        )
+    es_jefe_empleado = es_jefe(datos, nombre)
+    return PerfilEmpleado(
+        nombre=empleado['NOMBRE'],
+        cargo=empleado['CARGO'],
+        jefe_directo=empleado['JEFE DIRECTO'] if pd.notna(empleado['JEFE DIRECTO']) else None,
+        resultado_individual=(empleado['RESULTADO INDIVIDUAL']
+                              if pd.notna(empleado['RESULTADO INDIVIDUAL']) else None),
+        es_jefe=es_jefe_empleado,
+        evaluacion=evaluacion,
+        promedio_equipo=_promedio_equipo(datos, nombre, empleado, fuente) if es_jefe_empleado else None,
+        cedula=int(empleado['Cédula']) if pd.notna(empleado['Cédula']) else None,
+    )
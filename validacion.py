@@ -0,0 +1,170 @@
+"""Validación de las hojas del libro al momento de la ingesta.
+
+Cada hoja recién leída se normaliza una sola vez: se agregan las columnas del
+esquema que falten, los puntajes se convierten a números (Potencial y
+Desempeño a Int8 en 1..3, Cédula a Int64) y lo que no cumple queda vacío y
+anotado en el reporte de calidad. Después de la resolución de nombres (ver
+nombres.py) se revisan los cruces entre hojas: NOMBRE repetido entre 'Niveles
+medios' y 'Jefes', JEFE DIRECTO que no es ningún empleado y competencias de
+participantes desconocidos.
+
+Todo se calcula con operaciones por columna, sin recorrer filas. El resto
+del código puede contar con que las columnas existen y tienen su tipo.
+
+Uso desde la línea de comandos (resumen del libro vigente)::
+
+    python validacion.py ["Tactico_9box (1).xlsx"]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from competencias import COLUMNA_IMPACTO, COLUMNA_PARTICIPANTE
+
+# Columna -> tipo de cada hoja; las que falten se agregan vacías con ese tipo
+_ESQUEMA_EMPLEADOS = {
+    'Cédula': 'Int64',
+    'NOMBRE': object,
+    'CARGO': 'category',
+    'JEFE DIRECTO': object,
+    'GERENCIA': 'category',
+    'ÁREA': 'category',
+    'Potencial': 'Int8',
+    'Desempeño': 'Int8',
+    'RESULTADO INDIVIDUAL': 'float64',
+    'PROMEDIO EQUIPO': 'float64',
+}
+ESQUEMA = {
+    'niveles_medios': _ESQUEMA_EMPLEADOS,
+    'jefes': _ESQUEMA_EMPLEADOS,
+    'competencias_jefes': {
+        COLUMNA_PARTICIPANTE: object,
+        'Competencia': object,
+        '%': 'float64',
+        COLUMNA_IMPACTO: 'float64',
+    },
+}
+# Columnas sin las cuales la hoja no sirve (se reportan aparte)
+OBLIGATORIAS = {
+    'niveles_medios': ('Cédula', 'NOMBRE'),
+    'jefes': ('Cédula', 'NOMBRE'),
+    'competencias_jefes': (COLUMNA_PARTICIPANTE, 'Competencia'),
+}
+# Escala de la evaluación 9-Box
+PUNTAJES_VALIDOS = (1, 2, 3)
+_COLUMNAS_PUNTAJE = ('Potencial', 'Desempeño')
+
+COLUMNAS_CALIDAD = ['Hoja', 'Fila', 'Columna', 'Valor', 'Problema']
+# Problemas que dependen de más de una hoja: se recalculan en cada recarga
+PROBLEMAS_CRUCE = frozenset({
+    'NOMBRE en ambas hojas de empleados',
+    'JEFE DIRECTO no es un empleado',
+    'Participante desconocido',
+})
+
+
+def _incidencias(hoja, df, mascara, columna, problema):
+    """Filas del reporte para las posiciones de ``mascara`` (Fila empieza en 1)."""
+    posiciones = np.flatnonzero(mascara)
+    # Como texto: en una misma columna conviven números, textos y vacíos
+    valores = df[columna].iloc[posiciones].astype('string').to_numpy(dtype=object, na_value=None)
+    return pd.DataFrame({
+        'Hoja': hoja,
+        'Fila': posiciones + 1,
+        'Columna': columna,
+        'Valor': valores,
+        'Problema': problema,
+    }, columns=COLUMNAS_CALIDAD)
+
+
+def _reporte(partes):
+    partes = [p for p in partes if len(p)]
+    if not partes:
+        return pd.DataFrame(columns=COLUMNAS_CALIDAD)
+    return pd.concat(partes, ignore_index=True)
+
+
+def normalizar_hoja(hoja, df):
+    """Ajusta ``df`` en el lugar al esquema de ``hoja`` y devuelve sus incidencias.
+
+    ``Fila`` es la posición entre las filas con datos de la hoja (1 = la
+    primera bajo el encabezado; las filas vacías no cuentan).
+    """
+    esquema = ESQUEMA[hoja]
+    partes = []
+    # Los encabezados se comparan sin espacios a los lados, como en la ingesta
+    presentes = {str(c).strip(): c for c in df.columns}
+    for columna, tipo in esquema.items():
+        if columna.strip() not in presentes:
+            if columna in OBLIGATORIAS[hoja]:
+                partes.append(pd.DataFrame([[hoja, None, columna, None, 'Columna obligatoria ausente']],
+                                           columns=COLUMNAS_CALIDAD))
+            df[columna] = pd.Series(None, index=df.index, dtype=tipo)
+            presentes[columna.strip()] = columna
+            continue
+        columna = presentes[columna.strip()]
+        if tipo not in ('Int8', 'Int64', 'float64'):
+            continue
+        # Texto, decimales o puntajes fuera de escala quedan vacíos
+        numerica = pd.to_numeric(df[columna].astype(object), errors='coerce').astype('float64')
+        no_numerica = df[columna].notna().to_numpy() & numerica.isna().to_numpy()
+        if no_numerica.any():
+            partes.append(_incidencias(hoja, df, no_numerica, columna, 'Valor no numérico'))
+        if columna in _COLUMNAS_PUNTAJE:
+            fuera = numerica.notna().to_numpy() & ~numerica.isin(PUNTAJES_VALIDOS).to_numpy()
+            if fuera.any():
+                partes.append(_incidencias(hoja, df, fuera, columna, 'Puntaje fuera de 1-3'))
+                numerica = numerica.mask(fuera)
+        elif tipo == 'Int64':
+            fuera = numerica.notna().to_numpy() & (numerica % 1 != 0).to_numpy()
+            if fuera.any():
+                partes.append(_incidencias(hoja, df, fuera, columna, 'Valor no entero'))
+                numerica = numerica.mask(fuera)
+        df[columna] = numerica.astype(tipo)
+
+    for columna in OBLIGATORIAS[hoja]:
+        vacia = df[presentes[columna]].isna().to_numpy()
+        if vacia.any():
+            partes.append(_incidencias(hoja, df, vacia, presentes[columna], 'Valor obligatorio vacío'))
+    if hoja in ('niveles_medios', 'jefes'):
+        for columna in ('Cédula', 'NOMBRE'):
+            repetido = df[columna].duplicated(keep='first').to_numpy() & df[columna].notna().to_numpy()
+            if repetido.any():
+                partes.append(_incidencias(hoja, df, repetido, columna, f'{columna} repetido en la hoja'))
+    return _reporte(partes)
+
+
+def validar_cruces(df_niveles_medios, df_jefes, df_competencias_jefes):
+    """Incidencias entre hojas, con los nombres ya en su grafía canónica."""
+    nombres = pd.concat([df_niveles_medios['NOMBRE'], df_jefes['NOMBRE']]).dropna().astype(object).unique()
+    partes = []
+    # Las dos hojas de empleados deberían ser disjuntas
+    en_ambas = df_jefes['NOMBRE'].isin(df_niveles_medios['NOMBRE'].dropna().astype(object).unique()).to_numpy()
+    partes.append(_incidencias('jefes', df_jefes, en_ambas, 'NOMBRE', 'NOMBRE en ambas hojas de empleados'))
+    for hoja, df in (('niveles_medios', df_niveles_medios), ('jefes', df_jefes)):
+        jefe = df['JEFE DIRECTO']
+        colgante = (jefe.notna() & ~jefe.isin(nombres)).to_numpy()
+        partes.append(_incidencias(hoja, df, colgante, 'JEFE DIRECTO', 'JEFE DIRECTO no es un empleado'))
+    participante = df_competencias_jefes[COLUMNA_PARTICIPANTE]
+    desconocido = (participante.notna() & ~participante.isin(nombres)).to_numpy()
+    partes.append(_incidencias('competencias_jefes', df_competencias_jefes, desconocido, COLUMNA_PARTICIPANTE,
+                               'Participante desconocido'))
+    return _reporte(partes)
+
+
+def resumen_calidad(reporte):
+    """Incidencias por hoja y problema (tabla para el dashboard)."""
+    return (reporte.groupby(['Hoja', 'Problema'], sort=True).size()
+            .rename('Incidencias').reset_index())
+
+
+if __name__ == '__main__':
+    from ingesta import EXCEL_FILE
+    from recarga import RecargadorLibro
+
+    datos = RecargadorLibro(sys.argv[1] if len(sys.argv) > 1 else EXCEL_FILE, vigilar=False).actual
+    if len(datos.calidad) == 0:
+        print("Sin incidencias de calidad.")
+    else:
+        print(resumen_calidad(datos.calidad).to_string(index=False))